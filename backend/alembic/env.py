@@ -1,7 +1,8 @@
 """Alembic environment configuration."""
 from logging.config import fileConfig
-from sqlalchemy import pool
+from sqlalchemy import event
 from sqlalchemy import text
+from sqlalchemy.util import await_only
 from alembic import context
 import asyncio
 from sqlalchemy.ext.asyncio import create_async_engine
@@ -45,47 +46,215 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+# varchar(n) stores n + 4 (VARHDRSZ) in pg_attribute.atttypmod.
+_VERSION_NUM_TYPMOD = 255 + 4
+
+# Set once version_num is known to be VARCHAR(255) so repeated runs in one process skip the probe.
+_alembic_version_widened = False
+
+
 def _widen_alembic_version_num(connection):
-    """Widen alembic_version.version_num so long revision IDs fit (Alembic default is VARCHAR(32))."""
-    connection.execute(text("""
+    """Widen alembic_version.version_num so long revision IDs fit (Alembic default is VARCHAR(32)).
+
+    A single pg_attribute probe decides whether the ALTER is needed, so the common no-op run
+    (already VARCHAR(255)) costs one cheap catalog lookup and no DDL.
+    """
+    global _alembic_version_widened
+    if _alembic_version_widened:
+        return
+    typmod = connection.execute(text(
+        "SELECT atttypmod FROM pg_attribute "
+        "WHERE attrelid = to_regclass('public.alembic_version') AND attname = 'version_num'"
+    )).scalar()
+    if typmod is None:
+        return  # no alembic_version table yet; Alembic creates it during the run
+    if typmod != _VERSION_NUM_TYPMOD:
+        connection.execute(text("ALTER TABLE alembic_version ALTER COLUMN version_num TYPE VARCHAR(255)"))
+    _alembic_version_widened = True
+
+
+# Revisions removed by a squash -> the revision a database stamped at one of them resumes from.
+# 032-035 resume from 031, so the (idempotent) squash adds whatever they lack; 036b ran after 036
+# with the same changes as the squash, so it resumes from 036.
+_SQUASHED_REVISIONS = {
+    "032_kai_prefs_content": "031_lounge_goal",
+    "033_kai_prefs_missing": "031_lounge_goal",
+    "034_kai_prefs_type": "031_lounge_goal",
+    "035_kai_prefs_text": "031_lounge_goal",
+    "036b_kai_prefs_consolidate": "036_user_birthday_occupation",
+}
+
+
+def _restamp_squashed_revisions(connection):
+    """Re-point alembic_version rows at a squashed revision, which Alembic could no longer locate.
+
+    One statement: an UPDATE matching no rows on every other database, skipped when
+    alembic_version does not exist yet.
+    """
+    cases = " ".join(f"WHEN '{old}' THEN '{new}'" for old, new in _SQUASHED_REVISIONS.items())
+    squashed = ", ".join(f"'{old}'" for old in _SQUASHED_REVISIONS)
+    connection.execute(text(f"""
         DO $$
         BEGIN
-            IF EXISTS (
-                SELECT 1 FROM information_schema.tables
-                WHERE table_schema = 'public' AND table_name = 'alembic_version'
-            ) AND (
-                SELECT character_maximum_length FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = 'alembic_version' AND column_name = 'version_num'
-            ) IS DISTINCT FROM 255 THEN
-                ALTER TABLE alembic_version ALTER COLUMN version_num TYPE VARCHAR(255);
+            IF to_regclass('public.alembic_version') IS NOT NULL THEN
+                UPDATE alembic_version SET version_num = CASE version_num {cases} END
+                WHERE version_num IN ({squashed});
             END IF;
-        END $$;
+        END $$
     """))
 
 
+# PG18 async I/O knobs for the migration session (bulk UPDATE/ALTER ... TYPE rewrites, DELETEs).
+# All are user-settable, so they stay local to this connection; io_method itself is a
+# server-start setting and has to be configured in postgresql.conf (io_uring / worker).
+_PG18_SESSION_IO_SETTINGS = {
+    "effective_io_concurrency": "16",
+    "maintenance_io_concurrency": "16",
+    "io_combine_limit": "128kB",
+}
+
+
+def _tune_session_io(connection):
+    """Raise read-ahead / I/O combining for the migration session on PostgreSQL 18+."""
+    version_num = connection.execute(text("SELECT current_setting('server_version_num')::int")).scalar()
+    if version_num < 180000:
+        return
+    connection.execute(
+        text(
+            "SELECT "
+            + ", ".join(f"set_config('{name}', :{name}, false)" for name in _PG18_SESSION_IO_SETTINGS)
+        ),
+        _PG18_SESSION_IO_SETTINGS,
+    )
+
+
+class _DDLPipeline:
+    """Buffer argument-less op.execute() DDL and flush it as one multi-statement script.
+
+    SQLAlchemy's asyncpg adapter prepares every statement (Parse/Describe, then Bind/Execute),
+    so each op.execute() costs two round trips. Buffered statements are sent together through
+    asyncpg's simple-query protocol in a single round trip, in their original order. The buffer
+    is flushed before any other statement reaches the connection (inspector probes, op.add_column,
+    alembic_version updates) and before commit, so dependent statements still see prior DDL.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._pending: list[str] = []
+
+    def install(self, impl) -> None:
+        original_execute = impl.execute
+
+        def execute(sql, execution_options=None):
+            if isinstance(sql, str) and not execution_options and self._in_transaction():
+                self._pending.append(sql.strip().rstrip(";"))
+                return None
+            self.flush()
+            return original_execute(sql, execution_options)
+
+        impl.execute = execute
+        event.listen(self._connection, "before_cursor_execute", self._flush_before_execute)
+        event.listen(self._connection, "commit", self.flush)
+        event.listen(self._connection, "savepoint", self.flush)
+        event.listen(self._connection, "rollback", self._discard)
+
+    def _driver_connection(self):
+        return self._connection.connection.driver_connection
+
+    def _in_transaction(self) -> bool:
+        # Only buffer inside the migration transaction; autocommit blocks (e.g. CREATE INDEX
+        # CONCURRENTLY) must run one statement at a time outside an implicit transaction.
+        return self._driver_connection().is_in_transaction()
+
+    def _flush_before_execute(self, *_args, **_kwargs) -> None:
+        self.flush()
+
+    def _discard(self, *_args, **_kwargs) -> None:
+        self._pending = []
+
+    def flush(self, *_args, **_kwargs) -> None:
+        if not self._pending:
+            return
+        script = ";\n".join(self._pending)
+        self._pending = []
+        await_only(self._driver_connection().execute(script))
+
+
+async def _parallel_ddl(
+    engine,
+    statements: list[str | list[str]],
+    n_conn: int,
+    settings: dict[str, str] | None = None,
+) -> None:
+    """Run independent, idempotent DDL statements concurrently on separate autocommit connections.
+
+    The statements run outside the migration transaction, so they must be safe to re-run and must
+    not depend on objects the migration transaction has created but not yet committed. An item may
+    be a list of statements that must run in order on one connection (e.g. index builds on one
+    table). settings are applied to each connection for the duration of its statements.
+    """
+    groups = [statements[i::n_conn] for i in range(n_conn)]
+
+    async def run_group(group: list[str | list[str]]) -> None:
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for name, value in (settings or {}).items():
+                await conn.exec_driver_sql(f"SET {name} = '{value}'")
+            for item in group:
+                for statement in [item] if isinstance(item, str) else item:
+                    await conn.exec_driver_sql(statement)
+            if settings:
+                await conn.exec_driver_sql("RESET ALL")
+
+    await asyncio.gather(*(run_group(group) for group in groups if group))
+
+
 def do_run_migrations(connection):
     """Run migrations with connection."""
     context.configure(connection=connection, target_metadata=target_metadata)
 
+    pipeline = None
+    if settings.database_migration_pipeline_ddl:
+        pipeline = _DDLPipeline(connection)
+        pipeline.install(context.get_context().impl)
+
     with context.begin_transaction():
         context.run_migrations()
+        if pipeline is not None:
+            pipeline.flush()
 
 
 async def run_migrations_online() -> None:
     """Run migrations in 'online' mode using async engine (asyncpg)."""
+    n_ddl_conn = settings.database_migration_ddl_connections
+    # Migrations are single-producer: one pooled connection serves both the setup step and the
+    # migration run (one TLS handshake / startup). Overflow only covers parallel_ddl connections.
     connectable = create_async_engine(
         async_pg_url_without_sslmode(_db_url),
         connect_args=_db_connect_args,
-        poolclass=pool.NullPool,
+        pool_size=1,
+        max_overflow=n_ddl_conn if n_ddl_conn > 1 else 0,
         future=True,
     )
 
-    # Widen alembic_version.version_num in a separate connection so it commits before migrations.
-    async with connectable.connect() as alt_conn:
-        await alt_conn.run_sync(_widen_alembic_version_num)
-        await alt_conn.commit()
+    if n_ddl_conn > 1:
+        # Exposed to migrations via op.get_context().config.attributes["parallel_ddl"].
+        def parallel_ddl(statements: list[str | list[str]], settings: dict[str, str] | None = None) -> None:
+            await_only(_parallel_ddl(connectable, statements, n_ddl_conn, settings))
+
+        config.attributes["parallel_ddl"] = parallel_ddl
 
     async with connectable.connect() as connection:
+        # Widen alembic_version.version_num (and re-point squashed revisions) in autocommit so it
+        # is committed before migrations, then restore the default isolation level for the
+        # transactional migration run.
+        default_isolation_level = connection.default_isolation_level
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.run_sync(_widen_alembic_version_num)
+        await connection.run_sync(_restamp_squashed_revisions)
+        await connection.run_sync(_tune_session_io)
+        await connection.commit()  # ends SQLAlchemy's autobegun Transaction so the level can change
+        await connection.execution_options(isolation_level=default_isolation_level)
         await connection.run_sync(do_run_migrations)
 
     await connectable.dispose()
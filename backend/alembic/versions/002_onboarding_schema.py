@@ -16,31 +16,85 @@ branch_labels = None
 depends_on = None
 
 
+# Existence flags for every object upgrade() checks, read from pg_catalog once up front into a
+# transaction-local temp table. Facts are "table.<name>", "constraint.<name>", "<table>.<column>"
+# plus "<table>.<column>/notnull|default|varchar" for column properties. relationship_consents
+# facts describe whichever table will carry that name (consents is renamed if needed). Facts are
+# only consulted before upgrade() itself changes the object they describe.
+_SNAPSHOT_CATALOG_STATE = """
+    DO $$
+    BEGIN
+        CREATE TEMP TABLE IF NOT EXISTS _mig_state (
+            name TEXT PRIMARY KEY,
+            present BOOLEAN NOT NULL
+        ) ON COMMIT DROP;
+
+        CREATE OR REPLACE FUNCTION pg_temp.mig_has(fact TEXT) RETURNS BOOLEAN
+        LANGUAGE sql STABLE AS $fn$
+            SELECT COALESCE((SELECT present FROM _mig_state WHERE name = fact), false)
+        $fn$;
+
+        INSERT INTO _mig_state (name, present)
+        SELECT 'table.' || t, to_regclass('public.' || t) IS NOT NULL
+        FROM unnest(ARRAY[
+            'onboarding_progress', 'consents', 'relationship_consents',
+            'voice_enrollments', 'voice_profiles', 'relationship_invites'
+        ]) AS t
+        UNION ALL
+        SELECT 'constraint.fk_relationships_created_by',
+               EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_relationships_created_by')
+        UNION ALL
+        SELECT tbl.name || '.' || a.attname || fact.suffix, fact.present
+        FROM (VALUES
+            ('users', to_regclass('public.users')),
+            ('relationships', to_regclass('public.relationships')),
+            ('relationship_members', to_regclass('public.relationship_members')),
+            ('relationship_consents', COALESCE(to_regclass('public.relationship_consents'), to_regclass('public.consents')))
+        ) AS tbl (name, oid)
+        JOIN pg_attribute a ON a.attrelid = tbl.oid AND a.attnum > 0 AND NOT a.attisdropped
+        CROSS JOIN LATERAL (VALUES
+            ('', true),
+            ('/notnull', a.attnotnull),
+            ('/default', a.atthasdef),
+            ('/varchar', a.atttypid = 'varchar'::regtype)
+        ) AS fact (suffix, present)
+        ON CONFLICT (name) DO UPDATE SET present = EXCLUDED.present;
+    END $$;
+"""
+
+
+def _run_independent_ddl(bodies: list[str]) -> None:
+    """Run independent PL/pgSQL bodies: in parallel if the env provides it, else as one DO block."""
+    parallel_ddl = op.get_context().config.attributes.get("parallel_ddl")
+    if parallel_ddl is not None:
+        parallel_ddl([f"DO $$ BEGIN {body} END $$" for body in bodies])
+    else:
+        op.execute("DO $$ BEGIN " + "".join(bodies) + " END $$;")
+
+
 def upgrade() -> None:
-    # Add new columns to users table (only if they don't exist)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='users' AND column_name='pronouns') THEN
-                ALTER TABLE users ADD COLUMN pronouns VARCHAR;
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='users' AND column_name='communication_style') THEN
-                ALTER TABLE users ADD COLUMN communication_style DOUBLE PRECISION;
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='users' AND column_name='goals') THEN
-                ALTER TABLE users ADD COLUMN goals JSONB;
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='users' AND column_name='privacy_tier') THEN
-                ALTER TABLE users ADD COLUMN privacy_tier VARCHAR;
-            END IF;
-        END $$;
-    """)
-    
-    # Create onboarding_progress table (only if it doesn't exist)
+    # Statements are grouped into a handful of DO blocks (one per dependency stage) so the
+    # migration costs a few round trips instead of one per check-and-ALTER. Existence guards
+    # read a one-off pg_catalog snapshot (see _SNAPSHOT_CATALOG_STATE) instead of re-probing
+    # the catalogs in every block.
+    #
+    # Everything up to the autocommit block at the end runs in the one Alembic transaction, so
+    # skip the per-commit WAL flush wait (a crash mid-migration means the migration is replayed,
+    # which is the normal Alembic model).
+    op.execute("SET LOCAL synchronous_commit = off")
+    op.execute(_SNAPSHOT_CATALOG_STATE)
+
+    # Users columns and onboarding_progress table (only if they don't exist)
     op.execute("""
         DO $$ 
         BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='onboarding_progress') THEN
+            ALTER TABLE users
+                ADD COLUMN IF NOT EXISTS pronouns VARCHAR,
+                ADD COLUMN IF NOT EXISTS communication_style DOUBLE PRECISION,
+                ADD COLUMN IF NOT EXISTS goals JSONB,
+                ADD COLUMN IF NOT EXISTS privacy_tier VARCHAR;
+
+            IF NOT pg_temp.mig_has('table.onboarding_progress') THEN
                 CREATE TABLE onboarding_progress (
                     user_id VARCHAR NOT NULL,
                     profile_completed BOOLEAN NOT NULL DEFAULT false,
@@ -57,215 +111,161 @@ def upgrade() -> None:
         END $$;
     """)
     
-    # Create enum types first (if they don't exist)
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE relationshiptype AS ENUM ('COUPLE', 'FAMILY', 'FRIEND_1_1', 'FRIEND_GROUP', 'OTHER');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE relationshipstatus AS ENUM ('DRAFT', 'PENDING_ACCEPTANCE', 'ACTIVE', 'DECLINED', 'REVOKED');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE memberstatus AS ENUM ('INVITED', 'ACCEPTED', 'DECLINED', 'REMOVED');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE memberrole AS ENUM ('OWNER', 'MEMBER');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE consentstatus AS ENUM ('DRAFT', 'ACTIVE', 'REVOKED');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE inviteerole AS ENUM ('PARTNER', 'CHILD', 'FRIEND', 'FAMILY', 'OTHER');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE invitestatus AS ENUM ('CREATED', 'SENT', 'OPENED', 'ACCEPTED', 'DECLINED', 'EXPIRED', 'CANCELED');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    op.execute("""
-        DO $$ BEGIN
-            CREATE TYPE voiceenrollmentstatus AS ENUM ('STARTED', 'UPLOADED', 'COMPLETED', 'FAILED');
-        EXCEPTION
-            WHEN duplicate_object THEN null;
-        END $$;
-    """)
-    
-    # Update relationships table (only if columns don't exist)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationships' AND column_name='type') THEN
-                ALTER TABLE relationships ADD COLUMN type relationshiptype;
+    # Create enum types first (if they don't exist). A to_regtype() pre-check avoids the
+    # savepoint a BEGIN ... EXCEPTION WHEN duplicate_object block sets up for every type. The
+    # types are independent of each other, so they may run concurrently on extra connections
+    # when the env provides parallel_ddl.
+    _run_independent_ddl([
+        """
+            IF to_regtype('relationshiptype') IS NULL THEN
+                CREATE TYPE relationshiptype AS ENUM ('COUPLE', 'FAMILY', 'FRIEND_1_1', 'FRIEND_GROUP', 'OTHER');
             END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationships' AND column_name='created_by_user_id') THEN
-                ALTER TABLE relationships ADD COLUMN created_by_user_id VARCHAR;
+        """,
+        """
+            IF to_regtype('relationshipstatus') IS NULL THEN
+                CREATE TYPE relationshipstatus AS ENUM ('DRAFT', 'PENDING_ACCEPTANCE', 'ACTIVE', 'DECLINED', 'REVOKED');
             END IF;
-        END $$;
-    """)
+        """,
+        """
+            IF to_regtype('memberstatus') IS NULL THEN
+                CREATE TYPE memberstatus AS ENUM ('INVITED', 'ACCEPTED', 'DECLINED', 'REMOVED');
+            END IF;
+        """,
+        """
+            IF to_regtype('memberrole') IS NULL THEN
+                CREATE TYPE memberrole AS ENUM ('OWNER', 'MEMBER');
+            END IF;
+        """,
+        """
+            IF to_regtype('consentstatus') IS NULL THEN
+                CREATE TYPE consentstatus AS ENUM ('DRAFT', 'ACTIVE', 'REVOKED');
+            END IF;
+        """,
+        """
+            IF to_regtype('inviteerole') IS NULL THEN
+                CREATE TYPE inviteerole AS ENUM ('PARTNER', 'CHILD', 'FRIEND', 'FAMILY', 'OTHER');
+            END IF;
+        """,
+        """
+            IF to_regtype('invitestatus') IS NULL THEN
+                CREATE TYPE invitestatus AS ENUM ('CREATED', 'SENT', 'OPENED', 'ACCEPTED', 'DECLINED', 'EXPIRED', 'CANCELED');
+            END IF;
+        """,
+        """
+            IF to_regtype('voiceenrollmentstatus') IS NULL THEN
+                CREATE TYPE voiceenrollmentstatus AS ENUM ('STARTED', 'UPLOADED', 'COMPLETED', 'FAILED');
+            END IF;
+        """,
+    ])
     
-    # Migrate existing rel_type to type (handle case where rel_type might not exist)
+    # Update relationships table: add type/created_by_user_id, backfill, tighten, drop rel_type
     op.execute("""
         DO $$ 
         BEGIN
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationships' AND column_name='rel_type') THEN
-                UPDATE relationships 
-                SET type = CASE 
-                    WHEN rel_type = 'romantic' THEN 'COUPLE'::relationshiptype
-                    WHEN rel_type = 'family' THEN 'FAMILY'::relationshiptype
-                    WHEN rel_type = 'friend' THEN 'FRIEND_1_1'::relationshiptype
-                    ELSE 'OTHER'::relationshiptype
-                END
-                WHERE type IS NULL;
+            IF NOT pg_temp.mig_has('relationships.type') AND NOT pg_temp.mig_has('relationships.rel_type') THEN
+                -- No rel_type to migrate: every row gets OTHER. Added NOT NULL with that as a
+                -- constant default, which PostgreSQL stores once in the catalog instead of
+                -- rewriting or updating the rows (and no NOT NULL scan); the default is dropped
+                -- again, as the model sets type on insert.
+                ALTER TABLE relationships ADD COLUMN type relationshiptype NOT NULL DEFAULT 'OTHER';
+                ALTER TABLE relationships ALTER COLUMN type DROP DEFAULT;
             ELSE
-                -- If rel_type doesn't exist, set default
-                UPDATE relationships SET type = 'OTHER'::relationshiptype WHERE type IS NULL;
+                ALTER TABLE relationships ADD COLUMN IF NOT EXISTS type relationshiptype;
+
+                -- Migrate existing rel_type to type (handle case where rel_type might not exist)
+                IF pg_temp.mig_has('relationships.rel_type') THEN
+                    UPDATE relationships 
+                    SET type = CASE 
+                        WHEN rel_type = 'romantic' THEN 'COUPLE'::relationshiptype
+                        WHEN rel_type = 'family' THEN 'FAMILY'::relationshiptype
+                        WHEN rel_type = 'friend' THEN 'FRIEND_1_1'::relationshiptype
+                        ELSE 'OTHER'::relationshiptype
+                    END
+                    WHERE type IS NULL;
+                ELSE
+                    -- If rel_type doesn't exist, set default
+                    UPDATE relationships SET type = 'OTHER'::relationshiptype WHERE type IS NULL;
+                END IF;
             END IF;
-        END $$;
-    """)
-    
-    # Set default for created_by_user_id
-    op.execute("""
-        UPDATE relationships 
-        SET created_by_user_id = (
-            SELECT user_id 
-            FROM relationship_members 
-            WHERE relationship_members.relationship_id = relationships.id 
-            LIMIT 1
-        )
-        WHERE created_by_user_id IS NULL;
-    """)
-    
-    # Set a default if still null (for relationships with no members)
-    op.execute("UPDATE relationships SET created_by_user_id = (SELECT id FROM users LIMIT 1) WHERE created_by_user_id IS NULL")
-    
-    # Make type and created_by_user_id NOT NULL after migration (only if not already NOT NULL)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationships' AND column_name='type' AND is_nullable='YES') THEN
+            ALTER TABLE relationships ADD COLUMN IF NOT EXISTS created_by_user_id VARCHAR;
+
+            -- Set default for created_by_user_id: one member of the relationship, or the oldest
+            -- user for relationships with no members. Single joined pass instead of a correlated
+            -- subquery per row plus a fallback UPDATE.
+            UPDATE relationships
+            SET created_by_user_id = COALESCE(
+                rm.user_id,
+                (SELECT id FROM users ORDER BY created_at LIMIT 1)
+            )
+            FROM relationships r
+            LEFT JOIN (
+                SELECT DISTINCT ON (relationship_id) relationship_id, user_id
+                FROM relationship_members
+                ORDER BY relationship_id
+            ) rm ON rm.relationship_id = r.id
+            WHERE relationships.id = r.id AND relationships.created_by_user_id IS NULL;
+
+            -- Make type and created_by_user_id NOT NULL after migration (only if not already NOT NULL)
+            IF NOT pg_temp.mig_has('relationships.type/notnull') THEN
                 ALTER TABLE relationships ALTER COLUMN type SET NOT NULL;
             END IF;
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationships' AND column_name='created_by_user_id' AND is_nullable='YES') THEN
+            IF NOT pg_temp.mig_has('relationships.created_by_user_id/notnull') THEN
                 ALTER TABLE relationships ALTER COLUMN created_by_user_id SET NOT NULL;
             END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.table_constraints WHERE constraint_name='fk_relationships_created_by') THEN
+            IF NOT pg_temp.mig_has('constraint.fk_relationships_created_by') THEN
                 ALTER TABLE relationships ADD CONSTRAINT fk_relationships_created_by FOREIGN KEY (created_by_user_id) REFERENCES users (id);
             END IF;
-        END $$;
-    """)
-    
-    # Drop rel_type column since we're using type now (rel_type is now a computed property)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationships' AND column_name='rel_type') THEN
-                -- Drop the column if it exists
+
+            -- Drop rel_type column since we're using type now (rel_type is now a computed property)
+            IF pg_temp.mig_has('relationships.rel_type') THEN
                 ALTER TABLE relationships DROP COLUMN rel_type;
             END IF;
         END $$;
     """)
     
-    # Update relationship status - clean up incompatible data
-    # Delete relationships with invalid status values that can't be converted to enum
+    # Update relationship status - clean up incompatible data, then convert to enum
     op.execute("""
         DO $$ 
         DECLARE
-            invalid_rel_ids TEXT[];
+            deleted_count INTEGER;
         BEGIN
-            -- Find relationships with invalid status values (not matching enum)
-            -- Handle both VARCHAR and enum types
-            SELECT ARRAY_AGG(id) INTO invalid_rel_ids
-            FROM relationships 
-            WHERE status::text NOT IN ('DRAFT', 'PENDING_ACCEPTANCE', 'ACTIVE', 'DECLINED', 'REVOKED');
-            
-            -- If there are invalid relationships, delete them
-            IF invalid_rel_ids IS NOT NULL AND array_length(invalid_rel_ids, 1) > 0 THEN
-                -- Delete relationship members first (foreign key constraint)
-                DELETE FROM relationship_members 
-                WHERE relationship_id = ANY(invalid_rel_ids);
-                
-                -- Delete invalid relationships
-                DELETE FROM relationships 
-                WHERE id = ANY(invalid_rel_ids);
-                
-                RAISE NOTICE 'Deleted % relationships with invalid status values', array_length(invalid_rel_ids, 1);
+            -- Delete relationships with invalid status values that can't be converted to enum
+            -- (handles both VARCHAR and enum status columns). Members are deleted in the same
+            -- statement; the FK is checked at statement end, so one pass per table suffices.
+            WITH bad AS (
+                SELECT id FROM relationships
+                WHERE status::text NOT IN ('DRAFT', 'PENDING_ACCEPTANCE', 'ACTIVE', 'DECLINED', 'REVOKED')
+            ), deleted_members AS (
+                DELETE FROM relationship_members
+                WHERE relationship_id IN (SELECT id FROM bad)
+            ), deleted AS (
+                DELETE FROM relationships
+                WHERE id IN (SELECT id FROM bad)
+                RETURNING 1
+            )
+            SELECT count(*) INTO deleted_count FROM deleted;
+
+            IF deleted_count > 0 THEN
+                RAISE NOTICE 'Deleted % relationships with invalid status values', deleted_count;
             END IF;
-        END $$;
-    """)
-    
-    # Convert status column to enum if it's still VARCHAR
-    op.execute("""
-        DO $$ 
-        BEGIN
-            -- Check if status column is VARCHAR and needs conversion
-            IF EXISTS (
-                SELECT 1 FROM information_schema.columns 
-                WHERE table_name='relationships' 
-                AND column_name='status' 
-                AND data_type = 'character varying'
-            ) THEN
-                -- Try to convert existing valid values
-                -- Convert lowercase 'active' to 'ACTIVE' before enum conversion
-                UPDATE relationships 
-                SET status = 'ACTIVE' 
-                WHERE LOWER(status) = 'active' AND status != 'ACTIVE';
-                
-                -- Convert other lowercase values
-                UPDATE relationships 
-                SET status = 'DRAFT' 
-                WHERE LOWER(status) = 'draft' AND status != 'DRAFT';
-                
-                UPDATE relationships 
-                SET status = 'PENDING_ACCEPTANCE' 
-                WHERE LOWER(status) IN ('pending', 'pending_acceptance') 
-                  AND status NOT IN ('PENDING_ACCEPTANCE', 'ACTIVE', 'DRAFT', 'DECLINED', 'REVOKED');
-                
-                UPDATE relationships 
-                SET status = 'DECLINED' 
-                WHERE LOWER(status) = 'declined' AND status != 'DECLINED';
-                
-                UPDATE relationships 
-                SET status = 'REVOKED' 
-                WHERE LOWER(status) = 'revoked' AND status != 'REVOKED';
+
+            -- Convert status column to enum if it's still VARCHAR
+            IF pg_temp.mig_has('relationships.status/varchar') THEN
+                -- Normalize lowercase / legacy values before enum conversion (one pass over the table)
+                UPDATE relationships
+                SET status = CASE LOWER(status)
+                    WHEN 'active' THEN 'ACTIVE'
+                    WHEN 'draft' THEN 'DRAFT'
+                    WHEN 'pending' THEN 'PENDING_ACCEPTANCE'
+                    WHEN 'pending_acceptance' THEN 'PENDING_ACCEPTANCE'
+                    WHEN 'declined' THEN 'DECLINED'
+                    WHEN 'revoked' THEN 'REVOKED'
+                END
+                WHERE LOWER(status) IN ('active', 'draft', 'pending', 'pending_acceptance', 'declined', 'revoked')
+                  AND status NOT IN ('ACTIVE', 'DRAFT', 'PENDING_ACCEPTANCE', 'DECLINED', 'REVOKED');
                 
                 -- Drop default if present so PostgreSQL can cast column to enum (default cannot be cast automatically)
-                IF EXISTS (
-                    SELECT 1 FROM information_schema.columns
-                    WHERE table_schema = 'public' AND table_name = 'relationships'
-                    AND column_name = 'status' AND column_default IS NOT NULL
-                ) THEN
+                IF pg_temp.mig_has('relationships.status/default') THEN
                     ALTER TABLE relationships ALTER COLUMN status DROP DEFAULT;
                 END IF;
                 
@@ -280,91 +280,67 @@ def upgrade() -> None:
         END $$;
     """)
     
-    # Update relationship_members table (only if columns don't exist)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_members' AND column_name='member_status') THEN
-                ALTER TABLE relationship_members ADD COLUMN member_status memberstatus;
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_members' AND column_name='added_at') THEN
-                ALTER TABLE relationship_members ADD COLUMN added_at TIMESTAMP WITHOUT TIME ZONE;
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_members' AND column_name='responded_at') THEN
-                ALTER TABLE relationship_members ADD COLUMN responded_at TIMESTAMP WITHOUT TIME ZONE;
-            END IF;
-        END $$;
-    """)
-    
-    # Migrate existing data
-    op.execute("UPDATE relationship_members SET member_status = 'ACCEPTED'::memberstatus WHERE member_status IS NULL")
-    op.execute("UPDATE relationship_members SET added_at = NOW() WHERE added_at IS NULL")
-    
-    # Make NOT NULL (only if currently nullable)
+    # Update relationship_members table: add columns, migrate existing data, make NOT NULL
     op.execute("""
         DO $$ 
         BEGIN
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_members' AND column_name='member_status' AND is_nullable='YES') THEN
+            -- A missing column is added NOT NULL with the existing rows' value as its default:
+            -- a constant (now() is fixed for the transaction) is stored once in the catalog, so
+            -- no rewrite, UPDATE or NOT NULL scan. The defaults are dropped again, as the model
+            -- sets both on insert. Only columns that already exist are backfilled row by row.
+            IF NOT pg_temp.mig_has('relationship_members.member_status') THEN
+                ALTER TABLE relationship_members ADD COLUMN member_status memberstatus NOT NULL DEFAULT 'ACCEPTED';
+                ALTER TABLE relationship_members ALTER COLUMN member_status DROP DEFAULT;
+            ELSIF NOT pg_temp.mig_has('relationship_members.member_status/notnull') THEN
+                UPDATE relationship_members SET member_status = 'ACCEPTED'::memberstatus WHERE member_status IS NULL;
                 ALTER TABLE relationship_members ALTER COLUMN member_status SET NOT NULL;
             END IF;
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_members' AND column_name='added_at' AND is_nullable='YES') THEN
+            IF NOT pg_temp.mig_has('relationship_members.added_at') THEN
+                ALTER TABLE relationship_members ADD COLUMN added_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW();
+                ALTER TABLE relationship_members ALTER COLUMN added_at DROP DEFAULT;
+            ELSIF NOT pg_temp.mig_has('relationship_members.added_at/notnull') THEN
+                UPDATE relationship_members SET added_at = NOW() WHERE added_at IS NULL;
                 ALTER TABLE relationship_members ALTER COLUMN added_at SET NOT NULL;
             END IF;
+            ALTER TABLE relationship_members ADD COLUMN IF NOT EXISTS responded_at TIMESTAMP WITHOUT TIME ZONE;
         END $$;
     """)
     
     # Role column already exists as VARCHAR, no need to change
     
     # Rename consents table to relationship_consents and update schema
-    # Only rename if consents exists AND relationship_consents doesn't exist
     op.execute("""
         DO $$ 
         BEGIN
-            IF EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='consents') 
-               AND NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='relationship_consents') THEN
+            -- Only rename if consents exists AND relationship_consents doesn't exist
+            IF pg_temp.mig_has('table.consents') 
+               AND NOT pg_temp.mig_has('table.relationship_consents') THEN
                 ALTER TABLE consents RENAME TO relationship_consents;
             END IF;
-        END $$;
-    """)
-    
-    # Drop created_at if it exists
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_consents' AND column_name='created_at') THEN
+
+            -- Drop created_at if it exists
+            IF pg_temp.mig_has('relationship_consents.created_at') THEN
                 ALTER TABLE relationship_consents DROP COLUMN created_at;
             END IF;
-        END $$;
-    """)
-    
-    # Update scopes column type if it exists and is String
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_consents' AND column_name='scopes' AND data_type='character varying') THEN
+
+            -- Update scopes column type if it exists and is String
+            IF pg_temp.mig_has('relationship_consents.scopes/varchar') THEN
                 ALTER TABLE relationship_consents ALTER COLUMN scopes TYPE JSONB USING scopes::jsonb;
             END IF;
+
+            -- Add new columns if they don't exist
+            ALTER TABLE relationship_consents
+                ADD COLUMN IF NOT EXISTS version VARCHAR NOT NULL DEFAULT '1',
+                ADD COLUMN IF NOT EXISTS status consentstatus NOT NULL DEFAULT 'DRAFT';
         END $$;
     """)
     
-    # Add new columns if they don't exist
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_consents' AND column_name='version') THEN
-                ALTER TABLE relationship_consents ADD COLUMN version VARCHAR NOT NULL DEFAULT '1';
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='relationship_consents' AND column_name='status') THEN
-                ALTER TABLE relationship_consents ADD COLUMN status consentstatus NOT NULL DEFAULT 'DRAFT';
-            END IF;
-        END $$;
-    """)
-    
-    # Create voice_enrollments table (only if it doesn't exist)
+    # Create voice_enrollments, voice_profiles and relationship_invites tables (only if they don't exist);
+    # their indexes are built concurrently below
     op.execute("""
         DO $$ 
         BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='voice_enrollments') THEN
+            IF NOT pg_temp.mig_has('table.voice_enrollments') THEN
                 CREATE TABLE voice_enrollments (
                     id VARCHAR NOT NULL,
                     user_id VARCHAR NOT NULL,
@@ -375,16 +351,9 @@ def upgrade() -> None:
                     PRIMARY KEY (id),
                     FOREIGN KEY(user_id) REFERENCES users (id)
                 );
-                CREATE INDEX ix_voice_enrollments_user_id ON voice_enrollments (user_id);
             END IF;
-        END $$;
-    """)
-    
-    # Create voice_profiles table (only if it doesn't exist)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='voice_profiles') THEN
+
+            IF NOT pg_temp.mig_has('table.voice_profiles') THEN
                 CREATE TABLE voice_profiles (
                     id VARCHAR NOT NULL,
                     user_id VARCHAR NOT NULL,
@@ -393,16 +362,9 @@ def upgrade() -> None:
                     PRIMARY KEY (id),
                     FOREIGN KEY(user_id) REFERENCES users (id)
                 );
-                CREATE UNIQUE INDEX ix_voice_profiles_user_id ON voice_profiles (user_id);
             END IF;
-        END $$;
-    """)
-    
-    # Create relationship_invites table (only if it doesn't exist)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='relationship_invites') THEN
+
+            IF NOT pg_temp.mig_has('table.relationship_invites') THEN
                 CREATE TABLE relationship_invites (
                     id VARCHAR NOT NULL,
                     relationship_id VARCHAR NOT NULL,
@@ -423,13 +385,19 @@ def upgrade() -> None:
                     FOREIGN KEY(inviter_user_id) REFERENCES users (id),
                     FOREIGN KEY(invitee_user_id) REFERENCES users (id)
                 );
-                CREATE INDEX ix_relationship_invites_relationship_id ON relationship_invites (relationship_id);
-                CREATE INDEX ix_relationship_invites_invitee_email ON relationship_invites (invitee_email);
-                CREATE INDEX ix_relationship_invites_token_hash ON relationship_invites (token_hash);
             END IF;
         END $$;
     """)
 
+    # Build the new tables' indexes CONCURRENTLY so re-running against populated tables does not
+    # block writers. CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_voice_enrollments_user_id ON voice_enrollments (user_id)")
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_voice_profiles_user_id ON voice_profiles (user_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_relationship_invites_relationship_id ON relationship_invites (relationship_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_relationship_invites_invitee_email ON relationship_invites (invitee_email)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_relationship_invites_token_hash ON relationship_invites (token_hash)")
+
 
 def downgrade() -> None:
     # Drop new tables
@@ -7,7 +7,6 @@ Create Date: 2024-01-20 00:00:00.000000
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision = '003_realtime_sessions'
@@ -17,99 +16,69 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Create enum types
+    # Enum types, sessions/session_reports changes and session_feature_frames in one DO block:
+    # one parse, compile and round trip instead of one per step.
     op.execute("""
-        DO $$ 
+        DO $$
         BEGIN
-            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'sessionstatus') THEN
+            -- Create enum types; an existing type just raises duplicate_object (no catalog probe)
+            BEGIN
                 CREATE TYPE sessionstatus AS ENUM ('ACTIVE', 'ENDED', 'FINALIZED');
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'reportstatus') THEN
+            EXCEPTION WHEN duplicate_object THEN NULL;
+            END;
+            BEGIN
                 CREATE TYPE reportstatus AS ENUM ('PENDING', 'READY');
-            END IF;
-        END $$;
-    """)
-    
-    # Update sessions table
-    op.execute("""
-        DO $$ 
-        BEGIN
-            -- Add new columns if they don't exist
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='sessions' AND column_name='started_at') THEN
-                ALTER TABLE sessions ADD COLUMN started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='sessions' AND column_name='ended_at') THEN
-                ALTER TABLE sessions ADD COLUMN ended_at TIMESTAMP;
-            END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='sessions' AND column_name='created_by_user_id') THEN
-                ALTER TABLE sessions ADD COLUMN created_by_user_id VARCHAR;
-            END IF;
-            
+            EXCEPTION WHEN duplicate_object THEN NULL;
+            END;
+
+            -- Update sessions table: add the new columns in one ALTER
+            ALTER TABLE sessions
+                ADD COLUMN IF NOT EXISTS started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS ended_at TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS created_by_user_id VARCHAR;
+
             -- Update existing rows to set defaults
             UPDATE sessions SET started_at = created_at WHERE started_at IS NULL;
             UPDATE sessions SET status = 'ACTIVE' WHERE status IS NULL OR status = 'active' OR status = 'draft';
             UPDATE sessions SET status = 'ENDED' WHERE status = 'ended' OR status = 'finalized';
-        END $$;
-    """)
-    
-    # Convert status column to enum (if not already)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            -- Drop default if present so PostgreSQL can cast column to enum (default cannot be cast automatically)
-            IF EXISTS (
-                SELECT 1 FROM information_schema.columns
-                WHERE table_schema = 'public' AND table_name = 'sessions'
-                AND column_name = 'status' AND column_default IS NOT NULL
-            ) THEN
-                ALTER TABLE sessions ALTER COLUMN status DROP DEFAULT;
-            END IF;
-            
-            -- Check if column is already enum type
+
+            -- Convert status to enum (if not already), set its default and the NOT NULLs in a single
+            -- ALTER: one lock acquisition and at most one table rewrite. The old default is dropped
+            -- first because PostgreSQL cannot cast it to the enum automatically.
             IF EXISTS (
-                SELECT 1 FROM information_schema.columns 
-                WHERE table_name='sessions' 
-                AND column_name='status' 
-                AND udt_name != 'sessionstatus'
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = 'public.sessions'::regclass AND attname = 'status'
+                AND NOT attisdropped AND atttypid <> 'sessionstatus'::regtype
             ) THEN
-                -- Convert to enum
-                ALTER TABLE sessions ALTER COLUMN status TYPE sessionstatus USING status::sessionstatus;
+                ALTER TABLE sessions
+                    ALTER COLUMN status DROP DEFAULT,
+                    ALTER COLUMN status TYPE sessionstatus USING status::sessionstatus,
+                    ALTER COLUMN status SET DEFAULT 'ACTIVE'::sessionstatus,
+                    ALTER COLUMN status SET NOT NULL,
+                    ALTER COLUMN started_at SET NOT NULL,
+                    ALTER COLUMN created_by_user_id SET NOT NULL;
+            ELSE
+                ALTER TABLE sessions
+                    ALTER COLUMN status SET DEFAULT 'ACTIVE'::sessionstatus,
+                    ALTER COLUMN status SET NOT NULL,
+                    ALTER COLUMN started_at SET NOT NULL,
+                    ALTER COLUMN created_by_user_id SET NOT NULL;
             END IF;
-            
-            -- Set NOT NULL and default
-            ALTER TABLE sessions ALTER COLUMN status SET DEFAULT 'ACTIVE'::sessionstatus;
-            ALTER TABLE sessions ALTER COLUMN status SET NOT NULL;
-            ALTER TABLE sessions ALTER COLUMN started_at SET NOT NULL;
-            ALTER TABLE sessions ALTER COLUMN created_by_user_id SET NOT NULL;
-        END $$;
-    """)
-    
-    # Update session_reports table
-    op.execute("""
-        DO $$ 
-        BEGIN
+
+            -- Update session_reports table
             -- Add status column if it doesn't exist
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='session_reports' AND column_name='status') THEN
+            IF NOT EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = 'public.session_reports'::regclass AND attname = 'status' AND NOT attisdropped) THEN
                 ALTER TABLE session_reports ADD COLUMN status reportstatus DEFAULT 'PENDING'::reportstatus;
             END IF;
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='session_reports' AND column_name='updated_at') THEN
+            IF NOT EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = 'public.session_reports'::regclass AND attname = 'updated_at' AND NOT attisdropped) THEN
                 ALTER TABLE session_reports ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
             END IF;
-            
-            -- Make summary nullable
+
+            -- Make summary nullable; NULL moments/action_items are backfilled in batches below
             ALTER TABLE session_reports ALTER COLUMN summary DROP NOT NULL;
-            
-            -- Set default for moments and action_items if they're null
-            UPDATE session_reports SET moments = '[]'::jsonb WHERE moments IS NULL;
-            UPDATE session_reports SET action_items = '[]'::jsonb WHERE action_items IS NULL;
-        END $$;
-    """)
-    
-    # Create session_feature_frames table
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='session_feature_frames') THEN
+
+            -- Create session_feature_frames table
+            IF to_regclass('public.session_feature_frames') IS NULL THEN
                 CREATE TABLE session_feature_frames (
                     id VARCHAR NOT NULL PRIMARY KEY,
                     session_id VARCHAR NOT NULL,
@@ -118,9 +87,9 @@ def upgrade() -> None:
                     speaking_rate DOUBLE PRECISION NOT NULL,
                     overlap_ratio DOUBLE PRECISION NOT NULL,
                     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    CONSTRAINT fk_session_feature_frames_session 
+                    CONSTRAINT fk_session_feature_frames_session
                         FOREIGN KEY (session_id) REFERENCES sessions(id),
-                    CONSTRAINT fk_session_feature_frames_user 
+                    CONSTRAINT fk_session_feature_frames_user
                         FOREIGN KEY (user_id) REFERENCES users(id)
                 );
                 CREATE INDEX idx_session_feature_frames_session_id ON session_feature_frames(session_id);
@@ -128,6 +97,38 @@ def upgrade() -> None:
         END $$;
     """)
 
+    # Backfill NULL moments/action_items in committed batches so each batch only holds row locks
+    # (and WAL) for its own rows. COMMIT inside DO needs no surrounding transaction, hence the
+    # autocommit block; backfilled rows drop out of the predicate, so no offset is needed.
+    with op.get_context().autocommit_block():
+        op.execute("""
+            DO $$
+            DECLARE
+                _batch int := 5000;
+                _rows int;
+            BEGIN
+                LOOP
+                    -- Don't wait for the WAL flush per batch: a crash loses at most the last batches,
+                    -- which a rerun redoes. Re-set each pass since COMMIT ends the SET LOCAL scope.
+                    SET LOCAL synchronous_commit = off;
+                    WITH c AS (
+                        SELECT session_id FROM session_reports
+                        WHERE moments IS NULL OR action_items IS NULL
+                        ORDER BY session_id
+                        LIMIT _batch
+                    )
+                    UPDATE session_reports sr
+                    SET moments = COALESCE(sr.moments, '[]'::json),
+                        action_items = COALESCE(sr.action_items, '[]'::json)
+                    FROM c
+                    WHERE sr.session_id = c.session_id;
+                    GET DIAGNOSTICS _rows = ROW_COUNT;
+                    EXIT WHEN _rows = 0;
+                    COMMIT;
+                END LOOP;
+            END $$;
+        """)
+
 
 def downgrade() -> None:
     # Drop session_feature_frames table
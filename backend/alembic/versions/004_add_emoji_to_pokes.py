@@ -5,8 +5,7 @@ Revises: 003_realtime_sessions
 Create Date: 2026-01-27 12:00:00.000000
 
 """
-from alembic import op
-import sqlalchemy as sa
+from app.infra.db.migration_helpers import add_column_migration
 
 
 # revision identifiers, used by Alembic.
@@ -16,18 +15,4 @@ branch_labels = None
 depends_on = None
 
 
-def upgrade() -> None:
-    # Add emoji column to poke_events table (only if it doesn't exist)
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='poke_events' AND column_name='emoji') THEN
-                ALTER TABLE poke_events ADD COLUMN emoji VARCHAR;
-            END IF;
-        END $$;
-    """)
-
-
-def downgrade() -> None:
-    # Remove emoji column from poke_events table
-    op.drop_column('poke_events', 'emoji')
+upgrade, downgrade = add_column_migration('poke_events', 'emoji', 'VARCHAR')
@@ -6,8 +6,6 @@ Create Date: 2026-01-27 20:00:00.000000
 
 """
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import JSONB, ENUM
 
 
 # revision identifiers, used by Alembic.
@@ -18,86 +16,111 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Create ENUM types
-    transaction_category_enum = ENUM('SPEND', 'EARN', name='transaction_category', create_type=True)
-    transaction_status_enum = ENUM(
-        'PURCHASED', 'REDEEMED', 'ACCEPTED', 'PENDING_APPROVAL', 'APPROVED', 'CANCELED',
-        name='transaction_status',
-        create_type=True
-    )
-    
-    # Create economy_settings table
-    op.create_table(
-        'economy_settings',
-        sa.Column('user_id', sa.String(), nullable=False),
-        sa.Column('currency_name', sa.String(), nullable=False),
-        sa.Column('currency_symbol', sa.String(), nullable=False),
-        sa.Column('created_at', sa.DateTime(), nullable=False),
-        sa.Column('updated_at', sa.DateTime(), nullable=False),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('user_id')
-    )
-    
-    # Create wallets table
-    op.create_table(
-        'wallets',
-        sa.Column('id', sa.String(), nullable=False),
-        sa.Column('issuer_id', sa.String(), nullable=False),
-        sa.Column('holder_id', sa.String(), nullable=False),
-        sa.Column('balance', sa.Integer(), server_default='0', nullable=False),
-        sa.Column('created_at', sa.DateTime(), nullable=False),
-        sa.Column('updated_at', sa.DateTime(), nullable=False),
-        sa.ForeignKeyConstraint(['issuer_id'], ['users.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['holder_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('issuer_id', 'holder_id', name='uq_wallet_issuer_holder'),
-        sa.CheckConstraint('balance >= 0', name='ck_wallet_balance_non_negative')
-    )
-    op.create_index('ix_wallets_issuer_id', 'wallets', ['issuer_id'], unique=False)
-    op.create_index('ix_wallets_holder_id', 'wallets', ['holder_id'], unique=False)
-    
-    # Create market_items table
-    op.create_table(
-        'market_items',
-        sa.Column('id', sa.String(), nullable=False),
-        sa.Column('issuer_id', sa.String(), nullable=False),
-        sa.Column('title', sa.String(), nullable=False),
-        sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('cost', sa.Integer(), nullable=False),
-        sa.Column('icon', sa.String(), nullable=True),
-        sa.Column('category', transaction_category_enum, nullable=False),
-        sa.Column('is_active', sa.Boolean(), server_default='true', nullable=False),
-        sa.Column('created_at', sa.DateTime(), nullable=False),
-        sa.Column('updated_at', sa.DateTime(), nullable=False),
-        sa.ForeignKeyConstraint(['issuer_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id'),
-        sa.CheckConstraint('cost > 0', name='ck_market_item_cost_positive')
-    )
-    op.create_index('ix_market_items_issuer_id', 'market_items', ['issuer_id'], unique=False)
-    op.create_index('ix_market_items_is_active', 'market_items', ['is_active'], unique=False)
-    
-    # Create transactions table
-    op.create_table(
-        'transactions',
-        sa.Column('id', sa.String(), nullable=False),
-        sa.Column('wallet_id', sa.String(), nullable=False),
-        sa.Column('market_item_id', sa.String(), nullable=True),
-        sa.Column('category', transaction_category_enum, nullable=False),
-        sa.Column('amount', sa.Integer(), nullable=False),
-        sa.Column('status', transaction_status_enum, nullable=False),
-        sa.Column('tx_metadata', JSONB(), nullable=True),
-        sa.Column('created_at', sa.DateTime(), nullable=False),
-        sa.Column('completed_at', sa.DateTime(), nullable=True),
-        sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['market_item_id'], ['market_items.id'], ondelete='SET NULL'),
-        sa.PrimaryKeyConstraint('id'),
-        sa.CheckConstraint('amount > 0', name='ck_transaction_amount_positive')
-    )
-    op.create_index('ix_transactions_wallet_id', 'transactions', ['wallet_id'], unique=False)
-    op.create_index('ix_transactions_market_item_id', 'transactions', ['market_item_id'], unique=False)
-    op.create_index('ix_transactions_status', 'transactions', ['status'], unique=False)
-    op.create_index('ix_transactions_created_at', 'transactions', ['created_at'], unique=False)
+    # Bound how long the migration may block or run: fail fast on lock contention instead of
+    # queueing behind (and blocking) live traffic. statement_timeout must be set before the DDL
+    # statement starts; lock_timeout is applied inside it. Both are reset at the end so later
+    # migrations in the same transaction keep the session defaults.
+    op.execute("SET LOCAL statement_timeout = '5min'")
+
+    # All types and tables in one DO block: one round trip and one statement instead of a
+    # create_table call each. Tables start UNLOGGED (no WAL for their initial build) and are
+    # switched to LOGGED, while still empty, once their indexes exist.
+    op.execute("""
+        DO $$
+        BEGIN
+            SET LOCAL lock_timeout = '2s';
+
+            CREATE TYPE transaction_category AS ENUM ('SPEND', 'EARN');
+            CREATE TYPE transaction_status AS ENUM (
+                'PURCHASED', 'REDEEMED', 'ACCEPTED', 'PENDING_APPROVAL', 'APPROVED', 'CANCELED'
+            );
+
+            CREATE UNLOGGED TABLE economy_settings (
+                user_id VARCHAR NOT NULL,
+                currency_name VARCHAR NOT NULL,
+                currency_symbol VARCHAR NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (user_id),
+                FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+            );
+
+            CREATE UNLOGGED TABLE wallets (
+                id VARCHAR NOT NULL,
+                issuer_id VARCHAR NOT NULL,
+                holder_id VARCHAR NOT NULL,
+                balance INTEGER DEFAULT '0' NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (id),
+                FOREIGN KEY(issuer_id) REFERENCES users (id) ON DELETE CASCADE,
+                FOREIGN KEY(holder_id) REFERENCES users (id) ON DELETE CASCADE,
+                CONSTRAINT uq_wallet_issuer_holder UNIQUE (issuer_id, holder_id),
+                CONSTRAINT ck_wallet_balance_non_negative CHECK (balance >= 0)
+            );
+
+            CREATE UNLOGGED TABLE market_items (
+                id VARCHAR NOT NULL,
+                issuer_id VARCHAR NOT NULL,
+                title VARCHAR NOT NULL,
+                description TEXT,
+                cost INTEGER NOT NULL,
+                icon VARCHAR,
+                category transaction_category NOT NULL,
+                is_active BOOLEAN DEFAULT 'true' NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                PRIMARY KEY (id),
+                FOREIGN KEY(issuer_id) REFERENCES users (id) ON DELETE CASCADE,
+                CONSTRAINT ck_market_item_cost_positive CHECK (cost > 0)
+            );
+
+            CREATE UNLOGGED TABLE transactions (
+                id VARCHAR NOT NULL,
+                wallet_id VARCHAR NOT NULL,
+                market_item_id VARCHAR,
+                category transaction_category NOT NULL,
+                amount INTEGER NOT NULL,
+                status transaction_status NOT NULL,
+                tx_metadata JSONB,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                completed_at TIMESTAMP WITHOUT TIME ZONE,
+                PRIMARY KEY (id),
+                FOREIGN KEY(wallet_id) REFERENCES wallets (id) ON DELETE CASCADE,
+                FOREIGN KEY(market_item_id) REFERENCES market_items (id) ON DELETE SET NULL,
+                CONSTRAINT ck_transaction_amount_positive CHECK (amount > 0)
+            );
+
+            SET LOCAL lock_timeout TO DEFAULT;
+            SET LOCAL statement_timeout TO DEFAULT;
+        END $$;
+    """)
+
+    # Build indexes CONCURRENTLY so running this against a live database does not block writers.
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_wallets_issuer_id ON wallets (issuer_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_wallets_holder_id ON wallets (holder_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_market_items_issuer_id ON market_items (issuer_id)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_market_items_is_active ON market_items (is_active)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_wallet_id ON transactions (wallet_id)")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_market_item_id "
+            "ON transactions (market_item_id)"
+        )
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_status ON transactions (status)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_created_at ON transactions (created_at)")
 
+    # Referenced tables first: a logged table may not reference an unlogged one
+    op.execute("""
+        DO $$
+        BEGIN
+            ALTER TABLE economy_settings SET LOGGED;
+            ALTER TABLE wallets SET LOGGED;
+            ALTER TABLE market_items SET LOGGED;
+            ALTER TABLE transactions SET LOGGED;
+        END $$;
+    """)
 
 def downgrade() -> None:
     # Drop tables in reverse order
@@ -21,21 +21,33 @@ def upgrade() -> None:
     op.execute("""
         DO $$ 
         BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name='market_item_relationships') THEN
-                CREATE TABLE market_item_relationships (
+            IF to_regclass('public.market_item_relationships') IS NULL THEN
+                CREATE UNLOGGED TABLE market_item_relationships (
                     market_item_id VARCHAR NOT NULL,
                     relationship_id VARCHAR NOT NULL,
                     PRIMARY KEY (market_item_id, relationship_id),
                     FOREIGN KEY(market_item_id) REFERENCES market_items (id) ON DELETE CASCADE,
                     FOREIGN KEY(relationship_id) REFERENCES relationships (id) ON DELETE CASCADE
                 );
-                
-                CREATE INDEX ix_market_item_relationships_market_item_id ON market_item_relationships (market_item_id);
-                CREATE INDEX ix_market_item_relationships_relationship_id ON market_item_relationships (relationship_id);
             END IF;
         END $$;
     """)
 
+    # Indexes CONCURRENTLY (outside the migration transaction) so writers are not blocked
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_market_item_relationships_market_item_id "
+            "ON market_item_relationships (market_item_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_market_item_relationships_relationship_id "
+            "ON market_item_relationships (relationship_id)"
+        )
+
+    # Created UNLOGGED (no WAL for the initial build); switch to LOGGED while still empty.
+    # No-op when the table already existed as a logged table.
+    op.execute("ALTER TABLE market_item_relationships SET LOGGED")
+
 
 def downgrade() -> None:
     op.drop_index('ix_market_item_relationships_relationship_id', table_name='market_item_relationships')
@@ -17,6 +17,8 @@ depends_on = None
 
 
 def upgrade():
+    # Tables are created UNLOGGED (no WAL for their initial build) and switched to LOGGED, while
+    # still empty, once their indexes exist.
     # Create map_prompts table
     op.create_table(
         'map_prompts',
@@ -28,10 +30,9 @@ def upgrade():
         sa.Column('is_active', sa.Boolean(), nullable=False, server_default='true'),
         sa.Column('created_at', sa.DateTime(), nullable=False),
         sa.Column('updated_at', sa.DateTime(), nullable=False),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        prefixes=['UNLOGGED'],
     )
-    op.create_index('ix_map_prompts_category', 'map_prompts', ['category'])
-    op.create_index('ix_map_prompts_difficulty_tier', 'map_prompts', ['difficulty_tier'])
 
     # Create user_specs table
     op.create_table(
@@ -44,10 +45,9 @@ def upgrade():
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.ForeignKeyConstraint(['prompt_id'], ['map_prompts.id'], ),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('user_id', 'prompt_id', name='idx_user_specs_user_prompt')
+        sa.UniqueConstraint('user_id', 'prompt_id', name='idx_user_specs_user_prompt'),
+        prefixes=['UNLOGGED'],
     )
-    op.create_index('ix_user_specs_user_id', 'user_specs', ['user_id'])
-    op.create_index('ix_user_specs_prompt_id', 'user_specs', ['prompt_id'])
 
     # Create relationship_map_progress table
     op.create_table(
@@ -63,10 +63,46 @@ def upgrade():
         sa.ForeignKeyConstraint(['observer_id'], ['users.id'], ),
         sa.ForeignKeyConstraint(['subject_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('observer_id', 'subject_id', name='idx_map_progress_observer_subject')
+        sa.UniqueConstraint('observer_id', 'subject_id', name='idx_map_progress_observer_subject'),
+        prefixes=['UNLOGGED'],
     )
-    op.create_index('ix_relationship_map_progress_observer_id', 'relationship_map_progress', ['observer_id'])
-    op.create_index('ix_relationship_map_progress_subject_id', 'relationship_map_progress', ['subject_id'])
+
+    # Build indexes CONCURRENTLY so writers are not blocked; needs to run outside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_map_prompts_category', 'map_prompts', ['category'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_map_prompts_difficulty_tier', 'map_prompts', ['difficulty_tier'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_specs_user_id', 'user_specs', ['user_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_specs_prompt_id', 'user_specs', ['prompt_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_relationship_map_progress_observer_id', 'relationship_map_progress', ['observer_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_relationship_map_progress_subject_id', 'relationship_map_progress', ['subject_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+    # Referenced tables first: a logged table may not reference an unlogged one
+    op.execute("""
+        DO $$
+        BEGIN
+            ALTER TABLE map_prompts SET LOGGED;
+            ALTER TABLE user_specs SET LOGGED;
+            ALTER TABLE relationship_map_progress SET LOGGED;
+        END $$;
+    """)
 
 
 def downgrade():
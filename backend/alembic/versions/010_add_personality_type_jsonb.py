@@ -7,7 +7,6 @@ Create Date: 2025-01-27 14:00:00.000000
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision = '010_add_personality_type_jsonb'
@@ -23,33 +22,32 @@ def upgrade() -> None:
         BEGIN
             -- If column doesn't exist, create it as JSONB
             IF NOT EXISTS (
-                SELECT 1 
-                FROM information_schema.columns 
-                WHERE table_name='users' 
-                AND column_name='personality_type'
+                SELECT 1
+                FROM pg_attribute
+                WHERE attrelid = 'public.users'::regclass
+                AND attname = 'personality_type'
+                AND NOT attisdropped
             ) THEN
                 ALTER TABLE users ADD COLUMN personality_type JSONB;
             -- If column exists as VARCHAR, convert it to JSONB
             ELSIF EXISTS (
-                SELECT 1 
-                FROM information_schema.columns 
-                WHERE table_name='users' 
-                AND column_name='personality_type'
-                AND data_type='character varying'
+                SELECT 1
+                FROM pg_attribute
+                WHERE attrelid = 'public.users'::regclass
+                AND attname = 'personality_type'
+                AND NOT attisdropped
+                AND atttypid = 'varchar'::regtype
             ) THEN
-                -- Convert existing VARCHAR values to JSONB format
-                UPDATE users 
-                SET personality_type = CASE
-                    WHEN personality_type IS NULL THEN NULL
-                    WHEN personality_type = 'Prefer not to say' THEN '{"type": "Prefer not to say"}'::jsonb
-                    WHEN LENGTH(personality_type) = 4 THEN 
-                        jsonb_build_object('type', personality_type)
-                    ELSE '{"type": "Prefer not to say"}'::jsonb
-                END
-                WHERE personality_type IS NOT NULL;
-                
-                -- Change column type to JSONB
-                ALTER TABLE users ALTER COLUMN personality_type TYPE jsonb USING personality_type::jsonb;
+                -- Convert VARCHAR values to JSONB in the type change itself (one heap rewrite)
+                ALTER TABLE users ALTER COLUMN personality_type TYPE jsonb USING (
+                    CASE
+                        WHEN personality_type IS NULL THEN NULL
+                        WHEN personality_type = 'Prefer not to say' THEN '{"type": "Prefer not to say"}'::jsonb
+                        WHEN LENGTH(personality_type) = 4 THEN
+                            jsonb_build_object('type', personality_type)
+                        ELSE '{"type": "Prefer not to say"}'::jsonb
+                    END
+                );
             END IF;
         END $$;
     """)
@@ -61,23 +59,16 @@ def downgrade() -> None:
         DO $$ 
         BEGIN
             IF EXISTS (
-                SELECT 1 
-                FROM information_schema.columns 
-                WHERE table_name='users' 
-                AND column_name='personality_type'
-                AND data_type='jsonb'
+                SELECT 1
+                FROM pg_attribute
+                WHERE attrelid = 'public.users'::regclass
+                AND attname = 'personality_type'
+                AND NOT attisdropped
+                AND atttypid = 'jsonb'::regtype
             ) THEN
-                -- Extract type from JSONB and convert to VARCHAR
-                UPDATE users 
-                SET personality_type = CASE
-                    WHEN personality_type IS NULL THEN NULL
-                    WHEN personality_type->>'type' IS NOT NULL THEN personality_type->>'type'
-                    ELSE NULL
-                END
-                WHERE personality_type IS NOT NULL;
-                
-                -- Change column type back to VARCHAR
-                ALTER TABLE users ALTER COLUMN personality_type TYPE VARCHAR USING personality_type::VARCHAR;
+                -- Extract type from JSONB while changing the column back to VARCHAR
+                -- (->> yields NULL for a NULL value or a missing key)
+                ALTER TABLE users ALTER COLUMN personality_type TYPE VARCHAR USING (personality_type->>'type');
             END IF;
         END $$;
     """)
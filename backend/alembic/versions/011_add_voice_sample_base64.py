@@ -5,8 +5,7 @@ Revises: ace00b639bf8
 Create Date: 2026-01-27 16:00:00.000000
 
 """
-from alembic import op
-import sqlalchemy as sa
+from app.infra.db.migration_helpers import add_column_migration
 
 
 revision = '011_add_voice_sample_base64'
@@ -15,16 +14,4 @@ branch_labels = None
 depends_on = None
 
 
-def upgrade() -> None:
-    op.execute("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name='voice_profiles' AND column_name='voice_sample_base64') THEN
-                ALTER TABLE voice_profiles ADD COLUMN voice_sample_base64 TEXT;
-            END IF;
-        END $$;
-    """)
-
-
-def downgrade() -> None:
-    op.drop_column('voice_profiles', 'voice_sample_base64')
+upgrade, downgrade = add_column_migration('voice_profiles', 'voice_sample_base64', 'TEXT')
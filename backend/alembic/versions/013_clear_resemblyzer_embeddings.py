@@ -10,6 +10,7 @@ Create Date: 2026-01-29 10:00:00.000000
 
 """
 from alembic import op
+import sqlalchemy as sa
 
 
 revision = "013_clear_resemblyzer"
@@ -18,16 +19,59 @@ branch_labels = None
 depends_on = None
 
 
+def _has_embeddings(conn: sa.engine.Connection) -> bool:
+    if conn.scalar(sa.text("SELECT to_regclass('public.voice_profiles')")) is None:
+        return False
+    return bool(conn.scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM voice_profiles WHERE voice_embedding_json IS NOT NULL)"
+    )))
+
+
 def upgrade() -> None:
     """Clear all voice embeddings so they get recomputed with TitaNet."""
-    op.execute(
-        """
-        UPDATE voice_profiles
-        SET voice_embedding_json = NULL
-        WHERE voice_embedding_json IS NOT NULL;
-        """
-    )
+    # Fresh installs (and reruns) have nothing to clear: skip the index build and batch loop
+    if not _has_embeddings(op.get_bind()):
+        return
 
+    # Clear in committed batches so a large voice_profiles never holds every row lock (and one
+    # huge WAL record stream) in a single transaction. The temporary partial index lets each
+    # batch find the remaining rows without rescanning the heap; COMMIT inside DO and
+    # CREATE INDEX CONCURRENTLY both need to run outside a transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_voice_profiles_embedding_not_null
+            ON voice_profiles (id) WHERE voice_embedding_json IS NOT NULL
+            """
+        )
+        op.execute(
+            """
+            DO $$
+            DECLARE
+                _batch int := 10000;
+                _rows int;
+            BEGIN
+                LOOP
+                    -- Don't wait for the WAL flush per batch: a crash loses at most the last batches,
+                    -- which a rerun redoes. Re-set each pass since COMMIT ends the SET LOCAL scope.
+                    SET LOCAL synchronous_commit = off;
+                    WITH c AS (
+                        SELECT id FROM voice_profiles
+                        WHERE voice_embedding_json IS NOT NULL
+                        LIMIT _batch
+                    )
+                    UPDATE voice_profiles v
+                    SET voice_embedding_json = NULL
+                    FROM c
+                    WHERE v.id = c.id;
+                    GET DIAGNOSTICS _rows = ROW_COUNT;
+                    EXIT WHEN _rows = 0;
+                    COMMIT;
+                END LOOP;
+            END $$;
+            """
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_voice_profiles_embedding_not_null")
 
 def downgrade() -> None:
     """No downgrade possible - embeddings must be recomputed manually."""
@@ -0,0 +1,125 @@
+"""Insider Compass secondary indexes (split from 014_compass_tables)
+
+Revision ID: 014b_compass_indexes
+Revises: 014_compass_tables
+Create Date: 2026-01-29 12:00:00.000000
+
+014 creates the compass tables with only their primary keys; their secondary indexes are built
+here, after any rows have been loaded. A migration that seeds or backfills these tables should
+revise 014_compass_tables (and this revision should then revise it) so the load maintains only
+the primary key and each index is built once over the loaded rows. Backfills of tables that
+already hold data should go through migration_helpers.backfill_in_batches instead of one
+transaction.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import create_indexes_concurrently
+
+revision = "014b_compass_indexes"
+down_revision = "014_compass_tables"
+branch_labels = None
+depends_on = None
+
+
+# Per table, in build order. Tables build in parallel when the env provides parallel_ddl
+# connections (DATABASE_MIGRATION_DDL_CONNECTIONS > 1); a table's own builds run one after another.
+_INDEXES = {
+    # Composites only: their leading columns serve single-column lookups, so separate
+    # actor/relationship/source indexes would just add write cost on the hot insert path.
+    "compass_events": [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_compass_events_actor_created "
+        "ON compass_events (actor_user_id, created_at)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_compass_events_relationship_created "
+        "ON compass_events (relationship_id, created_at)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_compass_events_source_created "
+        "ON compass_events (source, created_at)",
+        # Append-only, so heap order tracks created_at: a few KB of BRIN serves cross-actor time
+        # windows that none of the composites above can.
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_compass_events_created_brin "
+        "ON compass_events USING brin (created_at) WITH (pages_per_range = 32)",
+    ],
+    # owner_user_id lookups use the leading column of the owner composite; canonical keys are
+    # matched case-insensitively (MemoryRepository.get_by_canonical_key), hence lower(). status is
+    # left unindexed (only ever filtered next to owner_user_id) so status changes can be HOT updates.
+    "memories": [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memories_relationship_id ON memories (relationship_id)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memories_memory_type ON memories (memory_type)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memories_owner_relationship "
+        "ON memories (owner_user_id, relationship_id)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memories_canonical_owner_lower "
+        "ON memories (lower(canonical_key), owner_user_id)",
+    ],
+    "person_portraits": [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_person_portraits_owner_user_id "
+        "ON person_portraits (owner_user_id)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_person_portraits_relationship_id "
+        "ON person_portraits (relationship_id)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_person_portraits_owner_relationship "
+        "ON person_portraits (owner_user_id, relationship_id)",
+    ],
+    "dyad_portraits": [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dyad_portraits_relationship_id "
+        "ON dyad_portraits (relationship_id)",
+    ],
+    # Loops are listed per relationship (status only narrows that), so status stays unindexed
+    "relationship_loops": [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_relationship_loops_relationship_id "
+        "ON relationship_loops (relationship_id)",
+    ],
+    # Recommendation filters match any of several tags (?| on the JSONB arrays); default jsonb_ops
+    # GIN supports ?|, which jsonb_path_ops does not.
+    "activity_templates": [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_activity_templates_is_active "
+        "ON activity_templates (is_active)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_activity_templates_relationship_types "
+        "ON activity_templates USING gin (relationship_types)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_activity_templates_vibe_tags "
+        "ON activity_templates USING gin (vibe_tags)",
+    ],
+    "dyad_activity_history": [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dyad_activity_history_relationship_id "
+        "ON dyad_activity_history (relationship_id)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dyad_activity_history_activity_template_id "
+        "ON dyad_activity_history (activity_template_id)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dyad_activity_history_actor_user_id "
+        "ON dyad_activity_history (actor_user_id)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_dyad_activity_history_relationship_started "
+        "ON dyad_activity_history (relationship_id, started_at)",
+    ],
+}
+
+# Per build connection: enough sort memory for each heap scan to stay in memory, and parallel
+# workers for the B-tree builds (GIN builds are single-process before PostgreSQL 18).
+_INDEX_BUILD_SETTINGS = {
+    "maintenance_work_mem": "1GB",
+    "max_parallel_maintenance_workers": "4",
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY (no write lock) needs to run outside a transaction; IF NOT EXISTS plus dropping
+    # INVALID leftovers lets a retry pick up after a failed build.
+    create_indexes_concurrently(_INDEXES, _INDEX_BUILD_SETTINGS)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dyad_activity_history_relationship_started", table_name="dyad_activity_history")
+    op.drop_index("ix_dyad_activity_history_actor_user_id", table_name="dyad_activity_history")
+    op.drop_index("ix_dyad_activity_history_activity_template_id", table_name="dyad_activity_history")
+    op.drop_index("ix_dyad_activity_history_relationship_id", table_name="dyad_activity_history")
+    op.drop_index("ix_activity_templates_vibe_tags", table_name="activity_templates")
+    op.drop_index("ix_activity_templates_relationship_types", table_name="activity_templates")
+    op.drop_index("ix_activity_templates_is_active", table_name="activity_templates")
+    op.drop_index("ix_relationship_loops_relationship_id", table_name="relationship_loops")
+    op.drop_index("ix_dyad_portraits_relationship_id", table_name="dyad_portraits")
+    op.drop_index("ix_person_portraits_owner_relationship", table_name="person_portraits")
+    op.drop_index("ix_person_portraits_relationship_id", table_name="person_portraits")
+    op.drop_index("ix_person_portraits_owner_user_id", table_name="person_portraits")
+    op.drop_index("ix_memories_canonical_owner_lower", table_name="memories", if_exists=True)  # 044's downgrade drops it too
+    op.drop_index("ix_memories_owner_relationship", table_name="memories")
+    op.drop_index("ix_memories_memory_type", table_name="memories")
+    op.drop_index("ix_memories_relationship_id", table_name="memories")
+    op.drop_index("ix_compass_events_created_brin", table_name="compass_events", if_exists=True)  # 042's downgrade drops it too
+    op.drop_index("ix_compass_events_source_created", table_name="compass_events")
+    op.drop_index("ix_compass_events_relationship_created", table_name="compass_events")
+    op.drop_index("ix_compass_events_actor_created", table_name="compass_events")
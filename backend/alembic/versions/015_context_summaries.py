@@ -1,7 +1,7 @@
 """Add context_summaries table for per-use-case personalization context.
 
 Revision ID: 015_context_summaries
-Revises: 014_compass_tables
+Revises: 014b_compass_indexes
 Create Date: 2026-01-27
 
 """
@@ -9,14 +9,18 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
+from app.infra.db.migration_helpers import create_table_if_not_exists, drop_invalid_indexes
+
 revision = "015_context_summaries"
-down_revision = "014_compass_tables"
+down_revision = "014b_compass_indexes"
 branch_labels = None
 depends_on = None
 
 
 def upgrade() -> None:
-    op.create_table(
+    # Indexes are built CONCURRENTLY (no write lock) in autocommit blocks, which also commit the
+    # tables created so far. Existing tables are skipped so a retry after a failed build resumes.
+    create_table_if_not_exists(
         "context_summaries",
         sa.Column("id", sa.String(), nullable=False),
         sa.Column("relationship_id", sa.String(), nullable=True),
@@ -25,26 +29,43 @@ def upgrade() -> None:
         sa.Column("scenario", sa.String(), nullable=True),
         sa.Column("summary_text", sa.Text(), nullable=False),
         sa.Column("evidence_event_ids", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
-        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
-        sa.ForeignKeyConstraint(["actor_user_id"], ["users.id"]),
-        sa.ForeignKeyConstraint(["relationship_id"], ["relationships.id"]),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["actor_user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["relationship_id"], ["relationships.id"], ondelete="SET NULL"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index("ix_context_summaries_actor_user_id", "context_summaries", ["actor_user_id"])
-    op.create_index("ix_context_summaries_relationship_id", "context_summaries", ["relationship_id"])
-    op.create_index("ix_context_summaries_use_case", "context_summaries", ["use_case"])
-    op.create_index("ix_context_summaries_scenario", "context_summaries", ["scenario"])
-    op.create_index(
-        "ix_context_summaries_relationship_use_case",
-        "context_summaries",
-        ["relationship_id", "use_case"],
-    )
-    op.create_index(
-        "ix_context_summaries_actor_use_case",
-        "context_summaries",
-        ["actor_user_id", "use_case"],
-    )
+
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("context_summaries")
+        op.create_index(
+            "ix_context_summaries_actor_user_id", "context_summaries", ["actor_user_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_context_summaries_relationship_id", "context_summaries", ["relationship_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_context_summaries_use_case", "context_summaries", ["use_case"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_context_summaries_scenario", "context_summaries", ["scenario"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_context_summaries_relationship_use_case",
+            "context_summaries",
+            ["relationship_id", "use_case"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_context_summaries_actor_use_case",
+            "context_summaries",
+            ["actor_user_id", "use_case"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
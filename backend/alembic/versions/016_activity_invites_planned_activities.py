@@ -5,30 +5,34 @@ Revises: 015_context_summaries
 Create Date: 2026-01-29
 
 """
+from typing import Set
+
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
 from sqlalchemy.dialects import postgresql
 
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
 revision = "016_activity_invites_planned"
 down_revision = "015_context_summaries"
 branch_labels = None
 depends_on = None
 
 
-def _table_exists(conn: sa.engine.Connection, name: str) -> bool:
-    return inspect(conn).has_table(name)
-
-
-def _column_exists(conn: sa.engine.Connection, table: str, column: str) -> bool:
-    return column in [c["name"] for c in inspect(conn).get_columns(table)]
+def _existing_tables(conn: sa.engine.Connection) -> Set[str]:
+    # One catalog read per upgrade/downgrade; each table is checked once, before it is created or dropped
+    return set(
+        conn.execute(
+            sa.text("SELECT relname FROM pg_class WHERE relnamespace = 'public'::regnamespace AND relkind IN ('r', 'p')")
+        ).scalars()
+    )
 
 
 def upgrade() -> None:
-    conn = op.get_bind()
+    existing = _existing_tables(op.get_bind())
 
     # activity_invites (idempotent: skip if table already exists)
-    if not _table_exists(conn, "activity_invites"):
+    if "activity_invites" not in existing:
         op.create_table(
             "activity_invites",
             sa.Column("id", sa.String(), nullable=False),
@@ -37,19 +41,48 @@ def upgrade() -> None:
             sa.Column("from_user_id", sa.String(), nullable=False),
             sa.Column("to_user_id", sa.String(), nullable=False),
             sa.Column("status", sa.String(), nullable=False, server_default="pending"),
-            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
-            sa.Column("responded_at", sa.DateTime(), nullable=True),
-            sa.ForeignKeyConstraint(["relationship_id"], ["relationships.id"]),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.Column("responded_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["relationship_id"], ["relationships.id"], ondelete="CASCADE"),
             sa.ForeignKeyConstraint(["activity_template_id"], ["activity_templates.activity_id"]),
-            sa.ForeignKeyConstraint(["from_user_id"], ["users.id"]),
-            sa.ForeignKeyConstraint(["to_user_id"], ["users.id"]),
+            sa.ForeignKeyConstraint(["from_user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["to_user_id"], ["users.id"], ondelete="CASCADE"),
             sa.PrimaryKeyConstraint("id"),
         )
-        op.create_index("ix_activity_invites_to_user_id_status", "activity_invites", ["to_user_id", "status"])
-        op.create_index("ix_activity_invites_relationship_id", "activity_invites", ["relationship_id"])
+
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("activity_invites")
+        # Invites are listed per user only while pending (inbox / sent) or once declined; partial
+        # indexes keep the accepted history out of the hot indexes.
+        op.create_index(
+            "ix_activity_invites_to_user_pending", "activity_invites", ["to_user_id", "created_at"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_activity_invites_from_user_pending", "activity_invites", ["from_user_id", "created_at"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_activity_invites_to_user_declined", "activity_invites", ["to_user_id", "responded_at"],
+            postgresql_where=sa.text("status = 'declined'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_activity_invites_relationship_id", "activity_invites", ["relationship_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # At most one pending invite per sender, invitee and activity: a repeated send reuses it
+        op.create_index(
+            "uq_activity_invites_one_pending", "activity_invites",
+            ["relationship_id", "from_user_id", "to_user_id", "activity_template_id"],
+            unique=True, postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
     # planned_activities (idempotent: skip if table already exists)
-    if not _table_exists(conn, "planned_activities"):
+    if "planned_activities" not in existing:
         op.create_table(
             "planned_activities",
             sa.Column("id", sa.String(), nullable=False),
@@ -59,43 +92,71 @@ def upgrade() -> None:
             sa.Column("invitee_user_id", sa.String(), nullable=False),
             sa.Column("invite_id", sa.String(), nullable=True),
             sa.Column("status", sa.String(), nullable=False, server_default="planned"),
-            sa.Column("agreed_at", sa.DateTime(), nullable=False),
-            sa.Column("completed_at", sa.DateTime(), nullable=True),
+            sa.Column("agreed_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
             sa.Column("notes_text", sa.Text(), nullable=True),
             sa.Column("memory_urls", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
-            sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
-            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
-            sa.ForeignKeyConstraint(["relationship_id"], ["relationships.id"]),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(["relationship_id"], ["relationships.id"], ondelete="CASCADE"),
             sa.ForeignKeyConstraint(["activity_template_id"], ["activity_templates.activity_id"]),
-            sa.ForeignKeyConstraint(["initiator_user_id"], ["users.id"]),
-            sa.ForeignKeyConstraint(["invitee_user_id"], ["users.id"]),
-            sa.ForeignKeyConstraint(["invite_id"], ["activity_invites.id"]),
+            sa.ForeignKeyConstraint(["initiator_user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["invitee_user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["invite_id"], ["activity_invites.id"], ondelete="SET NULL"),
             sa.PrimaryKeyConstraint("id"),
         )
-        op.create_index("ix_planned_activities_initiator_status", "planned_activities", ["initiator_user_id", "status"])
-        op.create_index("ix_planned_activities_invitee_status", "planned_activities", ["invitee_user_id", "status"])
-        op.create_index("ix_planned_activities_relationship_id", "planned_activities", ["relationship_id"])
+        # Notes/memories/completion are updated in place; free space keeps those updates HOT
+        op.execute("ALTER TABLE planned_activities SET (fillfactor = 90)")
+
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("planned_activities")
+        # Planned activities are listed per participant across all statuses, newest agreement first
+        op.create_index(
+            "ix_planned_activities_initiator_agreed", "planned_activities", ["initiator_user_id", "agreed_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_planned_activities_invitee_agreed", "planned_activities", ["invitee_user_id", "agreed_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_planned_activities_relationship_id", "planned_activities", ["relationship_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # At most one open plan per dyad and activity: racing accepts reuse the first plan
+        op.create_index(
+            "uq_planned_activities_one_active", "planned_activities",
+            ["relationship_id", "activity_template_id"],
+            unique=True, postgresql_where=sa.text("status = 'planned'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
-    # dyad_activity_history: add notes_text and memory_urls (idempotent: skip if column exists)
-    if not _column_exists(conn, "dyad_activity_history", "notes_text"):
-        op.add_column("dyad_activity_history", sa.Column("notes_text", sa.Text(), nullable=True))
-    if not _column_exists(conn, "dyad_activity_history", "memory_urls"):
-        op.add_column("dyad_activity_history", sa.Column("memory_urls", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    # dyad_activity_history: add notes_text and memory_urls in one ALTER (one lock; idempotent)
+    op.execute(
+        "ALTER TABLE dyad_activity_history "
+        "ADD COLUMN IF NOT EXISTS notes_text TEXT, ADD COLUMN IF NOT EXISTS memory_urls JSONB"
+    )
 
 
 def downgrade() -> None:
-    conn = op.get_bind()
+    existing = _existing_tables(op.get_bind())
     # dyad_activity_history: drop columns only if they exist
-    if _column_exists(conn, "dyad_activity_history", "memory_urls"):
-        op.drop_column("dyad_activity_history", "memory_urls")
-    if _column_exists(conn, "dyad_activity_history", "notes_text"):
-        op.drop_column("dyad_activity_history", "notes_text")
-    if _table_exists(conn, "planned_activities"):
+    op.execute(
+        "ALTER TABLE dyad_activity_history "
+        "DROP COLUMN IF EXISTS memory_urls, DROP COLUMN IF EXISTS notes_text"
+    )
+    if "planned_activities" in existing:
+        op.drop_index("uq_planned_activities_one_active", table_name="planned_activities", if_exists=True)  # 046's downgrade drops it too
         op.drop_index("ix_planned_activities_relationship_id", table_name="planned_activities")
-        op.drop_index("ix_planned_activities_invitee_status", table_name="planned_activities")
-        op.drop_index("ix_planned_activities_initiator_status", table_name="planned_activities")
+        # 038's downgrade swaps the (user, agreed_at) indexes back to the old ones first
+        op.drop_index("ix_planned_activities_invitee_agreed", table_name="planned_activities", if_exists=True)
+        op.drop_index("ix_planned_activities_initiator_agreed", table_name="planned_activities", if_exists=True)
         op.drop_table("planned_activities")
-    if _table_exists(conn, "activity_invites"):
+    if "activity_invites" in existing:
+        op.drop_index("uq_activity_invites_one_pending", table_name="activity_invites", if_exists=True)  # 046's downgrade drops it too
         op.drop_index("ix_activity_invites_relationship_id", table_name="activity_invites")
-        op.drop_index("ix_activity_invites_to_user_id_status", table_name="activity_invites")
+        # 038's downgrade swaps the partial per-user indexes back to the old ones first
+        op.drop_index("ix_activity_invites_to_user_declined", table_name="activity_invites", if_exists=True)
+        op.drop_index("ix_activity_invites_from_user_pending", table_name="activity_invites", if_exists=True)
+        op.drop_index("ix_activity_invites_to_user_pending", table_name="activity_invites", if_exists=True)
         op.drop_table("activity_invites")
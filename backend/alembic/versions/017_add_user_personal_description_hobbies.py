@@ -6,8 +6,6 @@ Create Date: 2026-01-30
 
 """
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
 
 revision = "017_user_description_hobbies"
 down_revision = "016_activity_invites_planned"
@@ -16,13 +14,9 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column("users", sa.Column("personal_description", sa.Text(), nullable=True))
-    op.add_column(
-        "users",
-        sa.Column("hobbies", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
-    )
+    # One ALTER for both columns: a single ACCESS EXCLUSIVE lock on users
+    op.execute("ALTER TABLE users ADD COLUMN personal_description TEXT, ADD COLUMN hobbies JSONB")
 
 
 def downgrade() -> None:
-    op.drop_column("users", "hobbies")
-    op.drop_column("users", "personal_description")
+    op.execute("ALTER TABLE users DROP COLUMN hobbies, DROP COLUMN personal_description")
@@ -6,8 +6,8 @@ Create Date: 2026-01-30
 
 """
 from alembic import op
-import sqlalchemy as sa
-from sqlalchemy.dialects import postgresql
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
 
 revision = "018_dyad_planned_memory"
 down_revision = "017_user_description_hobbies"
@@ -16,20 +16,23 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column(
-        "dyad_activity_history",
-        sa.Column("planned_id", sa.String(), nullable=True),
-    )
-    op.add_column(
-        "dyad_activity_history",
-        sa.Column("memory_entries", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
-    )
-    op.create_index(
-        "ix_dyad_activity_history_planned_id",
-        "dyad_activity_history",
-        ["planned_id"],
+    # IF NOT EXISTS: the autocommit block below commits these columns, so a retry after a failed
+    # index build must not re-add them.
+    op.execute(
+        "ALTER TABLE dyad_activity_history "
+        "ADD COLUMN IF NOT EXISTS planned_id VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS memory_entries JSONB"
     )
 
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("dyad_activity_history")
+        op.create_index(
+            "ix_dyad_activity_history_planned_id",
+            "dyad_activity_history",
+            ["planned_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
 
 def downgrade() -> None:
     op.drop_index("ix_dyad_activity_history_planned_id", table_name="dyad_activity_history")
@@ -8,6 +8,8 @@ Create Date: 2026-01-30
 from alembic import op
 import sqlalchemy as sa
 
+from app.infra.db.migration_helpers import create_table_if_not_exists, drop_invalid_indexes
+
 revision = "020_devices_table"
 down_revision = "019_relationship_type_date"
 branch_labels = None
@@ -15,21 +17,31 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.create_table(
+    # Indexes are built CONCURRENTLY (no write lock) in autocommit blocks, which also commit the
+    # tables created so far. Existing tables are skipped so a retry after a failed build resumes.
+    create_table_if_not_exists(
         "devices",
         sa.Column("id", sa.String(), nullable=False),
         sa.Column("user_id", sa.String(), nullable=False),
         sa.Column("push_token", sa.String(), nullable=False),
         sa.Column("platform", sa.String(), nullable=False),
-        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
+        # Push tokens are issued per push service, so uniqueness is scoped by platform
+        sa.UniqueConstraint("push_token", "platform", name="uq_devices_push_token_platform"),
     )
-    op.create_index("ix_devices_user_id", "devices", ["user_id"], unique=False)
-    op.create_index("ix_devices_push_token", "devices", ["push_token"], unique=True)
 
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("devices")
+        # The push sender reads (push_token, platform) per user: covered, so an index-only scan
+        op.create_index(
+            "ix_devices_user_platform", "devices", ["user_id", "platform"],
+            postgresql_include=["push_token"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
 
 def downgrade() -> None:
-    op.drop_index("ix_devices_push_token", table_name="devices")
-    op.drop_index("ix_devices_user_id", table_name="devices")
+    # 040's downgrade drops this index on the way down
+    op.drop_index("ix_devices_user_platform", table_name="devices", if_exists=True)
     op.drop_table("devices")
@@ -7,7 +7,8 @@ Create Date: 2026-01-30
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import text
+
+from app.infra.db.migration_helpers import create_table_if_not_exists
 
 revision = "025_lounge"
 down_revision = "024_want_to_try"
@@ -15,22 +16,8 @@ branch_labels = None
 depends_on = None
 
 
-def _table_exists(conn, table_name: str) -> bool:
-    r = conn.execute(
-        text(
-            "SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = 'public' AND table_name = :name"
-        ),
-        {"name": table_name},
-    )
-    return r.fetchone() is not None
-
-
 def upgrade() -> None:
-    conn = op.get_bind()
-    if _table_exists(conn, "lounge_rooms"):
-        return
-    op.create_table(
+    create_table_if_not_exists(
         "lounge_rooms",
         sa.Column("id", sa.String(), nullable=False),
         sa.Column("owner_user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False, index=True),
@@ -40,7 +27,7 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint("id"),
     )
 
-    op.create_table(
+    create_table_if_not_exists(
         "lounge_members",
         sa.Column("room_id", sa.String(), sa.ForeignKey("lounge_rooms.id"), nullable=False),
         sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
@@ -48,12 +35,13 @@ def upgrade() -> None:
         sa.Column("invited_by_user_id", sa.String(), sa.ForeignKey("users.id"), nullable=True),
         sa.PrimaryKeyConstraint("room_id", "user_id"),
     )
-    op.create_index("ix_lounge_members_user_id", "lounge_members", ["user_id"], unique=False)
+    op.create_index("ix_lounge_members_user_id", "lounge_members", ["user_id"], unique=False, if_not_exists=True)
 
-    op.create_table(
+    create_table_if_not_exists(
         "lounge_messages",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("room_id", sa.String(), sa.ForeignKey("lounge_rooms.id"), nullable=False, index=True),
+        # Append-heavy: an identity bigint keeps the PK (and heap) in insert order and 8 bytes wide
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column("room_id", sa.String(), sa.ForeignKey("lounge_rooms.id"), nullable=False),
         sa.Column("sender_user_id", sa.String(), sa.ForeignKey("users.id"), nullable=True, index=True),  # None = Kai
         sa.Column("content", sa.Text(), nullable=False),
         sa.Column("visibility", sa.String(), nullable=False, server_default="public", index=True),
@@ -61,9 +49,22 @@ def upgrade() -> None:
         sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index("ix_lounge_messages_room_sequence", "lounge_messages", ["room_id", "sequence"], unique=False)
+    op.create_index("ix_lounge_messages_room_sequence", "lounge_messages", ["room_id", "sequence"], unique=False, if_not_exists=True)
+    # Room timeline page (newest first, optionally since the viewer joined): private rows are left
+    # out, and created_at is a key column so the joined_at filter is checked without heap fetches
+    op.create_index(
+        "ix_lounge_messages_room_public_sequence", "lounge_messages",
+        ["room_id", sa.text("sequence DESC"), "created_at"],
+        postgresql_where=sa.text("visibility = 'public'"), if_not_exists=True,
+    )
+    # Append-only, so heap order tracks created_at: cross-room time windows get a few KB of BRIN
+    # instead of a row-per-entry btree
+    op.create_index(
+        "ix_lounge_messages_created_brin", "lounge_messages", ["created_at"],
+        postgresql_using="brin", postgresql_with={"pages_per_range": 32}, if_not_exists=True,
+    )
 
-    op.create_table(
+    create_table_if_not_exists(
         "lounge_kai_context",
         sa.Column("room_id", sa.String(), sa.ForeignKey("lounge_rooms.id"), nullable=False),
         sa.Column("summary_text", sa.Text(), nullable=True),
@@ -72,17 +73,21 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint("room_id"),
     )
 
-    op.create_table(
+    create_table_if_not_exists(
         "lounge_events",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("room_id", sa.String(), sa.ForeignKey("lounge_rooms.id"), nullable=False, index=True),
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column("room_id", sa.String(), sa.ForeignKey("lounge_rooms.id"), nullable=False),
         sa.Column("sequence", sa.Integer(), nullable=False, index=True),
         sa.Column("event_type", sa.String(), nullable=False, index=True),
         sa.Column("payload", sa.dialects.postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'")),
         sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index("ix_lounge_events_room_sequence", "lounge_events", ["room_id", "sequence"], unique=False)
+    op.create_index("ix_lounge_events_room_sequence", "lounge_events", ["room_id", "sequence"], unique=False, if_not_exists=True)
+    op.create_index(
+        "ix_lounge_events_created_brin", "lounge_events", ["created_at"],
+        postgresql_using="brin", postgresql_with={"pages_per_range": 32}, if_not_exists=True,
+    )
 
 
 def downgrade() -> None:
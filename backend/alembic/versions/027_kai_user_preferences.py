@@ -7,7 +7,9 @@ Create Date: 2026-01-31
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.infra.db.migration_helpers import drop_invalid_indexes, table_exists
 
 revision = "027_kai_user_prefs"
 down_revision = "026_lounge_sender_null"
@@ -15,44 +17,24 @@ branch_labels = None
 depends_on = None
 
 
-def _table_exists(connection) -> bool:
-    """Return True if kai_user_preferences table exists (avoids failing the transaction)."""
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = 'public' AND table_name = 'kai_user_preferences' LIMIT 1"
-        )
-    )
-    return result.fetchone() is not None
-
-
-def _index_exists(connection, index_name: str) -> bool:
-    """Return True if the given index exists."""
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM pg_indexes "
-            "WHERE schemaname = 'public' AND indexname = :name LIMIT 1"
-        ),
-        {"name": index_name},
-    )
-    return result.fetchone() is not None
-
-
 def upgrade() -> None:
     connection = op.get_bind()
-    if _table_exists(connection):
-        # Table already exists (e.g. created manually or previous partial run); ensure index.
-        if not _index_exists(connection, "ix_kai_user_preferences_user_created"):
+    if table_exists(connection, "kai_user_preferences"):
+        # Table already exists (e.g. created manually or previous partial run); ensure index
+        # without blocking writes to its rows.
+        with op.get_context().autocommit_block():
+            drop_invalid_indexes("kai_user_preferences")
             op.create_index(
                 "ix_kai_user_preferences_user_created",
                 "kai_user_preferences",
                 ["user_id", "created_at"],
-                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
             )
         return
     op.create_table(
         "kai_user_preferences",
-        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("id", postgresql.UUID(), nullable=False, server_default=sa.text("gen_random_uuid()")),
         sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False, index=True),
         sa.Column("content", sa.Text(), nullable=False),
         sa.Column("kind", sa.String(), nullable=False, index=True),
@@ -8,6 +8,8 @@ Create Date: 2026-02-01
 from alembic import op
 import sqlalchemy as sa
 
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
 revision = "028_compass_processed_at"
 down_revision = "027_kai_user_prefs"
 branch_labels = None
@@ -19,21 +21,27 @@ def upgrade() -> None:
         "compass_events",
         sa.Column("processed_at", sa.DateTime(), nullable=True),
     )
-    op.create_index(
-        "ix_compass_events_actor_processed",
-        "compass_events",
-        ["actor_user_id", "processed_at"],
-        unique=False,
-    )
-    op.create_index(
-        "ix_compass_events_relationship_processed",
-        "compass_events",
-        ["relationship_id", "processed_at"],
-        unique=False,
-    )
+    # compass_events is the largest, most write-heavy table: build without blocking appends
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("compass_events")
+        op.create_index(
+            "ix_compass_events_actor_processed",
+            "compass_events",
+            ["actor_user_id", "processed_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_compass_events_relationship_processed",
+            "compass_events",
+            ["relationship_id", "processed_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
 
 
 def downgrade() -> None:
-    op.drop_index("ix_compass_events_relationship_processed", table_name="compass_events")
-    op.drop_index("ix_compass_events_actor_processed", table_name="compass_events")
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_compass_events_relationship_processed")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_compass_events_actor_processed")
     op.drop_column("compass_events", "processed_at")
@@ -7,7 +7,9 @@ Create Date: 2026-02-01
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.infra.db.migration_helpers import drop_invalid_indexes, table_exists
 
 revision = "029_unstructured_memories"
 down_revision = "028_compass_processed_at"
@@ -15,54 +17,41 @@ branch_labels = None
 depends_on = None
 
 
-def _table_exists(connection, table_name: str) -> bool:
-    """Return True if the table exists (avoids failing the transaction)."""
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = 'public' AND table_name = :name LIMIT 1"
-        ),
-        {"name": table_name},
-    )
-    return result.fetchone() is not None
-
-
-def _index_exists(connection, index_name: str) -> bool:
-    """Return True if the given index exists."""
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM pg_indexes "
-            "WHERE schemaname = 'public' AND indexname = :name LIMIT 1"
-        ),
-        {"name": index_name},
-    )
-    return result.fetchone() is not None
-
-
 def upgrade() -> None:
     connection = op.get_bind()
-    if _table_exists(connection, "unstructured_memories"):
-        # Table already exists; ensure indexes exist.
-        if not _index_exists(connection, "ix_unstructured_memories_owner_created"):
+    if table_exists(connection, "unstructured_memories"):
+        # Table already exists (and may hold rows); build missing indexes without blocking writes.
+        with op.get_context().autocommit_block():
+            drop_invalid_indexes("unstructured_memories")
             op.create_index(
                 "ix_unstructured_memories_owner_created",
                 "unstructured_memories",
                 ["owner_user_id", "created_at"],
-                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
             )
-        if not _index_exists(connection, "ix_unstructured_memories_relationship_created"):
             op.create_index(
                 "ix_unstructured_memories_relationship_created",
                 "unstructured_memories",
                 ["relationship_id", "created_at"],
-                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.create_index(
+                "ix_unstructured_memories_created_brin",
+                "unstructured_memories",
+                ["created_at"],
+                postgresql_using="brin",
+                postgresql_with={"pages_per_range": 32},
+                postgresql_concurrently=True,
+                if_not_exists=True,
             )
         return
     op.create_table(
         "unstructured_memories",
-        sa.Column("id", sa.String(), nullable=False),
-        sa.Column("owner_user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False, index=True),
-        sa.Column("relationship_id", sa.String(), sa.ForeignKey("relationships.id"), nullable=True, index=True),
+        sa.Column("id", postgresql.UUID(), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("owner_user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("relationship_id", sa.String(), sa.ForeignKey("relationships.id"), nullable=True),
         sa.Column("content_text", sa.Text(), nullable=False),
         sa.Column("source", sa.String(), nullable=False, index=True),
         sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
@@ -80,6 +69,14 @@ def upgrade() -> None:
         ["relationship_id", "created_at"],
         unique=False,
     )
+    # Append-only, so heap order tracks created_at
+    op.create_index(
+        "ix_unstructured_memories_created_brin",
+        "unstructured_memories",
+        ["created_at"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
 
 
 def downgrade() -> None:
@@ -7,7 +7,8 @@ Create Date: 2026-02-01
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import text
+
+from app.infra.db.migration_helpers import drop_invalid_indexes, table_exists
 
 revision = "030_things_to_find_out"
 down_revision = "029_unstructured_memories"
@@ -15,54 +16,32 @@ branch_labels = None
 depends_on = None
 
 
-def _table_exists(connection, table_name: str) -> bool:
-    """Return True if the table exists (avoids failing the transaction)."""
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM information_schema.tables "
-            "WHERE table_schema = 'public' AND table_name = :name LIMIT 1"
-        ),
-        {"name": table_name},
-    )
-    return result.fetchone() is not None
-
-
-def _index_exists(connection, index_name: str) -> bool:
-    """Return True if the given index exists."""
-    result = connection.execute(
-        text(
-            "SELECT 1 FROM pg_indexes "
-            "WHERE schemaname = 'public' AND indexname = :name LIMIT 1"
-        ),
-        {"name": index_name},
-    )
-    return result.fetchone() is not None
-
-
 def upgrade() -> None:
     connection = op.get_bind()
-    if _table_exists(connection, "things_to_find_out"):
-        # Table already exists; ensure indexes exist.
-        if not _index_exists(connection, "ix_things_to_find_out_owner_created"):
+    if table_exists(connection, "things_to_find_out"):
+        # Table already exists (and may hold rows); build missing indexes without blocking writes.
+        with op.get_context().autocommit_block():
+            drop_invalid_indexes("things_to_find_out")
             op.create_index(
                 "ix_things_to_find_out_owner_created",
                 "things_to_find_out",
                 ["owner_user_id", "created_at"],
-                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
             )
-        if not _index_exists(connection, "ix_things_to_find_out_relationship_created"):
             op.create_index(
                 "ix_things_to_find_out_relationship_created",
                 "things_to_find_out",
                 ["relationship_id", "created_at"],
-                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
             )
         return
     op.create_table(
         "things_to_find_out",
         sa.Column("id", sa.String(), nullable=False),
-        sa.Column("owner_user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False, index=True),
-        sa.Column("relationship_id", sa.String(), sa.ForeignKey("relationships.id"), nullable=True, index=True),
+        sa.Column("owner_user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("relationship_id", sa.String(), sa.ForeignKey("relationships.id"), nullable=True),
         sa.Column("question_text", sa.Text(), nullable=False),
         sa.Column("source", sa.String(), nullable=False, index=True),
         sa.Column("priority", sa.Integer(), nullable=True),
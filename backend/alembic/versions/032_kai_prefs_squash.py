@@ -0,0 +1,98 @@
+"""Bring kai_user_preferences up to the model's columns in one ALTER TABLE.
+
+Revision ID: 032_kai_prefs_squash
+Revises: 031_lounge_goal
+Create Date: 2026-02-03
+
+Squashes 032-035, which patched the table one or two columns per revision (each its own ALTER,
+lock acquisition and commit). Databases stamped at one of those revisions are re-pointed to 031 by
+env.py before the run, so this revision runs there and adds whatever they lack. The table may have
+been created with only id, user_id and content (e.g. idempotent skip in 027), and some databases
+carry the legacy NOT NULL "type" and "text" columns the model now sets. The columns found missing
+are added by one ALTER, NOT NULL with constant defaults (catalog-only: no rewrite, no NOT NULL
+validation scan); type/text are then backfilled from kind/content, and one more ALTER drops the
+defaults so inserts must set the values. The backfill is one UPDATE of the rows that differ from
+the defaults, or on large tables a TYPE ... USING rewrite folded into that last ALTER. Indexes on added columns are built concurrently at the end, as the table may hold rows.
+Databases that already have every column only run the index probes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infra.db.migration_helpers import drop_invalid_indexes, existing_columns
+
+revision = "032_kai_prefs_squash"
+down_revision = "031_lounge_goal"
+branch_labels = None
+depends_on = None
+
+_TABLE = "kai_user_preferences"
+
+# column -> (definition added when missing, whether its default is dropped afterwards, index)
+_COLUMNS = {
+    "content": ("content TEXT NOT NULL DEFAULT ''", True, None),
+    "kind": ("kind VARCHAR NOT NULL DEFAULT 'preference'", True, "ix_kai_user_preferences_kind"),
+    "source": ("source VARCHAR NOT NULL DEFAULT 'public'", True, "ix_kai_user_preferences_source"),
+    "room_id": ("room_id VARCHAR REFERENCES lounge_rooms (id)", False, "ix_kai_user_preferences_room_id"),
+    "created_at": ("created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()", False, None),
+    "type": ("type VARCHAR NOT NULL DEFAULT 'preference'", True, "ix_kai_user_preferences_type"),
+    "text": ('"text" TEXT NOT NULL DEFAULT \'\'', True, None),
+}
+
+# Legacy columns that mirror another column: (source column, default it was added with, type)
+_BACKFILLS = {
+    "type": ("kind", "preference", "VARCHAR"),
+    "text": ("content", "", "TEXT"),
+}
+
+# From this many rows (planner estimate) the backfill rewrites the table instead of updating it
+_REWRITE_MIN_ROWS = 100_000
+
+
+def _estimated_rows(conn) -> float:
+    return conn.execute(
+        sa.text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"), {"table": f"public.{_TABLE}"}
+    ).scalar()
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    missing = [name for name in _COLUMNS if name not in existing_columns(conn, _TABLE)]
+
+    if missing:
+        backfills = [name for name in missing if name in _BACKFILLS]
+        # Backfilling (almost) every row of a large table with UPDATE leaves a dead tuple per row
+        # until VACUUM. There the backfill rides on the ALTER that drops the defaults instead, as
+        # TYPE ... USING: one pass writes a fresh copy of the table and its indexes (WAL-skipped
+        # under wal_level=minimal), under the ACCESS EXCLUSIVE lock the ALTERs take anyway, and
+        # keeps the table's foreign keys and grants, which a copy-and-rename would lose.
+        rewrite = bool(backfills) and _estimated_rows(conn) >= _REWRITE_MIN_ROWS
+
+        op.execute(f"ALTER TABLE {_TABLE} " + ", ".join(f"ADD COLUMN {_COLUMNS[name][0]}" for name in missing))
+
+        changes = [f'ALTER COLUMN "{name}" DROP DEFAULT' for name in missing if _COLUMNS[name][1]]
+        if rewrite:
+            for name in backfills:
+                source, default, sql_type = _BACKFILLS[name]
+                changes.append(f"ALTER COLUMN \"{name}\" TYPE {sql_type} USING COALESCE({source}, '{default}')")
+        elif backfills:
+            assignments = []
+            conditions = []
+            for name in backfills:
+                source, default, _sql_type = _BACKFILLS[name]
+                assignments.append(f"\"{name}\" = COALESCE({source}, '{default}')")
+                conditions.append(f"({source} IS NOT NULL AND {source} <> '{default}')")
+            op.execute(f"UPDATE {_TABLE} SET {', '.join(assignments)} WHERE {' OR '.join(conditions)}")
+        if changes:
+            op.execute(f"ALTER TABLE {_TABLE} {', '.join(changes)}")
+
+    new_indexes = [(_COLUMNS[name][2], [name]) for name in missing if _COLUMNS[name][2]]
+    new_indexes.append(("ix_kai_user_preferences_user_created", ["user_id", "created_at"]))
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(_TABLE)
+        for name, index_columns in new_indexes:
+            op.create_index(name, _TABLE, index_columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    # Only the legacy columns: the rest are part of the table 027 creates
+    op.execute(f'ALTER TABLE {_TABLE} DROP COLUMN IF EXISTS type, DROP COLUMN IF EXISTS "text"')
@@ -1,7 +1,7 @@
 """Add birthday and occupation to users (optional personal profile fields).
 
 Revision ID: 036_user_birthday_occupation
-Revises: 035_kai_prefs_text
+Revises: 032_kai_prefs_squash
 Create Date: 2026-02-02
 
 """
@@ -9,7 +9,7 @@ from alembic import op
 import sqlalchemy as sa
 
 revision = "036_user_birthday_occupation"
-down_revision = "035_kai_prefs_text"
+down_revision = "032_kai_prefs_squash"
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,35 @@
+"""Drop single-column compass_events/memories indexes covered by composites.
+
+Revision ID: 037_drop_redundant_compass_idx
+Revises: 036_user_birthday_occupation
+Create Date: 2026-02-03
+
+014b no longer creates these; this removes them from databases migrated before that change.
+"""
+from alembic import op
+
+revision = "037_drop_redundant_compass_idx"
+down_revision = "036_user_birthday_occupation"
+branch_labels = None
+depends_on = None
+
+# (index, table, column); each column leads a composite that serves the same lookups
+_REDUNDANT_INDEXES = [
+    ("ix_compass_events_actor_user_id", "compass_events", "actor_user_id"),
+    ("ix_compass_events_relationship_id", "compass_events", "relationship_id"),
+    ("ix_compass_events_source", "compass_events", "source"),
+    ("ix_memories_owner_user_id", "memories", "owner_user_id"),
+    ("ix_memories_canonical_key", "memories", "canonical_key"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _column in _REDUNDANT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in _REDUNDANT_INDEXES:
+            op.create_index(name, table, [column], postgresql_concurrently=True, if_not_exists=True)
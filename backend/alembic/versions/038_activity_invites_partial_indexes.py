@@ -0,0 +1,73 @@
+"""Replace (user, status) indexes on activity_invites/planned_activities with query-shaped ones.
+
+Revision ID: 038_activity_partial_indexes
+Revises: 037_drop_redundant_compass_idx
+Create Date: 2026-02-03
+
+016 now builds these directly; this brings databases migrated before that change in line.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "038_activity_partial_indexes"
+down_revision = "037_drop_redundant_compass_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the replacements before dropping the old indexes so lookups stay indexed throughout
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("activity_invites")
+        op.create_index(
+            "ix_activity_invites_to_user_pending", "activity_invites", ["to_user_id", "created_at"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_activity_invites_from_user_pending", "activity_invites", ["from_user_id", "created_at"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_activity_invites_to_user_declined", "activity_invites", ["to_user_id", "responded_at"],
+            postgresql_where=sa.text("status = 'declined'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_activity_invites_to_user_id_status")
+
+        drop_invalid_indexes("planned_activities")
+        op.create_index(
+            "ix_planned_activities_initiator_agreed", "planned_activities", ["initiator_user_id", "agreed_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_planned_activities_invitee_agreed", "planned_activities", ["invitee_user_id", "agreed_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_planned_activities_initiator_status")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_planned_activities_invitee_status")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_planned_activities_invitee_status", "planned_activities", ["invitee_user_id", "status"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_planned_activities_initiator_status", "planned_activities", ["initiator_user_id", "status"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_planned_activities_invitee_agreed")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_planned_activities_initiator_agreed")
+
+        op.create_index(
+            "ix_activity_invites_to_user_id_status", "activity_invites", ["to_user_id", "status"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_activity_invites_to_user_declined")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_activity_invites_from_user_pending")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_activity_invites_to_user_pending")
@@ -0,0 +1,65 @@
+"""Cascade user/relationship deletes to compass, context and activity rows.
+
+Revision ID: 039_compass_activity_fk_ondelete
+Revises: 038_activity_partial_indexes
+Create Date: 2026-02-03
+
+014/015/016 now declare ON DELETE on these foreign keys; this re-creates them on databases migrated
+before that change.
+"""
+from alembic import op
+
+revision = "039_compass_activity_fk_ondelete"
+down_revision = "038_activity_partial_indexes"
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table, ON DELETE action); nullable relationship links are cleared
+# rather than deleting the row with the relationship.
+_FOREIGN_KEYS = [
+    ("compass_events", "actor_user_id", "users", "CASCADE"),
+    ("compass_events", "relationship_id", "relationships", "SET NULL"),
+    ("memories", "owner_user_id", "users", "CASCADE"),
+    ("memories", "relationship_id", "relationships", "SET NULL"),
+    ("person_portraits", "owner_user_id", "users", "CASCADE"),
+    ("person_portraits", "relationship_id", "relationships", "SET NULL"),
+    ("dyad_portraits", "relationship_id", "relationships", "CASCADE"),
+    ("relationship_loops", "relationship_id", "relationships", "CASCADE"),
+    ("dyad_activity_history", "relationship_id", "relationships", "CASCADE"),
+    ("dyad_activity_history", "actor_user_id", "users", "CASCADE"),
+    ("context_summaries", "actor_user_id", "users", "CASCADE"),
+    ("context_summaries", "relationship_id", "relationships", "SET NULL"),
+    ("activity_invites", "relationship_id", "relationships", "CASCADE"),
+    ("activity_invites", "from_user_id", "users", "CASCADE"),
+    ("activity_invites", "to_user_id", "users", "CASCADE"),
+    ("planned_activities", "relationship_id", "relationships", "CASCADE"),
+    ("planned_activities", "initiator_user_id", "users", "CASCADE"),
+    ("planned_activities", "invitee_user_id", "users", "CASCADE"),
+    ("planned_activities", "invite_id", "activity_invites", "SET NULL"),
+]
+
+
+def _replace_foreign_keys(on_delete: bool) -> None:
+    # NOT VALID skips the scan of existing rows while the ADD holds its ACCESS EXCLUSIVE lock. The
+    # autocommit block commits first, releasing those locks; each VALIDATE then checks the rows in
+    # its own transaction under SHARE UPDATE EXCLUSIVE, which does not block reads or writes.
+    names = []
+    for table, column, ref_table, action in _FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        clause = f" ON DELETE {action}" if on_delete else ""
+        op.execute(
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}, "
+            f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {ref_table} (id){clause} NOT VALID"
+        )
+        names.append((table, name))
+    with op.get_context().autocommit_block():
+        for table, name in names:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(on_delete=True)
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(on_delete=False)
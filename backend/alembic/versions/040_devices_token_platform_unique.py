@@ -0,0 +1,58 @@
+"""Scope devices.push_token uniqueness by platform; index devices by (user_id, platform).
+
+Revision ID: 040_devices_token_platform
+Revises: 039_compass_activity_fk_ondelete
+Create Date: 2026-02-03
+
+020 now creates these directly; this brings databases migrated before that change in line.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "040_devices_token_platform"
+down_revision = "039_compass_activity_fk_ondelete"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("devices")
+        # Build the unique index without blocking writes, then attach it as the constraint
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_devices_push_token_platform "
+            "ON devices (push_token, platform)"
+        )
+        op.execute("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint WHERE conname = 'uq_devices_push_token_platform'
+                ) THEN
+                    ALTER TABLE devices ADD CONSTRAINT uq_devices_push_token_platform
+                        UNIQUE USING INDEX uq_devices_push_token_platform;
+                END IF;
+            END $$;
+        """)
+        op.create_index(
+            "ix_devices_user_platform", "devices", ["user_id", "platform"],
+            postgresql_include=["push_token"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_devices_push_token")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_devices_user_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_devices_user_id", "devices", ["user_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_devices_push_token", "devices", ["push_token"], unique=True,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("ALTER TABLE devices DROP CONSTRAINT IF EXISTS uq_devices_push_token_platform")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_devices_user_platform")
@@ -0,0 +1,48 @@
+"""Store compass event/memory/portrait/loop primary keys as native uuid.
+
+Revision ID: 041_compass_uuid_pks
+Revises: 040_devices_token_platform
+Create Date: 2026-02-03
+
+014 now creates these columns as uuid; this converts databases migrated before that change. The ids
+are always generate_id() UUID strings, so the cast cannot fail. Each ALTER rewrites its table (and
+PK index) under an ACCESS EXCLUSIVE lock, so run it in a quiet window on large installs.
+"""
+from alembic import op
+
+revision = "041_compass_uuid_pks"
+down_revision = "040_devices_token_platform"
+branch_labels = None
+depends_on = None
+
+_PRIMARY_KEYS = [
+    ("compass_events", "event_id"),
+    ("memories", "memory_id"),
+    ("person_portraits", "portrait_id"),
+    ("dyad_portraits", "dyad_portrait_id"),
+    ("relationship_loops", "loop_id"),
+]
+
+
+def _convert(to_type: str, from_type: str, cast: str) -> None:
+    # One DO block: skips columns already of the target type, so a retry is a no-op
+    body = "\n".join(
+        f"""
+            IF EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = 'public.{table}'::regclass AND attname = '{column}'
+                AND NOT attisdropped AND atttypid = '{from_type}'::regtype
+            ) THEN
+                ALTER TABLE {table} ALTER COLUMN {column} TYPE {to_type} USING {column}::{cast};
+            END IF;"""
+        for table, column in _PRIMARY_KEYS
+    )
+    op.execute(f"DO $$\n        BEGIN{body}\n        END $$;")
+
+
+def upgrade() -> None:
+    _convert("uuid", "varchar", "uuid")
+
+
+def downgrade() -> None:
+    _convert("VARCHAR", "uuid", "text")
@@ -0,0 +1,31 @@
+"""Add a BRIN index on compass_events.created_at for cross-actor time-window scans.
+
+Revision ID: 042_compass_events_brin
+Revises: 041_compass_uuid_pks
+Create Date: 2026-02-03
+
+014b now builds this directly; this adds it to databases migrated before that change.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "042_compass_events_brin"
+down_revision = "041_compass_uuid_pks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("compass_events")
+        op.create_index(
+            "ix_compass_events_created_brin", "compass_events", ["created_at"],
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32},
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_compass_events_created_brin")
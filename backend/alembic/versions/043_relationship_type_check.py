@@ -0,0 +1,42 @@
+"""Store relationships.type as VARCHAR with a CHECK constraint instead of the relationshiptype enum.
+
+Revision ID: 043_relationship_type_check
+Revises: 042_compass_events_brin
+Create Date: 2026-02-03
+
+Adding a type is then a constraint swap inside the migration's transaction (see below) rather than
+ALTER TYPE ... ADD VALUE, and no values can be stranded in a type that cannot drop them. The type
+change rewrites relationships under an ACCESS EXCLUSIVE lock; the table is small.
+
+To allow a new type later, in a new revision:
+    ALTER TABLE relationships DROP CONSTRAINT ck_relationship_type,
+        ADD CONSTRAINT ck_relationship_type CHECK (type IN (..., 'NEW_TYPE'))
+"""
+from alembic import op
+
+revision = "043_relationship_type_check"
+down_revision = "042_compass_events_brin"
+branch_labels = None
+depends_on = None
+
+# Must match RelationshipType in app/infra/db/models/relationship.py
+_RELATIONSHIP_TYPES = ("COUPLE", "DATE", "FAMILY", "FRIEND_1_1", "FRIEND_GROUP", "OTHER")
+_VALUES = ", ".join(f"'{t}'" for t in _RELATIONSHIP_TYPES)
+
+
+def upgrade() -> None:
+    # One rewrite: the CHECK is verified while the column is converted
+    op.execute(
+        "ALTER TABLE relationships DROP CONSTRAINT IF EXISTS ck_relationship_type, "
+        "ALTER COLUMN type TYPE VARCHAR(32) USING type::text, "
+        f"ADD CONSTRAINT ck_relationship_type CHECK (type IN ({_VALUES}))"
+    )
+    op.execute("DROP TYPE IF EXISTS relationshiptype")
+
+
+def downgrade() -> None:
+    op.execute(f"CREATE TYPE relationshiptype AS ENUM ({_VALUES})")
+    op.execute(
+        "ALTER TABLE relationships DROP CONSTRAINT IF EXISTS ck_relationship_type, "
+        "ALTER COLUMN type TYPE relationshiptype USING type::relationshiptype"
+    )
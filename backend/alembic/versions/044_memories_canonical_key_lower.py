@@ -0,0 +1,36 @@
+"""Index memories by lower(canonical_key) for case-insensitive canonical-key lookups.
+
+Revision ID: 044_memories_canonical_lower
+Revises: 043_relationship_type_check
+Create Date: 2026-02-03
+
+014b now builds ix_memories_canonical_owner_lower in place of ix_memories_canonical_owner; this
+swaps them on databases migrated before that change.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "044_memories_canonical_lower"
+down_revision = "043_relationship_type_check"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("memories")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memories_canonical_owner_lower "
+            "ON memories (lower(canonical_key), owner_user_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_memories_canonical_owner")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_memories_canonical_owner", "memories", ["canonical_key", "owner_user_id"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_memories_canonical_owner_lower")
@@ -0,0 +1,65 @@
+"""Store compass, context, activity and device timestamps as TIMESTAMPTZ.
+
+Revision ID: 045_timestamptz
+Revises: 044_memories_canonical_lower
+Create Date: 2026-02-03
+
+014/015/016/020 now create these columns as TIMESTAMPTZ; this converts databases migrated before
+that change. Stored values are naive UTC (the app writes datetime.utcnow()), hence AT TIME ZONE
+'UTC'. All of a table's columns convert in one ALTER, so each table is rewritten once, under an
+ACCESS EXCLUSIVE lock: run it in a quiet window on large installs.
+"""
+from alembic import op
+
+revision = "045_timestamptz"
+down_revision = "044_memories_canonical_lower"
+branch_labels = None
+depends_on = None
+
+_TABLES = [
+    "compass_events",
+    "memories",
+    "person_portraits",
+    "dyad_portraits",
+    "relationship_loops",
+    "activity_templates",
+    "dyad_activity_history",
+    "context_summaries",
+    "activity_invites",
+    "planned_activities",
+    "devices",
+]
+
+
+def _convert(to_type: str, from_type: str) -> None:
+    # Converts only columns still of from_type, so a retry (or a fresh database) is a no-op
+    tables = ", ".join(f"'{t}'" for t in _TABLES)
+    op.execute(f"""
+        DO $$
+        DECLARE
+            t text;
+            clauses text;
+        BEGIN
+            FOREACH t IN ARRAY ARRAY[{tables}] LOOP
+                SELECT string_agg(
+                    format('ALTER COLUMN %I TYPE {to_type} USING %I AT TIME ZONE ''UTC''', attname, attname),
+                    ', '
+                )
+                INTO clauses
+                FROM pg_attribute
+                WHERE attrelid = to_regclass(t) AND attnum > 0 AND NOT attisdropped
+                AND atttypid = '{from_type}'::regtype;
+                IF clauses IS NOT NULL THEN
+                    EXECUTE format('ALTER TABLE %I ', t) || clauses;
+                END IF;
+            END LOOP;
+        END $$;
+    """)
+
+
+def upgrade() -> None:
+    _convert("timestamptz", "timestamp")
+
+
+def downgrade() -> None:
+    _convert("timestamp", "timestamptz")
@@ -0,0 +1,76 @@
+"""Allow one pending invite per sender/invitee/activity and one open plan per dyad/activity.
+
+Revision ID: 046_one_pending_one_active
+Revises: 045_timestamptz
+Create Date: 2026-02-03
+
+016 now builds these unique partial indexes directly; this adds them to databases migrated before
+that change. Duplicates left by earlier racing requests are resolved first (the newest pending
+invite and the oldest open plan are kept, matching what the repositories now return), otherwise
+the unique builds would fail. Extra plans are deleted unless history rows point at them; those
+are marked completed instead.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "046_one_pending_one_active"
+down_revision = "045_timestamptz"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM activity_invites a
+        USING activity_invites b
+        WHERE a.status = 'pending' AND b.status = 'pending'
+        AND a.relationship_id = b.relationship_id
+        AND a.from_user_id = b.from_user_id
+        AND a.to_user_id = b.to_user_id
+        AND a.activity_template_id = b.activity_template_id
+        AND (a.created_at, a.id) < (b.created_at, b.id)
+    """)
+    # Bare duplicate plans go; ones with history rows attached can't be deleted, so they are closed
+    # as completed instead, leaving only the oldest open
+    op.execute("""
+        DELETE FROM planned_activities a
+        USING planned_activities b
+        WHERE a.status = 'planned' AND b.status = 'planned'
+        AND a.relationship_id = b.relationship_id
+        AND a.activity_template_id = b.activity_template_id
+        AND (a.agreed_at, a.id) > (b.agreed_at, b.id)
+        AND NOT EXISTS (SELECT 1 FROM dyad_activity_history h WHERE h.planned_id = a.id)
+    """)
+    op.execute("""
+        UPDATE planned_activities a
+        SET status = 'completed', completed_at = COALESCE(a.completed_at, now()), updated_at = now()
+        FROM planned_activities b
+        WHERE a.status = 'planned' AND b.status = 'planned'
+        AND a.relationship_id = b.relationship_id
+        AND a.activity_template_id = b.activity_template_id
+        AND (a.agreed_at, a.id) > (b.agreed_at, b.id)
+    """)
+
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("activity_invites")
+        op.create_index(
+            "uq_activity_invites_one_pending", "activity_invites",
+            ["relationship_id", "from_user_id", "to_user_id", "activity_template_id"],
+            unique=True, postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        drop_invalid_indexes("planned_activities")
+        op.create_index(
+            "uq_planned_activities_one_active", "planned_activities",
+            ["relationship_id", "activity_template_id"],
+            unique=True, postgresql_where=sa.text("status = 'planned'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_planned_activities_one_active")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_activity_invites_one_pending")
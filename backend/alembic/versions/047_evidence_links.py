@@ -0,0 +1,76 @@
+"""evidence_links: normalized, event-indexed copy of the evidence_event_ids arrays.
+
+Revision ID: 047_evidence_links
+Revises: 046_one_pending_one_active
+Create Date: 2026-02-03
+
+The repositories keep evidence_links in step with the arrays from now on; this backfills existing
+rows. The evidence_event_ids columns stay until readers move to evidence_links.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.infra.db.migration_helpers import backfill_in_batches, create_indexes_concurrently, create_table_if_not_exists
+
+revision = "047_evidence_links"
+down_revision = "046_one_pending_one_active"
+branch_labels = None
+depends_on = None
+
+# (parent_kind, table, primary key)
+_PARENTS = [
+    ("memory", "memories", "memory_id"),
+    ("person_portrait", "person_portraits", "portrait_id"),
+    ("dyad_portrait", "dyad_portraits", "dyad_portrait_id"),
+    ("loop", "relationship_loops", "loop_id"),
+    ("context_summary", "context_summaries", "id"),
+]
+
+
+def upgrade() -> None:
+    create_table_if_not_exists(
+        "evidence_links",
+        sa.Column("parent_kind", sa.String(), nullable=False),
+        sa.Column("parent_id", sa.String(), nullable=False),
+        sa.Column("event_id", postgresql.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["compass_events.event_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("parent_kind", "parent_id", "event_id"),
+    )
+
+    # Batched so large tables do not load in one transaction; ids not in compass_events are skipped,
+    # and the CASE keeps malformed ids from reaching the uuid cast (so the join can use the events
+    # primary key). ON CONFLICT makes reruns safe.
+    for kind, table, key in _PARENTS:
+        backfill_in_batches(
+            table,
+            key,
+            f"""
+            INSERT INTO evidence_links (parent_kind, parent_id, event_id)
+            SELECT '{kind}', p.{key}::text, e.event_id
+            FROM {table} p
+            CROSS JOIN LATERAL jsonb_array_elements_text(p.evidence_event_ids) AS ids (event_id)
+            JOIN compass_events e ON e.event_id = CASE
+                WHEN ids.event_id ~* '^[0-9a-f]{{8}}-[0-9a-f]{{4}}-[0-9a-f]{{4}}-[0-9a-f]{{4}}-[0-9a-f]{{12}}$'
+                THEN ids.event_id::uuid
+            END
+            WHERE p.{key} BETWEEN :first AND :last
+            AND jsonb_typeof(p.evidence_event_ids) = 'array'
+            ON CONFLICT DO NOTHING
+            """,
+        )
+
+    # Built after the backfill, once, over the loaded rows
+    create_indexes_concurrently(
+        {
+            "evidence_links": [
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_evidence_links_event_id "
+                "ON evidence_links (event_id)",
+            ],
+        },
+        {},
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("evidence_links")
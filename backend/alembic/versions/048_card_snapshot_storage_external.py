@@ -0,0 +1,25 @@
+"""Store activity_invites/planned_activities.card_snapshot uncompressed (STORAGE EXTERNAL).
+
+Revision ID: 048_card_snapshot_external
+Revises: 047_evidence_links
+Create Date: 2026-02-03
+
+022 now sets this when adding the columns; this sets it on databases migrated before that change.
+Catalog-only: existing values keep their current form until rewritten.
+"""
+from alembic import op
+
+revision = "048_card_snapshot_external"
+down_revision = "047_evidence_links"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE activity_invites ALTER COLUMN card_snapshot SET STORAGE EXTERNAL")
+    op.execute("ALTER TABLE planned_activities ALTER COLUMN card_snapshot SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE planned_activities ALTER COLUMN card_snapshot SET STORAGE EXTENDED")
+    op.execute("ALTER TABLE activity_invites ALTER COLUMN card_snapshot SET STORAGE EXTENDED")
@@ -0,0 +1,156 @@
+"""Range-partition compass_events by month on created_at.
+
+Revision ID: 049_compass_events_partitioned
+Revises: 048_card_snapshot_external
+Create Date: 2026-02-03
+
+The existing table is renamed and attached, as is, as the partition for everything before the
+first day of next month (or dropped when empty), under a new partitioned compass_events; monthly
+partitions and a DEFAULT partition follow (see app.infra.db.partitions, which app startup also
+runs to keep three months ahead). A validated CHECK and a concurrently built (event_id,
+created_at) unique index are prepared first, so the rename/attach transaction neither scans nor
+rebuilds the old rows, and the parent's indexes are attached to the matching existing ones.
+A partitioned table cannot have a unique key on event_id alone, so the evidence_links foreign
+key is dropped. 014 still creates a plain table: later revisions (039's NOT VALID foreign keys,
+042's concurrent index build) cannot run against a partitioned one.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.infra.db.migration_helpers import drop_invalid_indexes, is_partitioned
+from app.infra.db.partitions import (
+    MONTHS_AHEAD,
+    default_partition_ddl,
+    month_start,
+    monthly_partition_ddl,
+)
+
+revision = "049_compass_events_partitioned"
+down_revision = "048_card_snapshot_external"
+branch_labels = None
+depends_on = None
+
+_INDEXES = [
+    "CREATE INDEX ix_compass_events_actor_created ON compass_events (actor_user_id, created_at)",
+    "CREATE INDEX ix_compass_events_relationship_created ON compass_events (relationship_id, created_at)",
+    "CREATE INDEX ix_compass_events_source_created ON compass_events (source, created_at)",
+    "CREATE INDEX ix_compass_events_actor_processed ON compass_events (actor_user_id, processed_at)",
+    "CREATE INDEX ix_compass_events_relationship_processed ON compass_events (relationship_id, processed_at)",
+    "CREATE INDEX ix_compass_events_created_brin ON compass_events USING brin (created_at) "
+    "WITH (pages_per_range = 32)",
+]
+
+
+def _create_table(partition_by: str) -> None:
+    op.execute(f"""
+        CREATE TABLE compass_events (
+            event_id UUID NOT NULL,
+            type VARCHAR NOT NULL,
+            actor_user_id VARCHAR NOT NULL
+                CONSTRAINT compass_events_actor_user_id_fkey REFERENCES users (id) ON DELETE CASCADE,
+            relationship_id VARCHAR
+                CONSTRAINT compass_events_relationship_id_fkey REFERENCES relationships (id) ON DELETE SET NULL,
+            payload_json JSONB NOT NULL DEFAULT '{{}}'::jsonb,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            privacy_scope VARCHAR NOT NULL DEFAULT 'private',
+            source VARCHAR NOT NULL,
+            processed_at TIMESTAMPTZ
+        ){partition_by}
+    """)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if is_partitioned(conn, "compass_events"):
+        return
+
+    # First month the new monthly partitions cover; later than every existing row
+    newest = conn.execute(sa.text("SELECT max(created_at) FROM compass_events")).scalar()
+    today = datetime.utcnow().date()
+    boundary = month_start(max(today, newest.date()) if newest else today, 1)
+
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("compass_events")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS compass_events_event_created_key "
+            "ON compass_events (event_id, created_at)"
+        )
+        # NOT VALID then VALIDATE: the scan runs under a lock that does not block reads or writes.
+        # ATTACH relies on this constraint to skip scanning the rows again.
+        op.execute("ALTER TABLE compass_events DROP CONSTRAINT IF EXISTS compass_events_before_partitioning")
+        op.execute(
+            "ALTER TABLE compass_events ADD CONSTRAINT compass_events_before_partitioning "
+            f"CHECK (created_at < '{boundary.isoformat()} 00:00:00+00') NOT VALID"
+        )
+        op.execute("ALTER TABLE compass_events VALIDATE CONSTRAINT compass_events_before_partitioning")
+
+    op.execute("ALTER TABLE evidence_links DROP CONSTRAINT IF EXISTS evidence_links_event_id_fkey")
+    op.execute("ALTER TABLE compass_events RENAME TO compass_events_legacy")
+    # Free the index names for the parent; renaming an index renames its constraint too
+    op.execute("""
+        DO $$
+        DECLARE
+            idx text;
+        BEGIN
+            FOR idx IN
+                SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = 'public.compass_events_legacy'::regclass
+            LOOP
+                EXECUTE format(
+                    'ALTER INDEX %I RENAME TO %I', idx, replace(idx, 'compass_events', 'compass_events_legacy')
+                );
+            END LOOP;
+        END $$;
+    """)
+
+    _create_table(" PARTITION BY RANGE (created_at)")
+    # Declared while the parent has no partitions, so these are catalog-only; partitions created or
+    # attached later get matching indexes (attached when they already have one, built otherwise).
+    op.execute("ALTER TABLE compass_events ADD CONSTRAINT compass_events_pkey PRIMARY KEY (event_id, created_at)")
+    for statement in _INDEXES:
+        op.execute(statement)
+
+    if conn.execute(sa.text("SELECT EXISTS (SELECT 1 FROM compass_events_legacy)")).scalar():
+        # The old primary key becomes (event_id, created_at) so it matches the parent's
+        op.execute(
+            "ALTER TABLE compass_events_legacy DROP CONSTRAINT compass_events_legacy_pkey, "
+            "ADD CONSTRAINT compass_events_legacy_pkey PRIMARY KEY USING INDEX compass_events_legacy_event_created_key"
+        )
+        op.execute(
+            "ALTER TABLE compass_events ATTACH PARTITION compass_events_legacy "
+            f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()} 00:00:00+00')"
+        )
+        op.execute("ALTER TABLE compass_events_legacy DROP CONSTRAINT compass_events_before_partitioning")
+        first = boundary
+    else:
+        op.execute("DROP TABLE compass_events_legacy")
+        first = month_start(today)
+
+    op.execute(default_partition_ddl())
+    for statement in monthly_partition_ddl(first, month_start(today, MONTHS_AHEAD)):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    # Copies every row into a plain table under an ACCESS EXCLUSIVE lock on compass_events
+    if not is_partitioned(op.get_bind(), "compass_events"):
+        return
+    op.execute("ALTER TABLE compass_events RENAME TO compass_events_partitioned")
+    _create_table("")
+    op.execute(
+        "INSERT INTO compass_events (event_id, type, actor_user_id, relationship_id, payload_json, "
+        "created_at, privacy_scope, source, processed_at) "
+        "SELECT event_id, type, actor_user_id, relationship_id, payload_json, "
+        "created_at, privacy_scope, source, processed_at FROM compass_events_partitioned"
+    )
+    # Constraints and indexes come after the drop, which frees their names
+    op.execute("DROP TABLE compass_events_partitioned")
+    op.execute("ALTER TABLE compass_events ADD CONSTRAINT compass_events_pkey PRIMARY KEY (event_id)")
+    for statement in _INDEXES:
+        op.execute(statement)
+    op.execute(
+        "ALTER TABLE evidence_links ADD CONSTRAINT evidence_links_event_id_fkey FOREIGN KEY (event_id) "
+        "REFERENCES compass_events (event_id) ON DELETE CASCADE"
+    )
@@ -0,0 +1,42 @@
+"""fillfactor 90 on in-place-updated compass/activity tables; drop the status indexes that block HOT.
+
+Revision ID: 050_hot_update_fillfactor
+Revises: 049_compass_events_partitioned
+Create Date: 2026-02-03
+
+014/014b/016 now do this directly; this brings databases migrated before that change in line.
+SET (fillfactor) only changes how full new pages are filled, so it takes effect as rows are
+updated (or at once after VACUUM FULL / pg_repack). Loops and memories are always listed per
+relationship/owner, so their single-column status indexes serve no query, and dropping them lets
+status changes be HOT updates.
+"""
+from alembic import op
+
+revision = "050_hot_update_fillfactor"
+down_revision = "049_compass_events_partitioned"
+branch_labels = None
+depends_on = None
+
+_TABLES = ["memories", "person_portraits", "dyad_portraits", "relationship_loops", "planned_activities"]
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = 90)")
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_memories_status")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_relationship_loops_status")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_relationship_loops_status", "relationship_loops", ["status"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_memories_status", "memories", ["status"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor)")
@@ -0,0 +1,81 @@
+"""Use identity bigint primary keys for lounge_messages and lounge_events.
+
+Revision ID: 051_lounge_identity_ids
+Revises: 050_hot_update_fillfactor
+Create Date: 2026-02-03
+
+025 now creates these ids as BIGINT GENERATED BY DEFAULT AS IDENTITY; this converts databases
+migrated before that change. Existing rows are numbered in heap order, which for these append-only
+tables is roughly insert order.
+
+Message ids are referenced: lounge events carry the message they announce as payload->>'message_id'
+and list_events replays that payload to clients. So lounge_messages gets the identity column next
+to the old id first, the events' message_id values are rewritten old -> new through a join, and only
+then is the old id dropped and the new one renamed into its place. Nothing references event ids, so
+lounge_events swaps its key in one ALTER, before the payload rewrite moves its rows. Each table is
+rewritten under an ACCESS EXCLUSIVE lock.
+"""
+from alembic import op
+
+revision = "051_lounge_identity_ids"
+down_revision = "050_hot_update_fillfactor"
+branch_labels = None
+depends_on = None
+
+_TABLES = ["lounge_messages", "lounge_events"]
+
+
+def _id_is(table: str, type_: str, column: str = "id") -> str:
+    return f"""EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = 'public.{table}'::regclass AND attname = '{column}'
+                AND NOT attisdropped AND atttypid = '{type_}'::regtype
+            )"""
+
+
+# One DO block; every step checks the catalog first, so a retry is a no-op. lounge_events is
+# renumbered before its payloads are rewritten, so its new ids still follow the original heap order.
+_TO_IDENTITY = f"""DO $$
+        BEGIN
+            IF {_id_is("lounge_messages", "varchar")} THEN
+                ALTER TABLE lounge_messages ADD COLUMN IF NOT EXISTS new_id BIGINT GENERATED BY DEFAULT AS IDENTITY;
+            END IF;
+            IF {_id_is("lounge_events", "varchar")} THEN
+                ALTER TABLE lounge_events DROP CONSTRAINT lounge_events_pkey, DROP COLUMN id,
+                    ADD COLUMN id BIGINT GENERATED BY DEFAULT AS IDENTITY CONSTRAINT lounge_events_pkey PRIMARY KEY;
+            END IF;
+            IF {_id_is("lounge_messages", "bigint", "new_id")} THEN
+                UPDATE lounge_events e
+                SET payload = jsonb_set(e.payload, '{{message_id}}', to_jsonb(m.new_id::text))
+                FROM lounge_messages m
+                WHERE e.payload ? 'message_id' AND e.payload->>'message_id' = m.id;
+                ALTER TABLE lounge_messages DROP CONSTRAINT lounge_messages_pkey, DROP COLUMN id;
+                ALTER TABLE lounge_messages RENAME COLUMN new_id TO id;
+                -- named like the sequence 025 creates
+                ALTER SEQUENCE lounge_messages_new_id_seq RENAME TO lounge_messages_id_seq;
+                ALTER TABLE lounge_messages ADD CONSTRAINT lounge_messages_pkey PRIMARY KEY (id);
+            END IF;
+        END $$;"""
+
+
+def _to_varchar() -> str:
+    # Separate statements: the type change is checked against the identity before any subcommand
+    # of the same ALTER runs. Event payloads keep the bigint message ids as text, which still match
+    # the converted ids.
+    body = "".join(
+        f"""
+            IF {_id_is(table, "bigint")} THEN
+                ALTER TABLE {table} ALTER COLUMN id DROP IDENTITY IF EXISTS;
+                ALTER TABLE {table} ALTER COLUMN id TYPE VARCHAR USING id::text;
+            END IF;"""
+        for table in _TABLES
+    )
+    return f"DO $$\n        BEGIN{body}\n        END $$;"
+
+
+def upgrade() -> None:
+    op.execute(_TO_IDENTITY)
+
+
+def downgrade() -> None:
+    op.execute(_to_varchar())
@@ -0,0 +1,38 @@
+"""Partial index for the public lounge timeline page.
+
+Revision ID: 052_lounge_public_timeline_idx
+Revises: 051_lounge_identity_ids
+Create Date: 2026-02-03
+
+025 now builds this directly; this brings databases migrated before that change in line.
+list_public_messages reads a room's public messages newest first, often only those since the
+viewer joined. On (room_id, sequence) every private row and every row older than the join time
+costs a heap fetch before it is filtered out; this index holds public rows only and carries
+created_at as a key column, so only the returned page touches the heap. The existing
+(room_id, sequence) index stays: the next-sequence lookup and the private thread use it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "052_lounge_public_timeline_idx"
+down_revision = "051_lounge_identity_ids"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("lounge_messages")
+        op.create_index(
+            "ix_lounge_messages_room_public_sequence", "lounge_messages",
+            ["room_id", sa.text("sequence DESC"), "created_at"],
+            postgresql_where=sa.text("visibility = 'public'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_lounge_messages_room_public_sequence")
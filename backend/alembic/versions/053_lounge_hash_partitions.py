@@ -0,0 +1,101 @@
+"""Hash-partition lounge_messages and lounge_events on room_id.
+
+Revision ID: 053_lounge_hash_partitions
+Revises: 052_lounge_public_timeline_idx
+Create Date: 2026-02-03
+
+Every lounge query is scoped to one room, so with HASH (room_id) it reads one of 16 partitions and
+that partition's indexes instead of indexes over every room (see app.infra.db.partitions). The
+primary keys become (id, room_id), as a partitioned table's unique keys must include the
+partition key. Rows of a plain table span every hash partition, so unlike compass_events (049) the
+old table cannot be attached as is: each table is renamed, its rows copied into the new partitioned
+table, and then dropped, all under an ACCESS EXCLUSIVE lock held until the migration commits.
+Indexes are built after the copy, and ids keep their values (the identity resumes after the
+largest). 025 still creates plain tables, since 052 builds an index concurrently.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import is_partitioned
+from app.infra.db.partitions import hash_partition_ddl
+
+revision = "053_lounge_hash_partitions"
+down_revision = "052_lounge_public_timeline_idx"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = {
+    "lounge_messages": """
+            id BIGINT NOT NULL,
+            room_id VARCHAR NOT NULL CONSTRAINT lounge_messages_room_id_fkey REFERENCES lounge_rooms (id),
+            sender_user_id VARCHAR CONSTRAINT lounge_messages_sender_user_id_fkey REFERENCES users (id),
+            content TEXT NOT NULL,
+            visibility VARCHAR NOT NULL DEFAULT 'public',
+            sequence INTEGER NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+    """,
+    "lounge_events": """
+            id BIGINT NOT NULL,
+            room_id VARCHAR NOT NULL CONSTRAINT lounge_events_room_id_fkey REFERENCES lounge_rooms (id),
+            sequence INTEGER NOT NULL,
+            event_type VARCHAR NOT NULL,
+            payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+    """,
+}
+
+_INDEXES = {
+    "lounge_messages": [
+        "CREATE INDEX ix_lounge_messages_sender_user_id ON lounge_messages (sender_user_id)",
+        "CREATE INDEX ix_lounge_messages_visibility ON lounge_messages (visibility)",
+        "CREATE INDEX ix_lounge_messages_sequence ON lounge_messages (sequence)",
+        "CREATE INDEX ix_lounge_messages_room_sequence ON lounge_messages (room_id, sequence)",
+        "CREATE INDEX ix_lounge_messages_room_public_sequence ON lounge_messages "
+        "(room_id, sequence DESC, created_at) WHERE visibility = 'public'",
+        "CREATE INDEX ix_lounge_messages_created_brin ON lounge_messages USING brin (created_at) "
+        "WITH (pages_per_range = 32)",
+    ],
+    "lounge_events": [
+        "CREATE INDEX ix_lounge_events_sequence ON lounge_events (sequence)",
+        "CREATE INDEX ix_lounge_events_event_type ON lounge_events (event_type)",
+        "CREATE INDEX ix_lounge_events_room_sequence ON lounge_events (room_id, sequence)",
+        "CREATE INDEX ix_lounge_events_created_brin ON lounge_events USING brin (created_at) "
+        "WITH (pages_per_range = 32)",
+    ],
+}
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Replace table with a copy that is (or is not) hash-partitioned, keeping rows and ids."""
+    old = f"{table}_unpartitioned" if partitioned else f"{table}_partitioned"
+    # Named explicitly: 051 moved id to the end of the converted tables
+    columns = ", ".join(line.split()[0] for line in _COLUMNS[table].strip().splitlines())
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"CREATE TABLE {table} ({_COLUMNS[table]}){' PARTITION BY HASH (room_id)' if partitioned else ''}")
+    if partitioned:
+        for statement in hash_partition_ddl(table):
+            op.execute(statement)
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {old}")
+    # Dropping the old table frees its index, constraint and identity sequence names
+    op.execute(f"DROP TABLE {old}")
+    key = "id, room_id" if partitioned else "id"
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({key})")
+    for statement in _INDEXES[table]:
+        op.execute(statement)
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    op.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(max(id), 0) + 1, false) FROM {table}"
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table in _COLUMNS:
+        if not is_partitioned(conn, table):
+            _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table in _COLUMNS:
+        if is_partitioned(conn, table):
+            _rebuild(table, partitioned=False)
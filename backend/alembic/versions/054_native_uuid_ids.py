@@ -0,0 +1,61 @@
+"""Store discover feed, want-to-try, Kai preference and unstructured memory ids as uuid.
+
+Revision ID: 054_native_uuid_ids
+Revises: 053_lounge_hash_partitions
+Create Date: 2026-02-03
+
+023/024/027/029 now create these columns as UUID; this converts databases migrated before that
+change. The ids have always been generate_id() strings, so they cast as is, and a 16-byte uuid
+compares as bytes where a ~37-byte varchar goes through collation, which roughly halves the
+primary key and discover_feed_item_id indexes. Each type change rewrites its table and indexes
+under an ACCESS EXCLUSIVE lock. The foreign keys on discover_feed_item_id are dropped while both
+sides change type and re-added (validated) afterwards.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import column_type
+
+revision = "054_native_uuid_ids"
+down_revision = "053_lounge_hash_partitions"
+branch_labels = None
+depends_on = None
+
+# table -> id columns to convert; tables holding a discover_feed_item_id follow discover_feed_items
+_COLUMNS = {
+    "discover_feed_items": ["id"],
+    "discover_dismissals": ["id", "discover_feed_item_id"],
+    "activity_want_to_try": ["id", "discover_feed_item_id"],
+    "activity_mutual_matches": ["id", "discover_feed_item_id"],
+    "kai_user_preferences": ["id"],
+    "unstructured_memories": ["id"],
+}
+
+
+def _convert(to_uuid: bool) -> None:
+    conn = op.get_bind()
+    tables = [t for t in _COLUMNS if column_type(conn, t, "id") == ("character varying" if to_uuid else "uuid")]
+    if not tables:
+        return
+    referencing = [t for t in tables if "discover_feed_item_id" in _COLUMNS[t]]
+    for table in referencing:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_discover_feed_item_id_fkey")
+    for table in tables:
+        # One ALTER per table, so it is rewritten (and its indexes rebuilt) once
+        changes = [
+            f"ALTER COLUMN {column} TYPE UUID USING {column}::uuid" if to_uuid else f"ALTER COLUMN {column} TYPE VARCHAR"
+            for column in _COLUMNS[table]
+        ]
+        op.execute(f"ALTER TABLE {table} {', '.join(changes)}")
+    for table in referencing:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_discover_feed_item_id_fkey "
+            "FOREIGN KEY (discover_feed_item_id) REFERENCES discover_feed_items (id)"
+        )
+
+
+def upgrade() -> None:
+    _convert(to_uuid=True)
+
+
+def downgrade() -> None:
+    _convert(to_uuid=False)
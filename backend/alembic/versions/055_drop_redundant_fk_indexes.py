@@ -0,0 +1,61 @@
+"""Drop single-column foreign key indexes covered by composites on the discover/lounge/Kai tables.
+
+Revision ID: 055_drop_redundant_fk_idx
+Revises: 054_native_uuid_ids
+Create Date: 2026-02-03
+
+023/024/025/029/030 (and 053) no longer create these; this removes them from databases migrated
+before that change. Each column leads a composite index (or, for activity_want_to_try, has an
+identical one) that serves the same lookups and the foreign key checks, so the single-column
+index only adds a page write to every insert.
+"""
+from alembic import op
+
+revision = "055_drop_redundant_fk_idx"
+down_revision = "054_native_uuid_ids"
+branch_labels = None
+depends_on = None
+
+# (index, table, column, kept index covering it)
+_REDUNDANT_INDEXES = [
+    ("ix_discover_feed_items_relationship_id", "discover_feed_items", "relationship_id",
+     "ix_discover_feed_items_relationship_user"),
+    ("ix_discover_dismissals_user_id", "discover_dismissals", "user_id",
+     "ix_discover_dismissals_user_relationship"),
+    ("ix_activity_want_to_try_discover_feed_item_id", "activity_want_to_try", "discover_feed_item_id",
+     "ix_activity_want_to_try_feed_item"),
+    ("ix_activity_mutual_matches_user_a_id", "activity_mutual_matches", "user_a_id",
+     "ix_activity_mutual_matches_user_a"),
+    ("ix_activity_mutual_matches_user_b_id", "activity_mutual_matches", "user_b_id",
+     "ix_activity_mutual_matches_user_b"),
+    ("ix_unstructured_memories_owner_user_id", "unstructured_memories", "owner_user_id",
+     "ix_unstructured_memories_owner_created"),
+    ("ix_unstructured_memories_relationship_id", "unstructured_memories", "relationship_id",
+     "ix_unstructured_memories_relationship_created"),
+    ("ix_things_to_find_out_owner_user_id", "things_to_find_out", "owner_user_id",
+     "ix_things_to_find_out_owner_created"),
+    ("ix_things_to_find_out_relationship_id", "things_to_find_out", "relationship_id",
+     "ix_things_to_find_out_relationship_created"),
+]
+
+# Partitioned since 053: indexes on a partitioned table cannot be dropped or built concurrently
+_PARTITIONED_REDUNDANT_INDEXES = [
+    ("ix_lounge_messages_room_id", "lounge_messages", "room_id", "ix_lounge_messages_room_sequence"),
+    ("ix_lounge_events_room_id", "lounge_events", "room_id", "ix_lounge_events_room_sequence"),
+]
+
+
+def upgrade() -> None:
+    for name, _table, _column, _kept in _PARTITIONED_REDUNDANT_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    with op.get_context().autocommit_block():
+        for name, _table, _column, _kept in _REDUNDANT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column, _kept in _REDUNDANT_INDEXES:
+            op.create_index(name, table, [column], postgresql_concurrently=True, if_not_exists=True)
+    for name, table, column, _kept in _PARTITIONED_REDUNDANT_INDEXES:
+        op.create_index(name, table, [column], if_not_exists=True)
@@ -0,0 +1,105 @@
+"""Native enums for lounge_messages.visibility and activity_mutual_matches responses.
+
+Revision ID: 056_fixed_vocabulary_enums
+Revises: 055_drop_redundant_fk_idx
+Create Date: 2026-02-03
+
+These columns only ever hold values the API code writes itself (public | private_to_kai;
+pending | accept | decline). As enums they are stored as 4 bytes instead of a varlena string, and
+compare as integers in the (user, response) indexes and the public-timeline partial index.
+Values stay strings on the Python side. 024/025 still create varchar columns, which 053 copies
+when it rebuilds lounge_messages, so the conversion happens here for every database: each ALTER
+rewrites its table (all partitions for lounge_messages). Partial indexes on these columns are
+dropped and rebuilt, as their predicates would otherwise keep comparing them as text.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import column_type, index_exists
+
+revision = "056_fixed_vocabulary_enums"
+down_revision = "055_drop_redundant_fk_idx"
+branch_labels = None
+depends_on = None
+
+_TYPES = {
+    "lounge_message_visibility": "'public', 'private_to_kai'",
+    "mutual_match_response": "'pending', 'accept', 'decline'",
+}
+
+# table -> [(column, enum type, default)]
+_COLUMNS = {
+    "lounge_messages": [("visibility", "lounge_message_visibility", "public")],
+    "activity_mutual_matches": [
+        ("user_a_response", "mutual_match_response", "pending"),
+        ("user_b_response", "mutual_match_response", "pending"),
+    ],
+}
+
+# table -> [(index, definition)]: partial indexes whose predicate reads a converted column. Those on
+# lounge_messages are on a partitioned table, so neither drop nor rebuild can run concurrently;
+# the tables are rewritten under an ACCESS EXCLUSIVE lock anyway.
+_PARTIAL_INDEXES = {
+    "lounge_messages": [
+        ("ix_lounge_messages_room_public_sequence",
+         "ON lounge_messages (room_id, sequence DESC, created_at) WHERE visibility = 'public'"),
+    ],
+    "activity_mutual_matches": [
+        ("ix_activity_mutual_matches_user_a_pending",
+         "ON activity_mutual_matches (user_a_id) WHERE user_a_response = 'pending'"),
+        ("ix_activity_mutual_matches_user_b_pending",
+         "ON activity_mutual_matches (user_b_id) WHERE user_b_response = 'pending'"),
+    ],
+}
+
+
+def _convert(to_enum: bool) -> None:
+    conn = op.get_bind()
+    # Decided per table up front, so the type probes do not interleave with the DDL below
+    tables = [
+        table
+        for table, columns in _COLUMNS.items()
+        if (column_type(conn, table, columns[0][0]) == "character varying") == to_enum
+    ]
+    # Only the ones present are rebuilt (the mutual match ones arrive with 024 or 060)
+    partial_indexes = [
+        (name, definition)
+        for table in tables
+        for name, definition in _PARTIAL_INDEXES[table]
+        if index_exists(conn, name)
+    ]
+    if to_enum:
+        for name, values in _TYPES.items():
+            op.execute(f"""
+                DO $$
+                BEGIN
+                    IF to_regtype('{name}') IS NULL THEN
+                        CREATE TYPE {name} AS ENUM ({values});
+                    END IF;
+                END $$;
+            """)
+    for name, _definition in partial_indexes:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for table in tables:
+        changes = []
+        for column, enum_type, default in _COLUMNS[table]:
+            target = f"{enum_type} USING {column}::{enum_type}" if to_enum else "VARCHAR"
+            # The varchar default cannot be cast to the enum, so it is dropped and set again
+            changes += [
+                f"ALTER COLUMN {column} DROP DEFAULT",
+                f"ALTER COLUMN {column} TYPE {target}",
+                f"ALTER COLUMN {column} SET DEFAULT '{default}'",
+            ]
+        op.execute(f"ALTER TABLE {table} {', '.join(changes)}")
+    for name, definition in partial_indexes:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} {definition}")
+    if not to_enum:
+        for name in _TYPES:
+            op.execute(f"DROP TYPE IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    _convert(to_enum=True)
+
+
+def downgrade() -> None:
+    _convert(to_enum=False)
@@ -0,0 +1,47 @@
+"""Add BRIN indexes on created_at for lounge_messages, lounge_events and unstructured_memories.
+
+Revision ID: 057_created_at_brin
+Revises: 056_fixed_vocabulary_enums
+Create Date: 2026-02-03
+
+025/029 (and 053) now build these directly; this adds them to databases migrated before that
+change. Like compass_events (042), these tables are append-only, so heap order tracks created_at
+and a BRIN of a few KB prunes time-window scans that no existing index leads with. None of them
+had a created_at btree to replace. compass_events.processed_at gets none: it is set by later
+updates, not in heap order, so its block ranges would overlap and prune nothing.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "057_created_at_brin"
+down_revision = "056_fixed_vocabulary_enums"
+branch_labels = None
+depends_on = None
+
+_WITH = {"pages_per_range": 32}
+
+# Partitioned since 053: indexes on a partitioned table cannot be built or dropped concurrently
+_PARTITIONED_INDEXES = [
+    ("ix_lounge_messages_created_brin", "lounge_messages"),
+    ("ix_lounge_events_created_brin", "lounge_events"),
+]
+
+
+def upgrade() -> None:
+    for name, table in _PARTITIONED_INDEXES:
+        op.create_index(name, table, ["created_at"], postgresql_using="brin", postgresql_with=_WITH, if_not_exists=True)
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("unstructured_memories")
+        op.create_index(
+            "ix_unstructured_memories_created_brin", "unstructured_memories", ["created_at"],
+            postgresql_using="brin", postgresql_with=_WITH,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_unstructured_memories_created_brin")
+    for name, _table in _PARTITIONED_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,36 @@
+"""Generate discover feed, want-to-try, Kai preference and unstructured memory ids server-side.
+
+Revision ID: 059_server_side_uuid_ids
+Revises: 058_jsonb_lz4_compression
+Create Date: 2026-02-03
+
+023/024/027/029 now give these uuid ids (054) a gen_random_uuid() default; this sets it on
+databases migrated before that change. The repositories no longer pass an id, and the generated one
+comes back through INSERT ... RETURNING. gen_random_uuid() is built into PostgreSQL 13+, so no
+extension is needed. Catalog-only: setting a column default does not touch existing rows.
+"""
+from alembic import op
+
+revision = "059_server_side_uuid_ids"
+down_revision = "058_jsonb_lz4_compression"
+branch_labels = None
+depends_on = None
+
+_TABLES = [
+    "discover_feed_items",
+    "discover_dismissals",
+    "activity_want_to_try",
+    "activity_mutual_matches",
+    "kai_user_preferences",
+    "unstructured_memories",
+]
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
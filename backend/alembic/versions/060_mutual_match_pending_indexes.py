@@ -0,0 +1,55 @@
+"""Replace the (user, response) indexes on activity_mutual_matches with pending-only partial ones.
+
+Revision ID: 060_mutual_match_pending_idx
+Revises: 059_server_side_uuid_ids
+Create Date: 2026-02-03
+
+024 now creates these directly; this brings databases migrated before that change in line.
+Matches are only looked up by user while that user's response is pending, so a partial index per
+side holds just the unanswered rows instead of every match, and a response leaves it. The OR over
+both sides in ActivityWantToTryRepository.list_pending_mutual_matches_for_user stays a BitmapOr of
+the two. Built concurrently, as the table may hold rows; the new indexes go in before the old ones
+are dropped.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "060_mutual_match_pending_idx"
+down_revision = "059_server_side_uuid_ids"
+branch_labels = None
+depends_on = None
+
+_TABLE = "activity_mutual_matches"
+
+# side -> (replaced composite index, partial index)
+_SIDES = {
+    "a": ("ix_activity_mutual_matches_user_a", "ix_activity_mutual_matches_user_a_pending"),
+    "b": ("ix_activity_mutual_matches_user_b", "ix_activity_mutual_matches_user_b_pending"),
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(_TABLE)
+        for side, (_composite, partial) in _SIDES.items():
+            op.create_index(
+                partial, _TABLE, [f"user_{side}_id"],
+                postgresql_where=sa.text(f"user_{side}_response = 'pending'"),
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for composite, _partial in _SIDES.values():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {composite}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(_TABLE)
+        for side, (composite, _partial) in _SIDES.items():
+            op.create_index(
+                composite, _TABLE, [f"user_{side}_id", f"user_{side}_response"],
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for _composite, partial in _SIDES.values():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {partial}")
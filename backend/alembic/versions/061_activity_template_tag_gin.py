@@ -0,0 +1,36 @@
+"""GIN-index activity_templates.relationship_types and vibe_tags for the recommendation tag filters.
+
+Revision ID: 061_activity_template_tag_gin
+Revises: 060_mutual_match_pending_idx
+Create Date: 2026-02-03
+
+014b now builds these with the other compass indexes; this adds them on databases migrated before
+that change. ActivityTemplateRepository filters with ?| (has_any) on both JSONB arrays, which the
+default jsonb_ops GIN supports. Built concurrently, as the table may hold rows.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "061_activity_template_tag_gin"
+down_revision = "060_mutual_match_pending_idx"
+branch_labels = None
+depends_on = None
+
+_TABLE = "activity_templates"
+_COLUMNS = ["relationship_types", "vibe_tags"]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(_TABLE)
+        for column in _COLUMNS:
+            op.create_index(
+                f"ix_{_TABLE}_{column}", _TABLE, [column],
+                postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    # The indexes belong to 014b, whose downgrade drops them; dropping them here would break that.
+    pass
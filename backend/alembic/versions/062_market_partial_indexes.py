@@ -0,0 +1,56 @@
+"""Replace the market_items.is_active and transactions.status indexes with partial ones.
+
+Revision ID: 062_market_partial_indexes
+Revises: 061_activity_template_tag_gin
+Create Date: 2026-02-03
+
+Listings are read per issuer and almost always filtered to active items, so a partial index on
+issuer_id skips inactive rows instead of indexing a boolean. Only open transactions are looked up
+by status, so the status index shrinks to those rows, keyed like the per-wallet listing. Built
+concurrently, as the tables may hold rows; the new indexes go in before the old ones are dropped.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "062_market_partial_indexes"
+down_revision = "061_activity_template_tag_gin"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("market_items")
+        op.create_index(
+            "ix_market_items_active", "market_items", ["issuer_id"],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_market_items_is_active")
+
+        drop_invalid_indexes("transactions")
+        op.create_index(
+            "ix_transactions_status_pending", "transactions", ["wallet_id", "created_at"],
+            postgresql_where=sa.text("status IN ('PENDING_APPROVAL', 'PURCHASED')"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_status")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes("transactions")
+        op.create_index(
+            "ix_transactions_status", "transactions", ["status"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_status_pending")
+
+        drop_invalid_indexes("market_items")
+        op.create_index(
+            "ix_market_items_is_active", "market_items", ["is_active"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_market_items_active")
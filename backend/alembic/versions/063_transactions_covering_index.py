@@ -0,0 +1,50 @@
+"""Replace the per-column transactions indexes with one covering (wallet_id, created_at DESC) index.
+
+Revision ID: 063_transactions_covering_idx
+Revises: 062_market_partial_indexes
+Create Date: 2026-02-03
+
+Every transactions read in the market repository is "transactions for a wallet, newest first",
+by wallet directly or through the join from wallets by holder or issuer. One covering index serves
+all of them as index-only scans and is the only full index maintained on insert, in place of
+ix_transactions_wallet_id, ix_transactions_market_item_id and ix_transactions_created_at. Market
+items are only soft-deleted, so the ON DELETE SET NULL scan that market_item_id's own index served
+is reached only when a user is deleted. Built concurrently, as the table may hold rows; the new
+index goes in before the old ones are dropped.
+"""
+from alembic import op
+
+from app.infra.db.migration_helpers import drop_invalid_indexes
+
+revision = "063_transactions_covering_idx"
+down_revision = "062_market_partial_indexes"
+branch_labels = None
+depends_on = None
+
+_TABLE = "transactions"
+
+# replaced index -> its column
+_REPLACED = {
+    "ix_transactions_wallet_id": "wallet_id",
+    "ix_transactions_market_item_id": "market_item_id",
+    "ix_transactions_created_at": "created_at",
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(_TABLE)
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_wallet_created "
+            "ON transactions (wallet_id, created_at DESC) INCLUDE (status, amount, market_item_id)"
+        )
+        for name in _REPLACED:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(_TABLE)
+        for name, column in _REPLACED.items():
+            op.create_index(name, _TABLE, [column], postgresql_concurrently=True, if_not_exists=True)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_wallet_created")
@@ -0,0 +1,35 @@
+"""Drop love-map indexes that duplicate the leading column of a unique constraint.
+
+Revision ID: 064_love_map_redundant_idx
+Revises: 063_transactions_covering_idx
+Create Date: 2026-02-03
+
+ix_user_specs_user_id and ix_relationship_map_progress_observer_id index the leading column of
+the (user_id, prompt_id) and (observer_id, subject_id) unique constraints, whose indexes already
+serve those lookups; dropping them saves their upkeep on every write. Dropped concurrently, so
+reads and writes are not blocked.
+"""
+from alembic import op
+
+revision = "064_love_map_redundant_idx"
+down_revision = "063_transactions_covering_idx"
+branch_labels = None
+depends_on = None
+
+# index -> (table, column)
+_INDEXES = {
+    "ix_user_specs_user_id": ("user_specs", "user_id"),
+    "ix_relationship_map_progress_observer_id": ("relationship_map_progress", "observer_id"),
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in _INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, (table, column) in _INDEXES.items():
+            op.create_index(name, table, [column], postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,32 @@
+"""Store voice_profiles voice sample and embedding columns uncompressed (STORAGE EXTERNAL).
+
+Revision ID: 065_voice_storage_external
+Revises: 064_love_map_redundant_idx
+Create Date: 2026-02-03
+
+Base64 audio barely compresses, so pglz only wastes time on write; embeddings are read on every
+STT session start, so skipping TOAST decompression pays off there. EXTERNAL keeps large values out
+of line without compression. Catalog-only: existing values keep their current form until rewritten.
+"""
+from alembic import op
+
+revision = "065_voice_storage_external"
+down_revision = "064_love_map_redundant_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE voice_profiles "
+        "ALTER COLUMN voice_sample_base64 SET STORAGE EXTERNAL, "
+        "ALTER COLUMN voice_embedding_json SET STORAGE EXTERNAL"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE voice_profiles "
+        "ALTER COLUMN voice_embedding_json SET STORAGE EXTENDED, "
+        "ALTER COLUMN voice_sample_base64 SET STORAGE EXTENDED"
+    )
@@ -0,0 +1,31 @@
+"""Default session_reports.moments and action_items to empty lists.
+
+Revision ID: 066_session_reports_defaults
+Revises: 065_voice_storage_external
+Create Date: 2026-02-03
+
+003 backfills NULL moments/action_items with '[]'; a server default keeps rows inserted outside the
+ORM (which already defaults both to []) from needing that backfill again. Catalog-only.
+"""
+from alembic import op
+
+revision = "066_session_reports_defaults"
+down_revision = "065_voice_storage_external"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE session_reports "
+        "ALTER COLUMN moments SET DEFAULT '[]'::json, "
+        "ALTER COLUMN action_items SET DEFAULT '[]'::json"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE session_reports "
+        "ALTER COLUMN action_items DROP DEFAULT, "
+        "ALTER COLUMN moments DROP DEFAULT"
+    )
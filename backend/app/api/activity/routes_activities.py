@@ -1,24 +1,29 @@
 """Activity API: invite, respond, planned, complete, log-interaction, memory-upload, scrapbook."""
+import asyncio
 from datetime import datetime
+import heapq
+import itertools
 import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
+from pydantic import BaseModel, TypeAdapter, model_validator
+from typing import Iterable, Optional, List, Set
 
 from app.api.deps import get_current_user, get_db, get_llm_service
 from app.domain.admin.models import User
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.infra.db.models.compass import ActivityInviteModel
 from app.infra.db.models.relationship import relationship_members
 from app.infra.db.repositories.event_repo import EventRepository
 from app.infra.db.repositories.activity_invite_repo import ActivityInviteRepository
 from app.infra.db.repositories.planned_activity_repo import PlannedActivityRepository
 from app.infra.db.repositories.activity_template_repo import ActivityTemplateRepository
 from app.infra.db.repositories.dyad_activity_repo import DyadActivityHistoryRepository
-from app.services.notification_service import deliver_notification
+from app.infra.db.repositories.relationship_repo import RelationshipRepositoryImpl
+from app.services.notification_service import deliver_notification, deliver_notifications
 from app.domain.activity.services import (
     generate_scrapbook_layout as generate_scrapbook_layout_service,
     generate_scrapbook_options as generate_scrapbook_options_service,
@@ -31,14 +36,48 @@ from app.services.llm_service import LLMService
 router = APIRouter()
 
 
-async def _ensure_member(db: AsyncSession, relationship_id: str, user_id: str) -> None:
-    result = await db.execute(
+def _iso_z(dt: Optional[datetime], default: Optional[str] = None) -> Optional[str]:
+    """ISO 8601 with a Z suffix for the app's naive UTC datetimes; default when dt is None."""
+    return f"{dt.isoformat()}Z" if dt else default
+
+
+def _json_list(adapter: TypeAdapter, items: Iterable) -> Response:
+    """Serialize response models as a JSON array in one pydantic-core (Rust) pass.
+
+    Returning a Response skips FastAPI's response_model round trip (dump, re-validate, jsonable
+    encoding, json.dumps), which dominates on long history/memory lists; response_model still
+    documents the shape. adapter is a TypeAdapter(Iterable[Model]) and items may be a generator:
+    each model is then built, serialized and dropped in turn, so no list of models is held next to
+    the encoded body.
+    """
+    return Response(adapter.dump_json(items), media_type="application/json")
+
+
+def _outcome_tags_list(ot) -> Optional[List[str]]:
+    """outcome_tags is stored as a list or a dict (e.g. {"feeling": "loved"}); responses expect a list.
+
+    JSONB comes back as exact dict/list, so a type() check is enough (and cheaper than isinstance).
+    """
+    t = type(ot)
+    if t is list:
+        return [str(x) for x in ot]
+    if t is dict and ot:
+        return [f"{k}:{v}" for k, v in ot.items() if v is not None]
+    return None
+
+
+async def _member_ids(db: AsyncSession, relationship_id: str) -> Set[str]:
+    result = await db.scalars(
         select(relationship_members.c.user_id).where(
             relationship_members.c.relationship_id == relationship_id,
         )
     )
-    member_ids = [row[0] for row in result.all()]
-    if user_id not in member_ids:
+    return {str(uid) for uid in result}
+
+
+async def _ensure_member(db: AsyncSession, relationship_id: str, user_id: str) -> None:
+    """Raise 403 unless user_id is a member (RelationshipRepositoryImpl.is_member caches members briefly)."""
+    if not await RelationshipRepositoryImpl(db).is_member(relationship_id, user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a member of this relationship",
@@ -89,13 +128,10 @@ async def send_invite(
     db: AsyncSession = Depends(get_db),
 ):
     """Create an activity invite and notify the invitee."""
-    await _ensure_member(db, request.relationship_id, current_user.id)
-    member_result = await db.execute(
-        select(relationship_members.c.user_id).where(
-            relationship_members.c.relationship_id == request.relationship_id,
-        )
-    )
-    member_ids = [row[0] for row in member_result.all()]
+    # Both the sender and the invitee must be members: one fetch of the member set covers both
+    member_ids = await _member_ids(db, request.relationship_id)
+    if current_user.id not in member_ids:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this relationship")
     if request.invitee_user_id not in member_ids:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invitee is not in this relationship")
     if request.invitee_user_id == current_user.id:
@@ -161,7 +197,7 @@ async def respond_to_invite(
 ):
     """Accept or decline an activity invite. Only the invitee can respond."""
     invite_repo = ActivityInviteRepository(db)
-    invite = await invite_repo.get_by_id(invite_id)
+    invite = await invite_repo.get_by_id(invite_id, with_template=True)
     if not invite:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invite not found")
     if invite.to_user_id != current_user.id:
@@ -173,9 +209,7 @@ async def respond_to_invite(
     now = datetime.utcnow()
     await invite_repo.update_status(invite_id, status_value, responded_at=now)
 
-    template_repo = ActivityTemplateRepository(db)
-    template = await template_repo.get(invite.activity_template_id)
-    activity_title = template.title if template else "Activity"
+    activity_title = invite.template.title if invite.template else "Activity"
 
     event_repo = EventRepository(db)
     await event_repo.append(
@@ -247,6 +281,25 @@ class HistoryItemResponse(BaseModel):
     memory_urls: Optional[List[str]]
 
 
+_HISTORY_ITEMS = TypeAdapter(Iterable[HistoryItemResponse])
+
+
+def _history_item(r, templates: dict) -> HistoryItemResponse:
+    template = templates.get(r.activity_template_id)
+    return HistoryItemResponse(
+        id=r.id,
+        relationship_id=r.relationship_id,
+        activity_template_id=r.activity_template_id,
+        activity_title=template.title if template else r.activity_template_id,
+        started_at=_iso_z(r.started_at, ""),
+        completed_at=_iso_z(r.completed_at),
+        notes_text=r.notes_text,
+        rating=r.rating,
+        outcome_tags=_outcome_tags_list(r.outcome_tags),
+        memory_urls=r.memory_urls,
+    )
+
+
 @router.get("/history", response_model=List[HistoryItemResponse])
 async def list_activity_history(
     relationship_id: str = Query(..., description="Relationship ID"),
@@ -259,33 +312,8 @@ async def list_activity_history(
     dyad_repo = DyadActivityHistoryRepository(db)
     template_repo = ActivityTemplateRepository(db)
     records = await dyad_repo.list_by_relationship(relationship_id, limit=limit)
-    out = []
-    for r in records:
-        template = await template_repo.get(r.activity_template_id)
-        title = template.title if template else r.activity_template_id
-        # outcome_tags may be stored as list or dict (e.g. {"feeling": "loved"}); response expects list
-        ot = r.outcome_tags
-        if isinstance(ot, dict) and ot:
-            outcome_tags_list = [f"{k}:{v}" for k, v in ot.items() if v is not None]
-        elif isinstance(ot, list):
-            outcome_tags_list = [str(x) for x in ot]
-        else:
-            outcome_tags_list = None
-        out.append(
-            HistoryItemResponse(
-                id=r.id,
-                relationship_id=r.relationship_id,
-                activity_template_id=r.activity_template_id,
-                activity_title=title,
-                started_at=r.started_at.isoformat() + "Z" if r.started_at else "",
-                completed_at=r.completed_at.isoformat() + "Z" if r.completed_at else None,
-                notes_text=r.notes_text,
-                rating=r.rating,
-                outcome_tags=outcome_tags_list,
-                memory_urls=r.memory_urls,
-            )
-        )
-    return out
+    templates = await template_repo.get_many(r.activity_template_id for r in records)
+    return _json_list(_HISTORY_ITEMS, (_history_item(r, templates) for r in records))
 
 
 class HistoryAllItemResponse(BaseModel):
@@ -301,6 +329,38 @@ class HistoryAllItemResponse(BaseModel):
     invite_id: Optional[str] = None
 
 
+_HISTORY_ALL_ITEMS = TypeAdapter(Iterable[HistoryAllItemResponse])
+
+
+def _history_all_item(date, row, templates: dict) -> HistoryAllItemResponse:
+    """A /history/all item for a completed dyad history record or a declined invite."""
+    template = templates.get(row.activity_template_id)
+    title = template.title if template else row.activity_template_id
+    if isinstance(row, ActivityInviteModel):
+        return HistoryAllItemResponse(
+            item_type="declined",
+            id=row.id,
+            relationship_id=row.relationship_id,
+            activity_template_id=row.activity_template_id,
+            activity_title=title,
+            date=_iso_z(date, ""),
+            notes_text=None,
+            memory_urls=None,
+            invite_id=row.id,
+        )
+    return HistoryAllItemResponse(
+        item_type="completed",
+        id=row.id,
+        relationship_id=row.relationship_id,
+        activity_template_id=row.activity_template_id,
+        activity_title=title,
+        date=_iso_z(date, ""),
+        notes_text=row.notes_text,
+        memory_urls=row.memory_urls,
+        invite_id=None,
+    )
+
+
 @router.get("/history/all", response_model=List[HistoryAllItemResponse])
 async def list_activity_history_all(
     relationship_id: Optional[str] = Query(None),
@@ -312,58 +372,29 @@ async def list_activity_history_all(
     dyad_repo = DyadActivityHistoryRepository(db)
     invite_repo = ActivityInviteRepository(db)
     template_repo = ActivityTemplateRepository(db)
-    out: List[HistoryAllItemResponse] = []
     # Completed: from dyad_activity_history for relationships the user is in
+    records = []
     if relationship_id:
         await _ensure_member(db, relationship_id, current_user.id)
-        records = await dyad_repo.list_by_relationship(relationship_id, limit=limit * 2)
-        for r in records:
-            if r.actor_user_id != current_user.id:
-                continue
-            template = await template_repo.get(r.activity_template_id)
-            title = template.title if template else r.activity_template_id
-            date_str = r.completed_at.isoformat() + "Z" if r.completed_at else (r.started_at.isoformat() + "Z" if r.started_at else "")
-            out.append(
-                HistoryAllItemResponse(
-                    item_type="completed",
-                    id=r.id,
-                    relationship_id=r.relationship_id,
-                    activity_template_id=r.activity_template_id,
-                    activity_title=title,
-                    date=date_str,
-                    notes_text=r.notes_text,
-                    memory_urls=r.memory_urls,
-                    invite_id=None,
-                )
-            )
-    else:
-        # No relationship filter: get all dyad history where user is actor (we'd need list_by_user on dyad_repo)
-        # For simplicity, require relationship_id for /history/all
-        pass
+        records = await dyad_repo.list_by_relationship_and_actor(relationship_id, current_user.id, limit=limit)
+    # else: no relationship filter would need all dyad history where user is actor (list_by_user on
+    # dyad_repo); for simplicity, require relationship_id for completed items
     # Declined: invites to current user that were declined
-    declined = await invite_repo.get_declined_for_user(current_user.id, limit=limit)
-    for inv in declined:
-        if relationship_id and inv.relationship_id != relationship_id:
-            continue
-        template = await template_repo.get(inv.activity_template_id)
-        title = template.title if template else inv.activity_template_id
-        date_str = inv.responded_at.isoformat() + "Z" if inv.responded_at else (inv.created_at.isoformat() + "Z" if inv.created_at else "")
-        out.append(
-            HistoryAllItemResponse(
-                item_type="declined",
-                id=inv.id,
-                relationship_id=inv.relationship_id,
-                activity_template_id=inv.activity_template_id,
-                activity_title=title,
-                date=date_str,
-                notes_text=None,
-                memory_urls=None,
-                invite_id=inv.id,
-            )
-        )
-    # Sort by date descending
-    out.sort(key=lambda x: x.date, reverse=True)
-    return out[:limit]
+    declined = await invite_repo.get_declined_for_user(current_user.id, limit=limit, relationship_id=relationship_id)
+    templates = await template_repo.get_many(
+        [r.activity_template_id for r in records] + [inv.activity_template_id for inv in declined]
+    )
+    # Both lists come back newest first, so (date, row) pairs merge without a sort; items are only
+    # built for the rows that make the cut
+    merged = heapq.merge(
+        ((r.completed_at or r.started_at, r) for r in records),
+        ((inv.responded_at or inv.created_at, inv) for inv in declined),
+        key=lambda pair: pair[0],
+        reverse=True,
+    )
+    return _json_list(_HISTORY_ALL_ITEMS, (
+        _history_all_item(date, row, templates) for date, row in itertools.islice(merged, limit)
+    ))
 
 
 class MemoryContributionResponse(BaseModel):
@@ -384,6 +415,24 @@ class MemoryItemResponse(BaseModel):
     scrapbook_layout: Optional[dict] = None  # AI-generated layout when saved
 
 
+_MEMORY_ITEMS = TypeAdapter(Iterable[MemoryItemResponse])
+
+
+def _memory_item(row, relationship_id: str) -> MemoryItemResponse:
+    """A /memories item from a DyadActivityHistoryRepository.list_grouped_memories row."""
+    # A planned activity's layout wins; standalone memories keep theirs on the record
+    scrapbook_layout = (row.planned_scrapbook_layout if row.has_planned else row.scrapbook_layout) or None
+    return MemoryItemResponse(
+        id=row.key,
+        relationship_id=relationship_id,
+        activity_template_id=row.activity_template_id,
+        activity_title=row.activity_title,
+        completed_at=_iso_z(row.completed_at, ""),
+        contributions=[MemoryContributionResponse(**c) for c in row.contributions],
+        scrapbook_layout=scrapbook_layout,
+    )
+
+
 @router.get("/memories", response_model=List[MemoryItemResponse])
 async def list_memories(
     relationship_id: str = Query(..., description="Relationship ID"),
@@ -395,59 +444,10 @@ async def list_memories(
     By default, each memory/scrapbook entry is visible to all participants in the relationship; only relationship members can call this endpoint."""
     await _ensure_member(db, relationship_id, current_user.id)
     dyad_repo = DyadActivityHistoryRepository(db)
-    template_repo = ActivityTemplateRepository(db)
-    planned_repo = PlannedActivityRepository(db)
-    from app.infra.db.repositories.user_repo import UserRepositoryImpl
-    user_repo = UserRepositoryImpl(db)
-    records = await dyad_repo.list_by_relationship(relationship_id, limit=limit * 5)
-    # Group by planned_id (or by record id when planned_id is null)
-    groups: dict = {}
-    for r in records:
-        key = r.planned_id if r.planned_id else r.id
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(r)
-    out = []
-    for key, rows in groups.items():
-        r0 = rows[0]
-        template = await template_repo.get(r0.activity_template_id)
-        title = template.title if template else r0.activity_template_id
-        completed_at = r0.completed_at.isoformat() + "Z" if r0.completed_at else (r0.started_at.isoformat() + "Z" if r0.started_at else "")
-        contributions = []
-        for r in rows:
-            actor = await user_repo.get_by_id(r.actor_user_id)
-            actor_name = (actor.display_name or (actor.email.split("@")[0] if actor and actor.email else "Someone")) if actor else "Someone"
-            feeling = None
-            if isinstance(r.outcome_tags, dict) and r.outcome_tags:
-                feeling = r.outcome_tags.get("feeling")
-            contributions.append(
-                MemoryContributionResponse(
-                    actor_user_id=r.actor_user_id,
-                    actor_name=actor_name,
-                    notes_text=r.notes_text,
-                    memory_entries=r.memory_entries,
-                    feeling=feeling,
-                )
-            )
-        scrapbook_layout = None
-        planned = await planned_repo.get_by_id(key)
-        if planned and getattr(planned, "scrapbook_layout", None):
-            scrapbook_layout = planned.scrapbook_layout
-        elif not planned and getattr(r0, "scrapbook_layout", None):
-            scrapbook_layout = r0.scrapbook_layout
-        out.append(
-            MemoryItemResponse(
-                id=key,
-                relationship_id=r0.relationship_id,
-                activity_template_id=r0.activity_template_id,
-                activity_title=title,
-                completed_at=completed_at,
-                contributions=contributions,
-                scrapbook_layout=scrapbook_layout,
-            )
-        )
-    out.sort(key=lambda x: x.completed_at, reverse=True)
-    return out[:limit]
+    # One query: groups by planned_id (or record id when planned_id is null), newest first, with
+    # titles, contributor names and planned scrapbook layouts joined in
+    rows = await dyad_repo.list_grouped_memories(relationship_id, limit=limit)
+    return _json_list(_MEMORY_ITEMS, (_memory_item(row, relationship_id) for row in rows))
 
 
 @router.get("/planned", response_model=List[PlannedItemResponse])
@@ -460,9 +460,10 @@ async def list_planned(
     planned_repo = PlannedActivityRepository(db)
     template_repo = ActivityTemplateRepository(db)
     items = await planned_repo.list_by_user(current_user.id, relationship_id=relationship_id)
+    templates = await template_repo.get_many(p.activity_template_id for p in items)
     out = []
     for p in items:
-        template = await template_repo.get(p.activity_template_id)
+        template = templates.get(p.activity_template_id)
         title = template.title if template else p.activity_template_id
         card_snapshot = getattr(p, "card_snapshot", None)
         out.append(
@@ -474,8 +475,8 @@ async def list_planned(
                 initiator_user_id=p.initiator_user_id,
                 invitee_user_id=p.invitee_user_id,
                 status=p.status,
-                agreed_at=p.agreed_at.isoformat() + "Z" if p.agreed_at else "",
-                completed_at=p.completed_at.isoformat() + "Z" if p.completed_at else None,
+                agreed_at=_iso_z(p.agreed_at, ""),
+                completed_at=_iso_z(p.completed_at),
                 notes_text=p.notes_text,
                 memory_urls=p.memory_urls,
                 activity_card=card_snapshot,
@@ -489,28 +490,30 @@ class MemoryEntryItem(BaseModel):
     caption: Optional[str] = None
 
 
-class CompleteRequest(BaseModel):
-    notes: Optional[str] = None
+class _MemoryEntriesRequest(BaseModel):
     memory_urls: Optional[List[str]] = None
     memory_entries: Optional[List[MemoryEntryItem]] = None
+
+    @model_validator(mode="after")
+    def _fill_memory_urls(self):
+        """memory_urls defaults to the entries' urls, so handlers never derive it themselves."""
+        if self.memory_entries and not self.memory_urls:
+            self.memory_urls = [e.url for e in self.memory_entries]
+        return self
+
+
+class CompleteRequest(_MemoryEntriesRequest):
+    notes: Optional[str] = None
     feeling: Optional[str] = None
 
 
-class LogMemoryRequest(BaseModel):
+class LogMemoryRequest(_MemoryEntriesRequest):
     relationship_id: str
     activity_title: str
     notes: Optional[str] = None
-    memory_urls: Optional[List[str]] = None
-    memory_entries: Optional[List[MemoryEntryItem]] = None
     feeling: Optional[str] = None
 
 
-def _urls_from_memory_entries(entries: Optional[List[MemoryEntryItem]]) -> Optional[List[str]]:
-    if not entries:
-        return None
-    return [e.url for e in entries]
-
-
 class ScrapbookGenerateRequest(BaseModel):
     activity_title: str
     note: str
@@ -526,9 +529,11 @@ class ScrapbookGenerateRequest(BaseModel):
 async def scrapbook_generate(
     request: ScrapbookGenerateRequest,
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
     llm_service: LLMService = Depends(get_llm_service),
 ):
     """Generate a scrapbook layout (themeColor, headline, narrative, stickers, imageCaptions) via LLM service."""
+    await db.close()  # release get_current_user's connection before the LLM call
     layout = await generate_scrapbook_layout_service(
         gemini_api_key=settings.gemini_api_key,
         activity_title=request.activity_title,
@@ -544,9 +549,11 @@ async def scrapbook_generate(
 async def scrapbook_generate_options(
     request: ScrapbookGenerateRequest,
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
     llm_service: LLMService = Depends(get_llm_service),
 ):
     """Generate 1 or 3 scrapbook layout options (element-based) via LLM service. limit=1 for Palette (single style + Cancel)."""
+    await db.close()  # release get_current_user's connection before the LLM call
     limit = max(1, min(3, request.limit or 3))
     options = await generate_scrapbook_options_service(
         activity_title=request.activity_title,
@@ -559,6 +566,23 @@ async def scrapbook_generate_options(
     return {"options": options}
 
 
+async def _load_template_fields(db: AsyncSession, activity_template_id: Optional[str]) -> dict:
+    """Template fields the HTML scrapbook prompt uses (description, vibe_tags, duration_min,
+    recommended_location) as a plain dict, so nothing needs the session once it is closed."""
+    if not activity_template_id:
+        return {}
+    template = await ActivityTemplateRepository(db).get(activity_template_id)
+    if not template:
+        return {}
+    enriched = _enrich_invite_with_template(template, None, template.title)
+    return {
+        "description": enriched.get("description") or None,
+        "vibe_tags": enriched.get("vibe_tags") or None,
+        "duration_min": enriched.get("duration_min"),
+        "recommended_location": enriched.get("recommended_location"),
+    }
+
+
 @router.post("/scrapbook/generate-html")
 async def scrapbook_generate_html(
     request: ScrapbookGenerateRequest,
@@ -567,19 +591,11 @@ async def scrapbook_generate_html(
     llm_service: LLMService = Depends(get_llm_service),
 ):
     """Generate a single scrapbook layout as raw HTML via LLM service (Palette / inside-app parity). Uses activity template when provided for description, vibe_tags, duration, location."""
-    description = None
-    vibe_tags = None
-    duration_min = None
-    recommended_location = None
-    if request.activity_template_id:
-        template_repo = ActivityTemplateRepository(db)
-        template = await template_repo.get(request.activity_template_id)
-        if template:
-            enriched = _enrich_invite_with_template(template, None, template.title)
-            description = enriched.get("description") or None
-            vibe_tags = enriched.get("vibe_tags") or None
-            duration_min = enriched.get("duration_min")
-            recommended_location = enriched.get("recommended_location")
+    template_fields = await _load_template_fields(db, request.activity_template_id)
+    # db is the session get_current_user read from too: close it so no pooled connection is held
+    # through the multi-second LLM call.
+    await db.close()
+
     def layout_generator(prompt: str, model: Optional[str] = None) -> Optional[str]:
         return llm_service.generate_text(prompt, model=model)
 
@@ -588,10 +604,7 @@ async def scrapbook_generate_html(
         note=request.note,
         feeling=request.feeling,
         image_count=max(0, request.image_count),
-        description=description,
-        vibe_tags=vibe_tags,
-        duration_min=duration_min,
-        recommended_location=recommended_location,
+        **template_fields,
         include_debug=bool(request.include_debug),
         disable_sticker_generation=bool(request.disable_sticker_generation),
         sticker_generator=make_sticker_generator(llm_service.generate_image),
@@ -608,11 +621,13 @@ class ScrapbookGenerateStickerRequest(BaseModel):
 async def scrapbook_generate_sticker(
     request: ScrapbookGenerateStickerRequest,
     current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
     llm_service: LLMService = Depends(get_llm_service),
 ):
     """Generate a single scrapbook sticker image (OpenAI or Gemini per LLM service). Returns base64 for inlining."""
+    await db.close()  # release get_current_user's connection before the LLM call
     sticker_gen = make_sticker_generator(llm_service.generate_image)
-    b64 = sticker_gen(request.prompt.strip(), (100, 100))
+    b64 = await asyncio.to_thread(sticker_gen, request.prompt.strip(), (100, 100))
     if b64 is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -657,29 +672,20 @@ async def save_scrapbook(
     current_id = str(current_user.id)
     if current_id not in participant_ids:
         # Fallback: allow if user is a member of the planned activity's relationship (handles id format mismatch)
-        result = await db.execute(
-            select(relationship_members.c.user_id).where(
-                relationship_members.c.relationship_id == planned.relationship_id,
-            )
-        )
-        member_ids = {str(row[0]) for row in result.all()}
-        if current_id not in member_ids:
+        if current_id not in await _member_ids(db, planned.relationship_id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a participant")
     await planned_repo.update_scrapbook_layout(planned_id, request.layout)
     title = "Scrapbook saved"
     message = "Your shared memory has a new scrapbook layout."
     # Notify only other participants; do not notify the user who performed the save
-    for user_id in (planned.initiator_user_id, planned.invitee_user_id):
-        if str(user_id) == current_id:
-            continue
-        await deliver_notification(
-            db,
-            user_id,
-            "scrapbook",
-            title,
-            message,
-            extra_payload={"planned_id": planned_id},
-        )
+    await deliver_notifications(
+        db,
+        [u for u in (planned.initiator_user_id, planned.invitee_user_id) if str(u) != current_id],
+        "scrapbook",
+        title,
+        message,
+        extra_payload={"planned_id": planned_id},
+    )
     return {"ok": True}
 
 
@@ -704,8 +710,6 @@ async def complete_planned(
     memory_entries_raw = None
     if request.memory_entries:
         memory_entries_raw = [{"url": e.url, "caption": e.caption} for e in request.memory_entries]
-        if not memory_urls:
-            memory_urls = _urls_from_memory_entries(request.memory_entries)
 
     if planned.status == "planned":
         await planned_repo.update_completion(
@@ -774,8 +778,6 @@ async def log_memory(
     memory_entries_raw = None
     if request.memory_entries:
         memory_entries_raw = [{"url": e.url, "caption": e.caption} for e in request.memory_entries]
-        if not memory_urls:
-            memory_urls = _urls_from_memory_entries(request.memory_entries)
 
     now = datetime.utcnow()
     dyad_repo = DyadActivityHistoryRepository(db)
@@ -851,7 +853,7 @@ async def list_pending_invites(
             "activity_title": title,
             "from_user_id": inv.from_user_id,
             "from_user_name": from_name,
-            "created_at": inv.created_at.isoformat() + "Z" if inv.created_at else None,
+            "created_at": _iso_z(inv.created_at),
             **extra,
         })
     return out
@@ -883,7 +885,7 @@ async def list_sent_invites(
             "activity_title": title,
             "to_user_id": inv.to_user_id,
             "to_user_name": to_name,
-            "created_at": inv.created_at.isoformat() + "Z" if inv.created_at else None,
+            "created_at": _iso_z(inv.created_at),
             **extra,
         })
     return out
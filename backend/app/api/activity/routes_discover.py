@@ -1,5 +1,6 @@
 """Discover feed API: feed list and dismiss."""
 import logging
+from uuid import UUID
 from typing import Optional, List, Any
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
@@ -8,10 +9,9 @@ from pydantic import BaseModel
 from app.api.deps import get_current_user, get_db
 from app.domain.admin.models import User
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.infra.db.models.relationship import relationship_members
 from app.infra.db.repositories.discover_feed_repo import DiscoverFeedRepository
+from app.infra.db.repositories.relationship_repo import RelationshipRepositoryImpl
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +19,7 @@ router = APIRouter()
 
 
 async def _ensure_member(db: AsyncSession, relationship_id: str, user_id: str) -> None:
-    result = await db.execute(
-        select(relationship_members.c.user_id).where(
-            relationship_members.c.relationship_id == relationship_id,
-        )
-    )
-    member_ids = [row[0] for row in result.all()]
-    if user_id not in member_ids:
+    if not await RelationshipRepositoryImpl(db).is_member(relationship_id, user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a member of this relationship",
@@ -81,7 +75,7 @@ async def get_discover_feed(
 
 class DismissRequest(BaseModel):
     relationship_id: str
-    discover_feed_item_id: str
+    discover_feed_item_id: UUID
 
 
 @router.post("/dismiss")
@@ -96,6 +90,6 @@ async def dismiss_discover_item(
     await repo.dismiss(
         user_id=current_user.id,
         relationship_id=request.relationship_id,
-        discover_feed_item_id=request.discover_feed_item_id,
+        discover_feed_item_id=str(request.discover_feed_item_id),
     )
     return {"ok": True}
@@ -105,7 +105,7 @@ async def get_recommendations(
             relationship_members.c.relationship_id == relationship_id,
         )
     )
-    member_ids = [row[0] for row in result.all()]
+    member_ids = result.scalars().all()
     if current_user.id not in member_ids:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -428,18 +428,11 @@ async def submit_feedback(
     db: AsyncSession = Depends(get_db),
 ):
     """Submit activity feedback (rating + tags) for the recommendation engine. Writes to dyad_activity_history and emits activity_completed event."""
-    from app.infra.db.models.relationship import relationship_members
-    from sqlalchemy import select
+    from app.infra.db.repositories.relationship_repo import RelationshipRepositoryImpl
     from app.infra.db.repositories.event_repo import EventRepository
     from app.infra.db.repositories.dyad_activity_repo import DyadActivityHistoryRepository
 
-    result = await db.execute(
-        select(relationship_members.c.user_id).where(
-            relationship_members.c.relationship_id == request.relationship_id,
-        )
-    )
-    member_ids = [row[0] for row in result.all()]
-    if current_user.id not in member_ids:
+    if not await RelationshipRepositoryImpl(db).is_member(request.relationship_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a member of this relationship",
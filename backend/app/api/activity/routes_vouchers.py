@@ -41,7 +41,7 @@ async def get_vouchers(
             relationship_members.c.relationship_id == relationship_id,
         )
     )
-    member_ids = [row[0] for row in result.all()]
+    member_ids = result.scalars().all()
     if current_user.id not in member_ids:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1,5 +1,6 @@
 """Want-to-try and mutual match API."""
 import logging
+from uuid import UUID
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
@@ -8,10 +9,9 @@ from pydantic import BaseModel
 from app.api.deps import get_current_user, get_db
 from app.domain.admin.models import User
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.infra.db.models.relationship import relationship_members
 from app.infra.db.repositories.discover_feed_repo import DiscoverFeedRepository
+from app.infra.db.repositories.relationship_repo import RelationshipRepositoryImpl
 from app.infra.db.repositories.activity_want_to_try_repo import ActivityWantToTryRepository
 from app.infra.db.repositories.planned_activity_repo import PlannedActivityRepository
 from app.infra.db.repositories.user_repo import UserRepositoryImpl
@@ -23,13 +23,7 @@ router = APIRouter()
 
 
 async def _ensure_member(db: AsyncSession, relationship_id: str, user_id: str) -> None:
-    result = await db.execute(
-        select(relationship_members.c.user_id).where(
-            relationship_members.c.relationship_id == relationship_id,
-        )
-    )
-    member_ids = [row[0] for row in result.all()]
-    if user_id not in member_ids:
+    if not await RelationshipRepositoryImpl(db).is_member(relationship_id, user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not a member of this relationship",
@@ -47,7 +41,7 @@ def _user_display_name(user) -> str:
 
 class WantToTryRequest(BaseModel):
     relationship_id: str
-    discover_feed_item_id: str
+    discover_feed_item_id: UUID
 
 
 class WantToTryResponse(BaseModel):
@@ -63,9 +57,10 @@ async def want_to_try(
 ):
     """Record that the current user wants to try this activity. If the other user (recommended invitee/generator) already wanted it, creates a mutual match and notifies both."""
     await _ensure_member(db, request.relationship_id, current_user.id)
+    discover_feed_item_id = str(request.discover_feed_item_id)
 
     discover_repo = DiscoverFeedRepository(db)
-    feed_item = await discover_repo.get_by_id(request.discover_feed_item_id)
+    feed_item = await discover_repo.get_by_id(discover_feed_item_id)
     if not feed_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,11 +73,11 @@ async def want_to_try(
     await want_repo.create_want_to_try(
         user_id=current_user.id,
         relationship_id=request.relationship_id,
-        discover_feed_item_id=request.discover_feed_item_id,
+        discover_feed_item_id=discover_feed_item_id,
     )
 
     other = await want_repo.get_other_want_to_try_for_feed_item(
-        discover_feed_item_id=request.discover_feed_item_id,
+        discover_feed_item_id=discover_feed_item_id,
         exclude_user_id=current_user.id,
     )
     mutual_match_id = None
@@ -91,7 +86,7 @@ async def want_to_try(
         user_b_id = current_user.id
         match = await want_repo.create_mutual_match(
             relationship_id=request.relationship_id,
-            discover_feed_item_id=request.discover_feed_item_id,
+            discover_feed_item_id=discover_feed_item_id,
             user_a_id=user_a_id,
             user_b_id=user_b_id,
         )
@@ -117,7 +112,7 @@ async def want_to_try(
             extra_payload={
                 "mutual_match_id": match.id,
                 "activity_title": activity_title,
-                "discover_feed_item_id": request.discover_feed_item_id,
+                "discover_feed_item_id": discover_feed_item_id,
             },
         )
         await deliver_notification(
@@ -129,7 +124,7 @@ async def want_to_try(
             extra_payload={
                 "mutual_match_id": match.id,
                 "activity_title": activity_title,
-                "discover_feed_item_id": request.discover_feed_item_id,
+                "discover_feed_item_id": discover_feed_item_id,
             },
         )
 
@@ -142,21 +137,21 @@ class MutualMatchRespondRequest(BaseModel):
 
 @router.post("/mutual-match/{mutual_match_id}/respond")
 async def respond_to_mutual_match(
-    mutual_match_id: str,
+    mutual_match_id: UUID,
     request: MutualMatchRespondRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Accept or decline a mutual match. If both accept, a planned activity is created and both are notified."""
     want_repo = ActivityWantToTryRepository(db)
-    match = await want_repo.get_mutual_match_by_id(mutual_match_id)
+    match = await want_repo.get_mutual_match_by_id(str(mutual_match_id))
     if not match:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mutual match not found")
     if current_user.id not in (match.user_a_id, match.user_b_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your mutual match")
 
     response = "accept" if request.accept else "decline"
-    updated = await want_repo.respond_to_mutual_match(match_id=mutual_match_id, user_id=current_user.id, response=response)
+    updated = await want_repo.respond_to_mutual_match(match_id=str(mutual_match_id), user_id=current_user.id, response=response)
     if not updated:
         return {"ok": False, "message": "Already responded"}
 
@@ -2,6 +2,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional
+from uuid import UUID
 
 from app.api.deps import get_current_user, get_db
 from app.domain.admin.models import User
@@ -27,7 +28,7 @@ class PortraitEditRequest(BaseModel):
 # ---- Memories ----
 @router.post("/memories/{memory_id}/confirm")
 async def confirm_memory(
-    memory_id: str,
+    memory_id: UUID,
     body: ConfirmRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -53,7 +54,7 @@ async def confirm_memory(
 
 @router.post("/memories/{memory_id}/share")
 async def share_memory(
-    memory_id: str,
+    memory_id: UUID,
     body: ShareRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -80,7 +81,7 @@ async def share_memory(
 # ---- Loops ----
 @router.post("/loops/{loop_id}/confirm")
 async def confirm_loop(
-    loop_id: str,
+    loop_id: UUID,
     body: ConfirmRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -114,7 +115,7 @@ async def confirm_loop(
 # ---- Person portraits ----
 @router.post("/person-portraits/{portrait_id}/edit")
 async def edit_person_portrait(
-    portrait_id: str,
+    portrait_id: UUID,
     body: PortraitEditRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -141,7 +142,7 @@ async def edit_person_portrait(
 
 @router.post("/person-portraits/{portrait_id}/share")
 async def share_person_portrait(
-    portrait_id: str,
+    portrait_id: UUID,
     body: ShareRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -167,7 +168,7 @@ async def share_person_portrait(
 # ---- Dyad portraits ----
 @router.post("/dyad-portraits/{dyad_portrait_id}/edit")
 async def edit_dyad_portrait(
-    dyad_portrait_id: str,
+    dyad_portrait_id: UUID,
     body: PortraitEditRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
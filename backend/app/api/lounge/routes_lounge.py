@@ -126,7 +126,7 @@ async def _loved_ones_with_names(db: AsyncSession, current_user_id: str) -> list
 
 def _message_to_dict(m: LoungeMessageModel, sender_name: Optional[str] = None) -> dict:
     return {
-        "id": m.id,
+        "id": str(m.id),
         "room_id": m.room_id,
         "sender_user_id": m.sender_user_id,
         "sender_name": sender_name,
@@ -643,7 +643,7 @@ async def send_message(
 
     msg = await repo.append_message(room_id, current_user.id, request.content, visibility="public")
     await repo.append_event(room_id, "message_sent", {
-        "message_id": msg.id,
+        "message_id": str(msg.id),
         "sender_user_id": current_user.id,
         "content": request.content,
         "visibility": "public",
@@ -732,7 +732,7 @@ async def send_message(
             if analysis_text:
                 kai_msg = await repo.append_message(room_id, None, analysis_text, visibility="public")
                 await repo.append_event(room_id, "message_sent", {
-                    "message_id": kai_msg.id,
+                    "message_id": str(kai_msg.id),
                     "sender_user_id": None,
                     "content": analysis_text,
                     "visibility": "public",
@@ -755,7 +755,7 @@ async def send_message(
             if solo_result.reply:
                 kai_msg = await repo.append_message(room_id, None, solo_result.reply, visibility="public")
                 await repo.append_event(room_id, "message_sent", {
-                    "message_id": kai_msg.id,
+                    "message_id": str(kai_msg.id),
                     "sender_user_id": None,
                     "content": solo_result.reply,
                     "visibility": "public",
@@ -921,7 +921,7 @@ async def analyze_screenshots(
         fallback = "I couldn't extract a clear conversation from these screenshots. Try clearer or more complete images."
         kai_msg = await repo.append_message(room_id, None, fallback, visibility="public")
         await repo.append_event(room_id, "message_sent", {
-            "message_id": kai_msg.id,
+            "message_id": str(kai_msg.id),
             "sender_user_id": None,
             "content": fallback,
             "visibility": "public",
@@ -986,7 +986,7 @@ async def analyze_screenshots(
 
     kai_msg = await repo.append_message(room_id, None, content_to_post, visibility="public")
     await repo.append_event(room_id, "message_sent", {
-        "message_id": kai_msg.id,
+        "message_id": str(kai_msg.id),
         "sender_user_id": None,
         "content": content_to_post,
         "visibility": "public",
@@ -1028,7 +1028,7 @@ async def send_private(
 
     user_msg = await repo.append_message(room_id, current_user.id, request.content, visibility="private_to_kai")
     await repo.append_event(room_id, "private_message", {
-        "message_id": user_msg.id,
+        "message_id": str(user_msg.id),
         "sender_user_id": current_user.id,
         "content": request.content,
         "visibility": "private_to_kai",
@@ -1062,7 +1062,7 @@ async def send_private(
     if reply_text:
         kai_msg = await repo.append_message(room_id, None, reply_text, visibility="private_to_kai")
         await repo.append_event(room_id, "private_message", {
-            "message_id": kai_msg.id,
+            "message_id": str(kai_msg.id),
             "sender_user_id": None,
             "content": reply_text,
             "visibility": "private_to_kai",
@@ -1149,7 +1149,7 @@ async def list_events(
     return {
         "events": [
             {
-                "id": e.id,
+                "id": str(e.id),
                 "room_id": e.room_id,
                 "sequence": e.sequence,
                 "event_type": e.event_type,
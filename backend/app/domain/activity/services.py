@@ -1,4 +1,5 @@
 """Activity domain: suggestions (LLM + seed), scrapbook layout/options/html, sticker generator."""
+import asyncio
 import json
 import logging
 import re
@@ -281,6 +282,10 @@ Example (one object per line):
 
 # ---- Scrapbook (layout, options, html, sticker) ----
 
+# Sticker image generations run at once per scrapbook, up to this many at a time (each holds a
+# worker thread and an image API request for its whole duration).
+STICKER_GENERATION_CONCURRENCY = 4
+
 async def generate_scrapbook_layout(
     gemini_api_key: Optional[str],
     activity_title: str,
@@ -530,7 +535,9 @@ async def generate_scrapbook_html(
 **Output**: Return ONLY the raw HTML string. Do not wrap in JSON. Do not use Markdown code blocks.
 """
     try:
-        raw_text = layout_generator(prompt, "gemini-3-flash-preview") or ""
+        # The generators are blocking HTTP calls: run them in worker threads so the event loop
+        # keeps serving other requests for the seconds they take.
+        raw_text = await asyncio.to_thread(layout_generator, prompt, "gemini-3-flash-preview") or ""
         text = raw_text.strip()
         if not text:
             return {"htmlContent": fallback_html}
@@ -576,8 +583,19 @@ async def generate_scrapbook_html(
             if num_found:
                 logger.info("Scrapbook stickers: disabled by user, %d placeholder(s) removed", num_found)
         else:
-            for full_tag, sticker_prompt, output_size in replacements:
-                b64 = sticker_generator(sticker_prompt, output_size) if sticker_generator else None
+            # Stickers are independent image generations: request them concurrently, bounded so a
+            # page with many sticker tags can't take over the default thread pool.
+            sticker_slots = asyncio.Semaphore(STICKER_GENERATION_CONCURRENCY)
+
+            async def _generate_sticker(sticker_prompt: str, output_size: Tuple[int, int]) -> Optional[str]:
+                async with sticker_slots:
+                    return await asyncio.to_thread(sticker_generator, sticker_prompt, output_size)
+
+            stickers = await asyncio.gather(*(
+                _generate_sticker(sticker_prompt, output_size)
+                for _, sticker_prompt, output_size in replacements
+            )) if sticker_generator else [None] * num_found
+            for (full_tag, sticker_prompt, output_size), b64 in zip(replacements, stickers):
                 if b64:
                     src_attr = f'src="data:image/png;base64,{b64}"'
                     new_tag = full_tag
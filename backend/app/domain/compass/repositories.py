@@ -1,5 +1,5 @@
 """Insider Compass repository protocols (for dependency injection)."""
-from typing import Optional, List, Protocol
+from typing import Any, Dict, Iterable, Optional, List, Protocol
 from datetime import datetime
 
 
@@ -17,6 +17,17 @@ class EventRepositoryProtocol(Protocol):
     ):
         ...
 
+    async def append_sync(
+        self,
+        type: str,
+        actor_user_id: str,
+        payload: dict,
+        source: str,
+        relationship_id: Optional[str] = None,
+        privacy_scope: str = "private",
+    ):
+        ...
+
     async def list_by_actor(
         self,
         actor_user_id: str,
@@ -54,6 +65,14 @@ class MemoryRepositoryProtocol(Protocol):
     async def get(self, memory_id: str):
         ...
 
+    async def get_by_canonical_key(
+        self,
+        owner_user_id: str,
+        canonical_key: str,
+        relationship_id: Optional[str] = None,
+    ):
+        ...
+
     async def list_by_owner(
         self,
         owner_user_id: str,
@@ -161,6 +180,9 @@ class ActivityTemplateRepositoryProtocol(Protocol):
     async def get(self, activity_id: str):
         ...
 
+    async def get_many(self, activity_ids: Iterable[str]) -> Dict[str, Any]:
+        ...
+
     async def create(
         self,
         activity_id: str,
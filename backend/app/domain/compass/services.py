@@ -320,7 +320,8 @@ class EventIngestService:
         valid_sources = [e.value for e in EventSource]
         if source not in valid_sources:
             raise ValueError(f"source must be one of {valid_sources}")
-        event = await self.event_repo.append(
+        # Stored before the unprocessed count below, which has to include it
+        event = await self.event_repo.append_sync(
             type=type,
             actor_user_id=actor_user_id,
             payload=payload,
@@ -0,0 +1,211 @@
+"""Helpers shared by Alembic migration scripts.
+
+Lives under app/ because alembic/versions is not an importable package and Alembic treats
+every .py file there as a revision script.
+"""
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from alembic import op
+from alembic.operations.schemaobj import SchemaObjects
+import sqlalchemy as sa
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+
+# Existence probes read pg_catalog directly: to_regclass resolves a name with one catalog index
+# lookup, where the information_schema views join many catalogs and filter by privilege.
+#
+# Their results are memoized per migration context and dropped whenever a migration emits DDL:
+# every op.* directive (and alembic's version bookkeeping) goes through impl.execute/impl._exec,
+# so a memoized answer never outlives a schema change. Probing the same name twice between two
+# DDL statements (or in a downgrade that re-reads what upgrade read) costs one catalog query.
+_probe_memos: "WeakKeyDictionary[Any, Dict[Tuple[str, ...], Any]]" = WeakKeyDictionary()
+
+
+def _probe_memo() -> Dict[Tuple[str, ...], Any]:
+    impl = op.get_context().impl
+    memo = _probe_memos.get(impl)
+    if memo is None:
+        memo = _probe_memos[impl] = {}
+        for name in ("execute", "_exec"):
+            original = getattr(impl, name)
+
+            def clearing(*args, _original=original, **kwargs):
+                memo.clear()
+                return _original(*args, **kwargs)
+
+            setattr(impl, name, clearing)
+    return memo
+
+
+# Compiled once at import; each probe binds its parameters to the same statement.
+_TABLE_EXISTS = sa.text("SELECT to_regclass(:name) IS NOT NULL")
+_INDEX_EXISTS = sa.text(
+    "SELECT EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass(:name) AND relkind IN ('i', 'I'))"
+)
+_IS_PARTITIONED = sa.text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:name)")
+_INDEXES_OF = sa.text(
+    "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = to_regclass(:name)"
+)
+_COLUMNS_OF = sa.text(
+    "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(:name) AND attnum > 0 AND NOT attisdropped"
+)
+_COLUMN_TYPE = sa.text(
+    "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+    "WHERE attrelid = to_regclass(:name) AND attname = :column AND NOT attisdropped"
+)
+_INVALID_INDEXES_OF = sa.text(
+    "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+    "WHERE i.indrelid = to_regclass(:name) AND NOT i.indisvalid"
+)
+
+
+def _probe(
+    conn: sa.engine.Connection,
+    key: Tuple[str, ...],
+    query: sa.TextClause,
+    params: Dict[str, str],
+    many: bool = False,
+):
+    memo = _probe_memo()
+    if key not in memo:
+        result = conn.execute(query, params)
+        memo[key] = frozenset(result.scalars()) if many else result.scalar()
+    return memo[key]
+
+
+def table_exists(conn: sa.engine.Connection, name: str) -> bool:
+    """True if public.name is an existing table (or other relation)."""
+    return _probe(conn, ("table", name), _TABLE_EXISTS, {"name": f"public.{name}"})
+
+
+def index_exists(conn: sa.engine.Connection, name: str) -> bool:
+    """True if public.name is an existing index."""
+    return _probe(conn, ("index", name), _INDEX_EXISTS, {"name": f"public.{name}"})
+
+
+def is_partitioned(conn: sa.engine.Connection, table: str) -> bool:
+    """True if public.table is a partitioned table; None if there is no such table."""
+    return _probe(conn, ("partitioned", table), _IS_PARTITIONED, {"name": f"public.{table}"})
+
+
+def existing_indexes(conn: sa.engine.Connection, table: str) -> Set[str]:
+    """Names of the indexes on public.table (empty if the table does not exist), in one query."""
+    return set(_probe(conn, ("indexes", table), _INDEXES_OF, {"name": f"public.{table}"}, many=True))
+
+
+def existing_columns(conn: sa.engine.Connection, table: str) -> Set[str]:
+    """Names of public.table's columns (empty if the table does not exist), in one query."""
+    return set(_probe(conn, ("columns", table), _COLUMNS_OF, {"name": f"public.{table}"}, many=True))
+
+
+def column_type(conn: sa.engine.Connection, table: str, column: str) -> Optional[str]:
+    """public.table.column's type as format_type() spells it (e.g. "character varying", "uuid")."""
+    return _probe(
+        conn, ("column_type", table, column), _COLUMN_TYPE, {"name": f"public.{table}", "column": column}
+    )
+
+
+def column_exists(conn: sa.engine.Connection, table: str, column: str) -> bool:
+    """True if public.table has column."""
+    return column in existing_columns(conn, table)
+
+
+def add_column_migration(
+    table: str,
+    column: str,
+    ddl_type: str,
+) -> Tuple[Callable[[], None], Callable[[], None]]:
+    """Build (upgrade, downgrade) for an idempotent single-column add.
+
+    upgrade runs ALTER TABLE ... ADD COLUMN IF NOT EXISTS; downgrade drops the column.
+    """
+    ddl = f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {ddl_type}"
+
+    def upgrade() -> None:
+        op.execute(ddl)
+
+    def downgrade() -> None:
+        op.drop_column(table, column)
+
+    return upgrade, downgrade
+
+
+def create_table_if_not_exists(name: str, *columns: sa.schema.SchemaItem) -> None:
+    """op.create_table for idempotent migrations, without a table_exists probe first.
+
+    Takes the same columns and constraints; emits CREATE TABLE IF NOT EXISTS and CREATE INDEX IF
+    NOT EXISTS for index=True columns, so the server skips what is already there. They are sent
+    as plain SQL strings, which the env's DDL pipeline batches into one round trip.
+    """
+    table = SchemaObjects(op.get_context()).table(name, *columns)
+    dialect = op.get_bind().dialect
+    op.execute(str(CreateTable(table, if_not_exists=True).compile(dialect=dialect)))
+    for index in table.indexes:
+        op.execute(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)))
+
+
+def drop_invalid_indexes(table: str) -> None:
+    """Drop INVALID indexes on table left behind by an interrupted CREATE INDEX CONCURRENTLY.
+
+    CREATE INDEX ... IF NOT EXISTS treats such an index as present, so a retried migration would
+    keep the unusable index. Must run inside an autocommit block, like the builds that follow it.
+    """
+    names = op.get_bind().execute(_INVALID_INDEXES_OF, {"name": table}).scalars().all()
+    for name in names:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def create_indexes_concurrently(indexes_by_table: Dict[str, List[str]], settings: Dict[str, str]) -> None:
+    """Run CREATE INDEX CONCURRENTLY statements, grouped by table, with session settings applied.
+
+    Concurrent builds on one table wait for each other (each holds SHARE UPDATE EXCLUSIVE), so a
+    table's statements run in order while different tables build in parallel when the env
+    provides parallel_ddl connections; otherwise everything runs on the migration connection.
+    """
+    with op.get_context().autocommit_block():
+        for table in indexes_by_table:
+            drop_invalid_indexes(table)
+        parallel_ddl = op.get_context().config.attributes.get("parallel_ddl")
+        if parallel_ddl is not None:
+            parallel_ddl(list(indexes_by_table.values()), settings=settings)
+            return
+        for name, value in settings.items():
+            op.execute(f"SET {name} = '{value}'")
+        for statements in indexes_by_table.values():
+            for statement in statements:
+                op.execute(statement)
+        for name in settings:
+            op.execute(f"RESET {name}")
+
+
+def backfill_in_batches(table: str, key: str, statement: str, batch_size: int = 1000) -> int:
+    """Run a backfill statement over table one key window at a time, committing each window.
+
+    statement is DML limited to the rows whose key lies in [:first, :last], e.g.
+    "UPDATE memories SET ... WHERE memory_id BETWEEN :first AND :last AND ... IS NULL" or
+    "INSERT INTO compass_events SELECT ... FROM old_events WHERE id BETWEEN :first AND :last
+    ON CONFLICT DO NOTHING". Windows of batch_size keys are found by keyset pagination on
+    table.key (an index range read, not OFFSET), and each runs in its own transaction, so locks,
+    memory and WAL per commit stay bounded on large tables. A retry after a failure re-runs
+    windows that already committed, so the statement must be idempotent. Returns the number of
+    windows processed.
+    """
+    windows = 0
+    last = None
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        while True:
+            params = {"batch_size": batch_size}
+            after = ""
+            if last is not None:
+                after = f"WHERE {key} > :after "
+                params["after"] = last
+            keys = conn.execute(
+                sa.text(f"SELECT {key} FROM {table} {after}ORDER BY {key} LIMIT :batch_size"), params
+            ).scalars().all()
+            if not keys:
+                return windows
+            first, last = keys[0], keys[-1]
+            conn.execute(sa.text(statement), {"first": first, "last": last})
+            windows += 1
@@ -74,6 +74,7 @@ from app.infra.db.models.compass import (
     ContextSummaryModel,
     ActivityInviteModel,
     PlannedActivityModel,
+    EvidenceLinkModel,
 )
 from app.infra.db.models.lounge import (
     LoungeRoomModel,
@@ -134,6 +135,7 @@ __all__ = [
     "ContextSummaryModel",
     "ActivityInviteModel",
     "PlannedActivityModel",
+    "EvidenceLinkModel",
     "LoungeRoomModel",
     "LoungeMemberModel",
     "LoungeMessageModel",
@@ -1,40 +1,58 @@
 """Insider Compass database models (events, memories, portraits, loops, activity templates)."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import DDL, Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index, event, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
 
 from app.infra.db.base import Base
+from app.infra.db.partitions import create_compass_event_partitions
+from app.infra.db.types import UTCDateTime
 
 
 class CompassEventModel(Base):
-    """Insider Compass event stream (generic event store)."""
+    """Insider Compass event stream (generic event store).
+
+    Range-partitioned by month on created_at (see app.infra.db.partitions), so created_at is part
+    of the primary key.
+    """
 
     __tablename__ = "compass_events"
 
-    event_id = Column(String, primary_key=True)
+    event_id = Column(UUID(as_uuid=False), primary_key=True)
     type = Column(String, nullable=False, index=True)
-    actor_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True, index=True)
+    actor_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="SET NULL"), nullable=True)
     payload_json = Column(JSONB, nullable=False, default=dict)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, primary_key=True)
     privacy_scope = Column(String, nullable=False, default="private")  # private | shared_with_partner | shared_with_group
-    source = Column(String, nullable=False, index=True)  # love_map | therapist | live_coach | activity | economy | notification
+    source = Column(String, nullable=False)  # love_map | therapist | live_coach | activity | economy | notification
 
     __table_args__ = (
         Index("ix_compass_events_actor_created", "actor_user_id", "created_at"),
         Index("ix_compass_events_relationship_created", "relationship_id", "created_at"),
         Index("ix_compass_events_source_created", "source", "created_at"),
+        Index(
+            "ix_compass_events_created_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
 
+@event.listens_for(CompassEventModel.__table__, "after_create")
+def _create_compass_event_partitions(target, connection, **kw):
+    # create_all only creates the partitioned parent; rows need a partition to land in
+    create_compass_event_partitions(connection)
+
+
 class UnstructuredMemoryModel(Base):
     """Unstructured memory (e.g. Kai insight text not merged into profile)."""
 
     __tablename__ = "unstructured_memories"
 
-    id = Column(String, primary_key=True)
-    owner_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True, index=True)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
+    owner_user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True)
     content_text = Column(Text, nullable=False)
     source = Column(String, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -42,6 +60,10 @@ class UnstructuredMemoryModel(Base):
     __table_args__ = (
         Index("ix_unstructured_memories_owner_created", "owner_user_id", "created_at"),
         Index("ix_unstructured_memories_relationship_created", "relationship_id", "created_at"),
+        Index(
+            "ix_unstructured_memories_created_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32},
+        ),
     )
 
 
@@ -51,8 +73,8 @@ class ThingToFindOutModel(Base):
     __tablename__ = "things_to_find_out"
 
     id = Column(String, primary_key=True)
-    owner_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True, index=True)
+    owner_user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True)
     question_text = Column(Text, nullable=False)
     source = Column(String, nullable=False, index=True)
     priority = Column(Integer, nullable=True)
@@ -69,22 +91,22 @@ class MemoryModel(Base):
 
     __tablename__ = "memories"
 
-    memory_id = Column(String, primary_key=True)
-    owner_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True, index=True)
+    memory_id = Column(UUID(as_uuid=False), primary_key=True)
+    owner_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="SET NULL"), nullable=True, index=True)
     visibility = Column(String, nullable=False, default="private")
     memory_type = Column(String, nullable=False, index=True)  # preference | boundary | value | goal | trigger | ritual | biography | constraint
-    canonical_key = Column(String, nullable=False, index=True)
+    canonical_key = Column(String, nullable=False)
     value_json = Column(JSONB, nullable=False, default=dict)
     confidence = Column(Float, nullable=False, default=0.5)
-    status = Column(String, nullable=False, default="hypothesis", index=True)  # hypothesis | confirmed | rejected
+    status = Column(String, nullable=False, default="hypothesis")  # hypothesis | confirmed | rejected
     evidence_event_ids = Column(JSONB, nullable=True)  # array of event_id strings
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (
         Index("ix_memories_owner_relationship", "owner_user_id", "relationship_id"),
-        Index("ix_memories_canonical_owner", "canonical_key", "owner_user_id"),
+        Index("ix_memories_canonical_owner_lower", text("lower(canonical_key)"), "owner_user_id"),
     )
 
 
@@ -93,16 +115,16 @@ class PersonPortraitModel(Base):
 
     __tablename__ = "person_portraits"
 
-    portrait_id = Column(String, primary_key=True)
-    owner_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True, index=True)
+    portrait_id = Column(UUID(as_uuid=False), primary_key=True)
+    owner_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="SET NULL"), nullable=True, index=True)
     visibility = Column(String, nullable=False, default="private")
     portrait_text = Column(Text, nullable=True)
     portrait_facets_json = Column(JSONB, nullable=True, default=dict)
     evidence_event_ids = Column(JSONB, nullable=True)
     confidence = Column(Float, nullable=False, default=0.5)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (Index("ix_person_portraits_owner_relationship", "owner_user_id", "relationship_id"),)
 
@@ -112,14 +134,14 @@ class DyadPortraitModel(Base):
 
     __tablename__ = "dyad_portraits"
 
-    dyad_portrait_id = Column(String, primary_key=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
+    dyad_portrait_id = Column(UUID(as_uuid=False), primary_key=True)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="CASCADE"), nullable=False, index=True)
     portrait_text = Column(Text, nullable=True)
     facets_json = Column(JSONB, nullable=True, default=dict)
     evidence_event_ids = Column(JSONB, nullable=True)
     confidence = Column(Float, nullable=False, default=0.5)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
 class RelationshipLoopModel(Base):
@@ -127,8 +149,8 @@ class RelationshipLoopModel(Base):
 
     __tablename__ = "relationship_loops"
 
-    loop_id = Column(String, primary_key=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
+    loop_id = Column(UUID(as_uuid=False), primary_key=True)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, nullable=False)
     trigger_signals_json = Column(JSONB, nullable=True, default=dict)
     meanings_json = Column(JSONB, nullable=True, default=dict)
@@ -137,11 +159,11 @@ class RelationshipLoopModel(Base):
     repair_attempts_json = Column(JSONB, nullable=True, default=dict)
     recommended_interruptions_json = Column(JSONB, nullable=True, default=dict)
     confidence = Column(Float, nullable=False, default=0.5)
-    status = Column(String, nullable=False, default="hypothesis", index=True)  # hypothesis | confirmed
+    status = Column(String, nullable=False, default="hypothesis")  # hypothesis | confirmed
     evidence_event_ids = Column(JSONB, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    last_seen_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    last_seen_at = Column(UTCDateTime, nullable=True)
 
 
 class ActivityTemplateModel(Base):
@@ -161,8 +183,13 @@ class ActivityTemplateModel(Base):
     variants = Column(JSONB, nullable=True, default=dict)
     safety_rules = Column(JSONB, nullable=True, default=dict)
     is_active = Column(Boolean, default=True, nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_activity_templates_relationship_types", "relationship_types", postgresql_using="gin"),
+        Index("ix_activity_templates_vibe_tags", "vibe_tags", postgresql_using="gin"),
+    )
 
 
 class DyadActivityHistoryModel(Base):
@@ -171,19 +198,19 @@ class DyadActivityHistoryModel(Base):
     __tablename__ = "dyad_activity_history"
 
     id = Column(String, primary_key=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="CASCADE"), nullable=False, index=True)
     activity_template_id = Column(String, ForeignKey("activity_templates.activity_id"), nullable=False, index=True)
-    actor_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    actor_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     planned_id = Column(String, nullable=True, index=True)  # link to planned_activities for grouping memories
-    started_at = Column(DateTime, nullable=False)
-    completed_at = Column(DateTime, nullable=True)
+    started_at = Column(UTCDateTime, nullable=False)
+    completed_at = Column(UTCDateTime, nullable=True)
     rating = Column(Float, nullable=True)
     outcome_tags = Column(JSONB, nullable=True)
     notes_text = Column(Text, nullable=True)
     memory_urls = Column(JSONB, nullable=True)
     memory_entries = Column(JSONB, nullable=True)  # [{ "url": "...", "caption": "..." }] per participant
     scrapbook_layout = Column(JSONB, nullable=True)  # AI-generated layout for standalone memories (when planned_id is null)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (
         Index("ix_dyad_activity_history_relationship_started", "relationship_id", "started_at"),
@@ -196,17 +223,27 @@ class ActivityInviteModel(Base):
     __tablename__ = "activity_invites"
 
     id = Column(String, primary_key=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="CASCADE"), nullable=False, index=True)
     activity_template_id = Column(String, ForeignKey("activity_templates.activity_id"), nullable=False)
-    from_user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    to_user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    from_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    to_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     status = Column(String, nullable=False, default="pending")  # pending | accepted | declined
     card_snapshot = Column(JSONB, nullable=True)  # full ActivityCard-like JSON when invite was sent
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    responded_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    responded_at = Column(UTCDateTime, nullable=True)
+
+    # Only loaded on request (ActivityInviteRepository.get_by_id(with_template=True)); async
+    # sessions cannot lazy-load, so touching it otherwise raises instead of failing obscurely.
+    template = relationship("ActivityTemplateModel", lazy="raise")
 
     __table_args__ = (
-        Index("ix_activity_invites_to_user_id_status", "to_user_id", "status"),
+        Index("ix_activity_invites_to_user_pending", "to_user_id", "created_at", postgresql_where=text("status = 'pending'")),
+        Index("ix_activity_invites_from_user_pending", "from_user_id", "created_at", postgresql_where=text("status = 'pending'")),
+        Index("ix_activity_invites_to_user_declined", "to_user_id", "responded_at", postgresql_where=text("status = 'declined'")),
+        Index(
+            "uq_activity_invites_one_pending", "relationship_id", "from_user_id", "to_user_id", "activity_template_id",
+            unique=True, postgresql_where=text("status = 'pending'"),
+        ),
     )
 
 
@@ -216,24 +253,28 @@ class PlannedActivityModel(Base):
     __tablename__ = "planned_activities"
 
     id = Column(String, primary_key=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="CASCADE"), nullable=False, index=True)
     activity_template_id = Column(String, ForeignKey("activity_templates.activity_id"), nullable=False)
-    initiator_user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    invitee_user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    invite_id = Column(String, ForeignKey("activity_invites.id"), nullable=True)
+    initiator_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    invitee_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    invite_id = Column(String, ForeignKey("activity_invites.id", ondelete="SET NULL"), nullable=True)
     status = Column(String, nullable=False, default="planned")  # planned | completed
-    agreed_at = Column(DateTime, nullable=False)
-    completed_at = Column(DateTime, nullable=True)
+    agreed_at = Column(UTCDateTime, nullable=False)
+    completed_at = Column(UTCDateTime, nullable=True)
     notes_text = Column(Text, nullable=True)
     memory_urls = Column(JSONB, nullable=True)
     scrapbook_layout = Column(JSONB, nullable=True)  # AI-generated layout (themeColor, headline, narrative, etc.)
     card_snapshot = Column(JSONB, nullable=True)  # full ActivityCard-like JSON for UI (from invite or template)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (
-        Index("ix_planned_activities_initiator_status", "initiator_user_id", "status"),
-        Index("ix_planned_activities_invitee_status", "invitee_user_id", "status"),
+        Index("ix_planned_activities_initiator_agreed", "initiator_user_id", "agreed_at"),
+        Index("ix_planned_activities_invitee_agreed", "invitee_user_id", "agreed_at"),
+        Index(
+            "uq_planned_activities_one_active", "relationship_id", "activity_template_id",
+            unique=True, postgresql_where=text("status = 'planned'"),
+        ),
     )
 
 
@@ -242,8 +283,8 @@ class DiscoverFeedItemModel(Base):
 
     __tablename__ = "discover_feed_items"
 
-    id = Column(String, primary_key=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
+    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False)
     activity_template_id = Column(String, ForeignKey("activity_templates.activity_id"), nullable=False, index=True)
     card_snapshot = Column(JSONB, nullable=True)
     generated_by_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
@@ -261,10 +302,10 @@ class DiscoverDismissalModel(Base):
 
     __tablename__ = "discover_dismissals"
 
-    id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
     relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
-    discover_feed_item_id = Column(String, ForeignKey("discover_feed_items.id"), nullable=False, index=True)
+    discover_feed_item_id = Column(UUID(as_uuid=False), ForeignKey("discover_feed_items.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (Index("ix_discover_dismissals_user_relationship", "user_id", "relationship_id"),)
@@ -275,33 +316,37 @@ class ActivityWantToTryModel(Base):
 
     __tablename__ = "activity_want_to_try"
 
-    id = Column(String, primary_key=True)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
-    discover_feed_item_id = Column(String, ForeignKey("discover_feed_items.id"), nullable=False, index=True)
+    discover_feed_item_id = Column(UUID(as_uuid=False), ForeignKey("discover_feed_items.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (Index("ix_activity_want_to_try_feed_item", "discover_feed_item_id"),)
 
 
+# Shared by both response columns, so create_all creates the type once
+MUTUAL_MATCH_RESPONSE = SQLEnum("pending", "accept", "decline", name="mutual_match_response")
+
+
 class ActivityMutualMatchModel(Base):
     """Mutual match: both users want to try the same activity; store accept/decline per user."""
 
     __tablename__ = "activity_mutual_matches"
 
-    id = Column(String, primary_key=True)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
     relationship_id = Column(String, ForeignKey("relationships.id"), nullable=False, index=True)
-    discover_feed_item_id = Column(String, ForeignKey("discover_feed_items.id"), nullable=False, index=True)
-    user_a_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    user_b_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    user_a_response = Column(String, nullable=False, default="pending")  # pending | accept | decline
-    user_b_response = Column(String, nullable=False, default="pending")
+    discover_feed_item_id = Column(UUID(as_uuid=False), ForeignKey("discover_feed_items.id"), nullable=False, index=True)
+    user_a_id = Column(String, ForeignKey("users.id"), nullable=False)
+    user_b_id = Column(String, ForeignKey("users.id"), nullable=False)
+    user_a_response = Column(MUTUAL_MATCH_RESPONSE, nullable=False, default="pending")
+    user_b_response = Column(MUTUAL_MATCH_RESPONSE, nullable=False, default="pending")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     resolved_at = Column(DateTime, nullable=True)
 
     __table_args__ = (
-        Index("ix_activity_mutual_matches_user_a", "user_a_id", "user_a_response"),
-        Index("ix_activity_mutual_matches_user_b", "user_b_id", "user_b_response"),
+        Index("ix_activity_mutual_matches_user_a_pending", "user_a_id", postgresql_where=text("user_a_response = 'pending'")),
+        Index("ix_activity_mutual_matches_user_b_pending", "user_b_id", postgresql_where=text("user_b_response = 'pending'")),
     )
 
 
@@ -311,16 +356,43 @@ class ContextSummaryModel(Base):
     __tablename__ = "context_summaries"
 
     id = Column(String, primary_key=True)
-    relationship_id = Column(String, ForeignKey("relationships.id"), nullable=True, index=True)
-    actor_user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    relationship_id = Column(String, ForeignKey("relationships.id", ondelete="SET NULL"), nullable=True, index=True)
+    actor_user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     use_case = Column(String, nullable=False, index=True)  # activities | economy | therapist | live_coach | dashboard
     scenario = Column(String, nullable=True, index=True)  # e.g. default | repair_ladder | in_session | post_session
     summary_text = Column(Text, nullable=False)
     evidence_event_ids = Column(JSONB, nullable=True)  # array of event_id strings
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (
         Index("ix_context_summaries_relationship_use_case", "relationship_id", "use_case"),
         Index("ix_context_summaries_actor_use_case", "actor_user_id", "use_case"),
     )
+
+
+class EvidenceLinkModel(Base):
+    """Event cited as evidence by a memory, portrait, loop or context summary.
+
+    Normalized copy of the evidence_event_ids arrays, indexed by event_id for "what cites this event"
+    lookups. Neither id is a foreign key: parent_id points into several tables, and compass_events is
+    partitioned, so event_id alone is not unique there.
+    """
+
+    __tablename__ = "evidence_links"
+
+    parent_kind = Column(String, primary_key=True)  # memory | person_portrait | dyad_portrait | loop | context_summary
+    parent_id = Column(String, primary_key=True)
+    event_id = Column(UUID(as_uuid=False), primary_key=True, index=True)
+
+
+# Updated in place (evidence merges, status/confidence changes, plan notes): 10% free space per page
+# lets updates that change no indexed column stay HOT. Migrations set the same fillfactor.
+for _table in (
+    MemoryModel.__table__,
+    PersonPortraitModel.__table__,
+    DyadPortraitModel.__table__,
+    RelationshipLoopModel.__table__,
+    PlannedActivityModel.__table__,
+):
+    event.listen(_table, "after_create", DDL("ALTER TABLE %(table)s SET (fillfactor = 90)"))
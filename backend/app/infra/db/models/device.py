@@ -1,9 +1,10 @@
 """Device database model (push tokens)."""
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.infra.db.base import Base
+from app.infra.db.types import UTCDateTime
 
 
 class DeviceModel(Base):
@@ -12,9 +13,14 @@ class DeviceModel(Base):
     __tablename__ = "devices"
 
     id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    push_token = Column(String, nullable=False, unique=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    push_token = Column(String, nullable=False)
     platform = Column(String, nullable=False)  # 'ios' or 'android'
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=datetime.utcnow, nullable=False)
 
     user = relationship("UserModel", backref="devices")
+
+    __table_args__ = (
+        UniqueConstraint("push_token", "platform", name="uq_devices_push_token_platform"),
+        Index("ix_devices_user_platform", "user_id", "platform", postgresql_include=["push_token"]),
+    )
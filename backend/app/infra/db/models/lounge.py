@@ -1,9 +1,10 @@
 """Lounge (group chat room) database models."""
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, Integer
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import BigInteger, Column, String, Text, DateTime, ForeignKey, Identity, Index, Integer, event, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.infra.db.base import Base
+from app.infra.db.partitions import hash_partition_ddl
 
 
 class LoungeRoomModel(Base):
@@ -33,19 +34,35 @@ class LoungeMemberModel(Base):
 
 
 class LoungeMessageModel(Base):
-    """Lounge message (public or private to Kai)."""
+    """Lounge message (public or private to Kai).
+
+    Hash-partitioned on room_id (see app.infra.db.partitions), so room_id is part of the primary key.
+    """
 
     __tablename__ = "lounge_messages"
 
-    id = Column(String, primary_key=True)
-    room_id = Column(String, ForeignKey("lounge_rooms.id"), nullable=False, index=True)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)  # assigned on insert; API returns it as a string
+    room_id = Column(String, ForeignKey("lounge_rooms.id"), primary_key=True)
     sender_user_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)  # None = Kai/system
     content = Column(Text, nullable=False)
-    visibility = Column(String, nullable=False, default="public", index=True)  # public | private_to_kai
+    visibility = Column(
+        SQLEnum("public", "private_to_kai", name="lounge_message_visibility"), nullable=False, default="public", index=True
+    )
     sequence = Column(Integer, nullable=False, index=True)  # per-room increment for ordering
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    __table_args__ = (Index("ix_lounge_messages_room_sequence", "room_id", "sequence"),)
+    __table_args__ = (
+        Index("ix_lounge_messages_room_sequence", "room_id", "sequence"),
+        Index(
+            "ix_lounge_messages_room_public_sequence", "room_id", sequence.desc(), "created_at",
+            postgresql_where=text("visibility = 'public'"),
+        ),
+        Index(
+            "ix_lounge_messages_created_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32},
+        ),
+        {"postgresql_partition_by": "HASH (room_id)"},
+    )
 
 
 class LoungeKaiContextModel(Base):
@@ -60,18 +77,33 @@ class LoungeKaiContextModel(Base):
 
 
 class LoungeEventModel(Base):
-    """Append-only event log for lounge (replay)."""
+    """Append-only event log for lounge (replay). Hash-partitioned on room_id, like lounge_messages."""
 
     __tablename__ = "lounge_events"
 
-    id = Column(String, primary_key=True)
-    room_id = Column(String, ForeignKey("lounge_rooms.id"), nullable=False, index=True)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)  # assigned on insert; API returns it as a string
+    room_id = Column(String, ForeignKey("lounge_rooms.id"), primary_key=True)
     sequence = Column(Integer, nullable=False, index=True)  # per-room sequence for replay order
     event_type = Column(String, nullable=False, index=True)
     payload = Column(JSONB, nullable=False, default=dict)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    __table_args__ = (Index("ix_lounge_events_room_sequence", "room_id", "sequence"),)
+    __table_args__ = (
+        Index("ix_lounge_events_room_sequence", "room_id", "sequence"),
+        Index(
+            "ix_lounge_events_created_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32},
+        ),
+        {"postgresql_partition_by": "HASH (room_id)"},
+    )
+
+
+@event.listens_for(LoungeMessageModel.__table__, "after_create")
+@event.listens_for(LoungeEventModel.__table__, "after_create")
+def _create_hash_partitions(target, connection, **kw):
+    # create_all only creates the partitioned parent; rows need a partition to land in
+    for statement in hash_partition_ddl(target.name):
+        connection.execute(text(statement))
 
 
 class LoungeKaiUserPreferenceModel(Base):
@@ -79,7 +111,7 @@ class LoungeKaiUserPreferenceModel(Base):
 
     __tablename__ = "kai_user_preferences"
 
-    id = Column(String, primary_key=True)
+    id = Column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     # DB column "text" (legacy): same as content; set so INSERT satisfies NOT NULL.
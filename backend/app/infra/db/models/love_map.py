@@ -31,7 +31,7 @@ class UserSpecModel(Base):
     __tablename__ = "user_specs"
 
     id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
     prompt_id = Column(String, ForeignKey("map_prompts.id"), nullable=False, index=True)
     answer_text = Column(Text, nullable=False)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -54,7 +54,7 @@ class RelationshipMapProgressModel(Base):
     __tablename__ = "relationship_map_progress"
 
     id = Column(String, primary_key=True)
-    observer_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)  # The Player/Guesser
+    observer_id = Column(String, ForeignKey("users.id"), nullable=False)  # The Player/Guesser
     subject_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)  # The Person being studied
     level_tier = Column(Integer, default=1, nullable=False)  # Current unlocked difficulty tier (1-6)
     current_xp = Column(Integer, default=0, nullable=False)  # Experience points
@@ -1,7 +1,7 @@
 """Market database models."""
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Text, Index, Table
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, CheckConstraint, UniqueConstraint, Text, Index, Table, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
@@ -154,7 +154,7 @@ class MarketItemModel(Base):
     __table_args__ = (
         CheckConstraint('cost > 0', name='ck_market_item_cost_positive'),
         Index('ix_market_items_issuer_id', 'issuer_id'),
-        Index('ix_market_items_is_active', 'is_active'),
+        Index('ix_market_items_active', 'issuer_id', postgresql_where=text('is_active')),
     )
     
     def to_entity(self):
@@ -215,10 +215,14 @@ class TransactionModel(Base):
     # Constraints and indexes
     __table_args__ = (
         CheckConstraint('amount > 0', name='ck_transaction_amount_positive'),
-        Index('ix_transactions_wallet_id', 'wallet_id'),
-        Index('ix_transactions_market_item_id', 'market_item_id'),
-        Index('ix_transactions_status', 'status'),
-        Index('ix_transactions_created_at', 'created_at'),
+        Index(
+            'ix_transactions_wallet_created', 'wallet_id', text('created_at DESC'),
+            postgresql_include=['status', 'amount', 'market_item_id'],
+        ),
+        Index(
+            'ix_transactions_status_pending', 'wallet_id', 'created_at',
+            postgresql_where=text("status IN ('PENDING_APPROVAL', 'PURCHASED')"),
+        ),
     )
     
     def to_entity(self):
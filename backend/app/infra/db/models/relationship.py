@@ -72,7 +72,14 @@ class RelationshipModel(Base):
     __tablename__ = "relationships"
 
     id = Column(String, primary_key=True)
-    type = Column(SQLEnum(RelationshipType), nullable=False)
+    # VARCHAR + CHECK rather than a native enum, so adding a type is a constraint swap (043)
+    type = Column(
+        SQLEnum(
+            RelationshipType, native_enum=False, length=32,
+            create_constraint=True, name="ck_relationship_type",
+        ),
+        nullable=False,
+    )
     status = Column(SQLEnum(RelationshipStatus), nullable=False, default=RelationshipStatus.DRAFT)
     created_by_user_id = Column(String, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
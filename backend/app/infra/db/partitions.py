@@ -0,0 +1,81 @@
+"""Partitioning for the append-only event/message tables.
+
+compass_events is partitioned by RANGE (created_at), one partition per UTC month, plus a DEFAULT
+partition that catches rows no monthly partition covers (so inserts never fail when maintenance
+falls behind). Partitions are created ahead of time by migration 049, create_all (via the table's
+after_create hook) and app startup; old months can be detached or dropped without a DELETE scan.
+
+lounge_messages and lounge_events are partitioned by HASH (room_id) into a fixed set of
+partitions (migration 053, or the tables' after_create hooks): every lounge query is scoped to one
+room, so it reads one partition and that partition's smaller indexes.
+"""
+import logging
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+COMPASS_EVENTS = "compass_events"
+MONTHS_AHEAD = 3
+LOUNGE_HASH_PARTITIONS = 16
+
+
+def month_start(value: date, months: int = 0) -> date:
+    """First day of the month months after value's month."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def default_partition_ddl() -> str:
+    return f"CREATE TABLE IF NOT EXISTS {COMPASS_EVENTS}_default PARTITION OF {COMPASS_EVENTS} DEFAULT"
+
+
+def monthly_partition_ddl(first: date, last: date) -> List[str]:
+    """CREATE TABLE statements for the monthly partitions from first's month through last's."""
+    statements = []
+    start = month_start(first)
+    while start <= last:
+        end = month_start(start, 1)
+        # UTC bounds, so partition edges do not depend on the session time zone
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {COMPASS_EVENTS}_{start:%Y_%m} PARTITION OF {COMPASS_EVENTS} "
+            f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+        )
+        start = end
+    return statements
+
+
+def create_compass_event_partitions(
+    connection: Connection,
+    months_ahead: int = MONTHS_AHEAD,
+    today: Optional[date] = None,
+) -> List[str]:
+    """Ensure the default partition and monthly partitions from this month to months_ahead ahead.
+
+    Each statement runs in a savepoint: a month that overlaps an existing partition (the one
+    holding rows from before partitioning) or whose rows already landed in the default partition
+    is logged and skipped rather than failing the caller. Returns the statements that ran.
+    """
+    first = month_start(today or datetime.utcnow().date())
+    created = []
+    for statement in [default_partition_ddl()] + monthly_partition_ddl(first, month_start(first, months_ahead)):
+        try:
+            with connection.begin_nested():
+                connection.execute(text(statement))
+            created.append(statement)
+        except DBAPIError as e:
+            logger.info("Skipped compass_events partition: %s", getattr(e, "orig", e))
+    return created
+
+
+def hash_partition_ddl(table: str, modulus: int = LOUNGE_HASH_PARTITIONS) -> List[str]:
+    """CREATE TABLE statements for table's hash partitions, table_p0 through table_p<modulus - 1>."""
+    return [
+        f"CREATE TABLE IF NOT EXISTS {table}_p{remainder} PARTITION OF {table} "
+        f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+        for remainder in range(modulus)
+    ]
@@ -4,9 +4,12 @@ from typing import Optional, List, Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.dialects.postgresql import insert
 
 from app.infra.db.models.compass import ActivityInviteModel
 from app.domain.common.types import generate_id
+from app.domain.common.errors import ConflictError
 
 
 class ActivityInviteRepository:
@@ -23,27 +26,56 @@ class ActivityInviteRepository:
         to_user_id: str,
         card_snapshot: Optional[dict] = None,
     ) -> ActivityInviteModel:
-        """Create a pending activity invite. Optionally store full ActivityCard JSON for UI."""
-        invite_id = generate_id()
-        model = ActivityInviteModel(
-            id=invite_id,
-            relationship_id=relationship_id,
-            activity_template_id=activity_template_id,
-            from_user_id=from_user_id,
-            to_user_id=to_user_id,
-            status="pending",
-            card_snapshot=card_snapshot,
+        """Create a pending activity invite. Optionally store full ActivityCard JSON for UI.
+
+        If the sender already has a pending invite to this invitee for the same activity (double tap,
+        concurrent sends), that invite is returned instead of creating a duplicate.
+        """
+        stmt = (
+            insert(ActivityInviteModel)
+            .values(
+                id=generate_id(),
+                relationship_id=relationship_id,
+                activity_template_id=activity_template_id,
+                from_user_id=from_user_id,
+                to_user_id=to_user_id,
+                status="pending",
+                card_snapshot=card_snapshot,
+            )
+            # uq_activity_invites_one_pending
+            .on_conflict_do_nothing(
+                index_elements=["relationship_id", "from_user_id", "to_user_id", "activity_template_id"],
+                index_where=ActivityInviteModel.status == "pending",
+            )
+            .returning(ActivityInviteModel)
+        )
+        existing = select(ActivityInviteModel).where(
+            ActivityInviteModel.relationship_id == relationship_id,
+            ActivityInviteModel.from_user_id == from_user_id,
+            ActivityInviteModel.to_user_id == to_user_id,
+            ActivityInviteModel.activity_template_id == activity_template_id,
+            ActivityInviteModel.status == "pending",
         )
-        self.session.add(model)
+        # The conflicting invite can be answered between the insert and the lookup; the insert
+        # then goes through on a second try.
+        for _attempt in range(2):
+            model = (await self.session.scalars(stmt)).first()
+            if model is None:
+                model = (await self.session.scalars(existing)).first()
+            if model is not None:
+                break
+        else:
+            raise ConflictError("Activity invite changed concurrently, please retry")
         await self.session.commit()
         await self.session.refresh(model)
         return model
 
-    async def get_by_id(self, invite_id: str) -> Optional[ActivityInviteModel]:
-        """Get invite by id."""
-        result = await self.session.execute(
-            select(ActivityInviteModel).where(ActivityInviteModel.id == invite_id)
-        )
+    async def get_by_id(self, invite_id: str, with_template: bool = False) -> Optional[ActivityInviteModel]:
+        """Get invite by id. with_template joins its activity template into the same query (invite.template)."""
+        stmt = select(ActivityInviteModel).where(ActivityInviteModel.id == invite_id)
+        if with_template:
+            stmt = stmt.options(joinedload(ActivityInviteModel.template))
+        result = await self.session.execute(stmt)
         return result.scalars().first()
 
     async def get_pending_for_user(self, to_user_id: str, limit: int = 50) -> List[ActivityInviteModel]:
@@ -74,7 +106,12 @@ class ActivityInviteRepository:
         result = await self.session.execute(q)
         return list(result.scalars().all())
 
-    async def get_declined_for_user(self, to_user_id: str, limit: int = 50) -> List[ActivityInviteModel]:
+    async def get_declined_for_user(
+        self,
+        to_user_id: str,
+        limit: int = 50,
+        relationship_id: Optional[str] = None,
+    ) -> List[ActivityInviteModel]:
         """List declined invites for a user (invites they declined), newest first."""
         q = (
             select(ActivityInviteModel)
@@ -85,6 +122,8 @@ class ActivityInviteRepository:
             .order_by(ActivityInviteModel.responded_at.desc())
             .limit(limit)
         )
+        if relationship_id is not None:
+            q = q.where(ActivityInviteModel.relationship_id == relationship_id)
         result = await self.session.execute(q)
         return list(result.scalars().all())
 
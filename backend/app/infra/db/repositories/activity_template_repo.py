@@ -1,11 +1,44 @@
 """Activity template repository."""
-from typing import Optional, List, Any
+import time
+from typing import Optional, List, Any, Dict, Iterable, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects.postgresql import array
 
 from app.infra.db.models.compass import ActivityTemplateModel
 
+# Templates are reference data read on nearly every activity request (titles for history,
+# memories, planned, invites) and only created, never edited, by the app. get/get_many keep them
+# in a process-wide cache for TEMPLATE_CACHE_TTL_SECONDS, so a warm lookup is a dict hit instead
+# of a query; edits made outside the app show up once the entry expires.
+TEMPLATE_CACHE_TTL_SECONDS = 300
+TEMPLATE_CACHE_MAX_ENTRIES = 4096
+
+# activity_id -> (expiry on the time.monotonic() clock, detached copy shared by all sessions)
+_template_cache: Dict[str, Tuple[float, ActivityTemplateModel]] = {}
+
+
+def _cached(activity_id: str) -> Optional[ActivityTemplateModel]:
+    entry = _template_cache.get(activity_id)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        _template_cache.pop(activity_id, None)
+        return None
+    return entry[1]
+
+
+def _cache(model: ActivityTemplateModel) -> ActivityTemplateModel:
+    """Store a copy detached from model's session (so no request's session owns it) and return it."""
+    copy = ActivityTemplateModel(
+        **{attr.key: getattr(model, attr.key) for attr in inspect(ActivityTemplateModel).column_attrs}
+    )
+    if len(_template_cache) >= TEMPLATE_CACHE_MAX_ENTRIES:
+        _template_cache.pop(next(iter(_template_cache)))  # oldest insertion
+    _template_cache[model.activity_id] = (time.monotonic() + TEMPLATE_CACHE_TTL_SECONDS, copy)
+    return copy
+
 
 class ActivityTemplateRepository:
     """Activity template repository."""
@@ -26,26 +59,16 @@ class ActivityTemplateRepository:
         vibe_tags: template must include at least one of these (if provided).
         age_min/age_max: for child/family - filter by age_range JSONB.
         """
-        q = (
-            select(ActivityTemplateModel)
-            .where(ActivityTemplateModel.is_active.is_(True))
-            .order_by(ActivityTemplateModel.title)
-            .limit(limit * 2)
-        )
-        result = await self.session.execute(q)
-        templates = list(result.scalars().all())
+        q = select(ActivityTemplateModel).where(ActivityTemplateModel.is_active.is_(True))
+        # Tag filters run in SQL (?| on the JSONB arrays, served by their GIN indexes) so the
+        # limit applies to matching templates rather than to the first rows by title.
         if relationship_types:
-            types_set = set(relationship_types)
-            templates = [
-                t for t in templates
-                if t.relationship_types and (set(t.relationship_types) & types_set)
-            ]
+            q = q.where(ActivityTemplateModel.relationship_types.has_any(array(relationship_types)))
         if vibe_tags:
-            tags_set = set(vibe_tags)
-            templates = [
-                t for t in templates
-                if t.vibe_tags and (set(t.vibe_tags) & tags_set)
-            ]
+            q = q.where(ActivityTemplateModel.vibe_tags.has_any(array(vibe_tags)))
+        q = q.order_by(ActivityTemplateModel.title).limit(limit * 2)
+        result = await self.session.execute(q)
+        templates = list(result.scalars().all())
         if age_min is not None or age_max is not None:
             def age_ok(t: ActivityTemplateModel) -> bool:
                 ar = t.age_range
@@ -62,13 +85,35 @@ class ActivityTemplateRepository:
         return templates[:limit]
 
     async def get(self, activity_id: str) -> Optional[ActivityTemplateModel]:
-        """Get a template by ID."""
+        """Get a template by ID (cached; see TEMPLATE_CACHE_TTL_SECONDS)."""
+        cached = _cached(activity_id)
+        if cached is not None:
+            return cached
         result = await self.session.execute(
             select(ActivityTemplateModel).where(
                 ActivityTemplateModel.activity_id == activity_id
             )
         )
-        return result.scalars().first()
+        model = result.scalars().first()
+        return _cache(model) if model else None
+
+    async def get_many(self, activity_ids: Iterable[str]) -> Dict[str, ActivityTemplateModel]:
+        """Get templates by ID, keyed by activity_id (missing IDs are absent); cache misses in one query."""
+        found: Dict[str, ActivityTemplateModel] = {}
+        missing = set()
+        for activity_id in set(activity_ids):
+            cached = _cached(activity_id)
+            if cached is not None:
+                found[activity_id] = cached
+            else:
+                missing.add(activity_id)
+        if missing:
+            result = await self.session.execute(
+                select(ActivityTemplateModel).where(ActivityTemplateModel.activity_id.in_(missing))
+            )
+            for t in result.scalars().all():
+                found[t.activity_id] = _cache(t)
+        return found
 
     async def create(
         self,
@@ -96,4 +141,5 @@ class ActivityTemplateRepository:
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
+        _template_cache.pop(activity_id, None)
         return model
@@ -10,7 +10,6 @@ from app.infra.db.models.compass import (
     ActivityMutualMatchModel,
     DiscoverFeedItemModel,
 )
-from app.domain.common.types import generate_id
 
 
 class ActivityWantToTryRepository:
@@ -26,9 +25,7 @@ class ActivityWantToTryRepository:
         discover_feed_item_id: str,
     ) -> ActivityWantToTryModel:
         """Record that user wants to try this discover feed item."""
-        record_id = generate_id()
         model = ActivityWantToTryModel(
-            id=record_id,
             user_id=user_id,
             relationship_id=relationship_id,
             discover_feed_item_id=discover_feed_item_id,
@@ -62,9 +59,7 @@ class ActivityWantToTryRepository:
         user_b_id: str,
     ) -> ActivityMutualMatchModel:
         """Create a mutual match record (both users want to try)."""
-        match_id = generate_id()
         model = ActivityMutualMatchModel(
-            id=match_id,
             relationship_id=relationship_id,
             discover_feed_item_id=discover_feed_item_id,
             user_a_id=user_a_id,
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.infra.db.models.compass import ContextSummaryModel
+from app.infra.db.repositories.evidence_link_repo import CONTEXT_SUMMARY, replace_evidence_links
 from app.domain.common.types import generate_id
 
 
@@ -44,6 +45,7 @@ class ContextSummaryRepository:
         if existing:
             existing.summary_text = summary_text
             existing.evidence_event_ids = evidence_event_ids
+            await replace_evidence_links(self.session, CONTEXT_SUMMARY, existing.id, evidence_event_ids)
             existing.updated_at = now
             await self.session.commit()
             await self.session.refresh(existing)
@@ -61,6 +63,7 @@ class ContextSummaryRepository:
             updated_at=now,
         )
         self.session.add(model)
+        await replace_evidence_links(self.session, CONTEXT_SUMMARY, summary_id, evidence_event_ids)
         await self.session.commit()
         await self.session.refresh(model)
         return model
@@ -1,5 +1,5 @@
 """Device repository for push tokens."""
-from typing import List
+from typing import Dict, Iterable, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -16,14 +16,16 @@ class DeviceRepository:
     async def upsert_by_token(
         self, user_id: str, push_token: str, platform: str
     ) -> DeviceModel:
-        """Insert or update device by push_token. Same token overwrites (one token per device)."""
+        """Insert or update device by (push_token, platform). Same token overwrites (one token per device)."""
         existing = await self.session.execute(
-            select(DeviceModel).where(DeviceModel.push_token == push_token)
+            select(DeviceModel).where(
+                DeviceModel.push_token == push_token,
+                DeviceModel.platform == platform,
+            )
         )
         row = existing.scalar_one_or_none()
         if row:
             row.user_id = user_id
-            row.platform = platform
             await self.session.commit()
             await self.session.refresh(row)
             return row
@@ -46,3 +48,18 @@ class DeviceRepository:
             )
         )
         return list(result.all())
+
+    async def list_tokens_by_users(self, user_ids: Iterable[str]) -> Dict[str, List[tuple]]:
+        """List (push_token, platform) per user for several users in one query (users without devices are absent)."""
+        ids = set(user_ids)
+        if not ids:
+            return {}
+        result = await self.session.execute(
+            select(DeviceModel.user_id, DeviceModel.push_token, DeviceModel.platform).where(
+                DeviceModel.user_id.in_(ids)
+            )
+        )
+        tokens: Dict[str, List[tuple]] = {}
+        for user_id, push_token, platform in result.all():
+            tokens.setdefault(user_id, []).append((push_token, platform))
+        return tokens
@@ -6,7 +6,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, and_
 
 from app.infra.db.models.compass import DiscoverFeedItemModel, DiscoverDismissalModel
-from app.domain.common.types import generate_id
 
 
 class DiscoverFeedRepository:
@@ -24,9 +23,7 @@ class DiscoverFeedRepository:
         card_snapshot: Optional[dict] = None,
     ) -> DiscoverFeedItemModel:
         """Insert a discover feed item (card shown to both generator and recommended invitee)."""
-        item_id = generate_id()
         model = DiscoverFeedItemModel(
-            id=item_id,
             relationship_id=relationship_id,
             activity_template_id=activity_template_id,
             card_snapshot=card_snapshot,
@@ -103,9 +100,7 @@ class DiscoverFeedRepository:
         item = result.scalar_one_or_none()
         if not item:
             return
-        dismissal_id = generate_id()
         model = DiscoverDismissalModel(
-            id=dismissal_id,
             user_id=user_id,
             relationship_id=relationship_id,
             discover_feed_item_id=discover_feed_item_id,
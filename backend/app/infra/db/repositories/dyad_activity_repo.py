@@ -1,11 +1,13 @@
 """Dyad activity history repository."""
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import JSON, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 
-from app.infra.db.models.compass import DyadActivityHistoryModel
+from app.infra.db.models.compass import ActivityTemplateModel, DyadActivityHistoryModel, PlannedActivityModel
+from app.infra.db.models.user import UserModel
 from app.domain.common.types import generate_id
 
 
@@ -87,3 +89,87 @@ class DyadActivityHistoryRepository:
         )
         result = await self.session.execute(q)
         return list(result.scalars().all())
+
+    async def list_by_relationship_and_actor(
+        self,
+        relationship_id: str,
+        actor_user_id: str,
+        limit: int = 100,
+    ) -> List[DyadActivityHistoryModel]:
+        """List one member's activity history in a relationship, newest first by completion (or start)."""
+        q = (
+            select(DyadActivityHistoryModel)
+            .where(
+                DyadActivityHistoryModel.relationship_id == relationship_id,
+                DyadActivityHistoryModel.actor_user_id == actor_user_id,
+            )
+            .order_by(
+                func.coalesce(DyadActivityHistoryModel.completed_at, DyadActivityHistoryModel.started_at).desc()
+            )
+            .limit(limit)
+        )
+        result = await self.session.execute(q)
+        return list(result.scalars().all())
+
+    async def list_grouped_memories(self, relationship_id: str, limit: int = 50) -> List[Any]:
+        """The relationship's `limit` most recently started memories, shaped in one query.
+
+        A memory is the records sharing a planned_id, or a single record without one. Each row
+        has: key (planned_id or record id), activity_template_id, activity_title, completed_at
+        (completion or start) and scrapbook_layout of the group's latest-started record;
+        contributions, a JSON list (latest first) of {actor_user_id, actor_name, notes_text,
+        memory_entries, feeling}; and has_planned / planned_scrapbook_layout from the matching
+        planned activity.
+        """
+        h = DyadActivityHistoryModel
+        key = func.coalesce(h.planned_id, h.id)
+        newest_first = h.started_at.desc()
+
+        def latest(column):
+            return array_agg(aggregate_order_by(column, newest_first))[1]
+
+        group_keys = (
+            select(key)
+            .where(h.relationship_id == relationship_id)
+            .group_by(key)
+            .order_by(func.max(h.started_at).desc())
+            .limit(limit)
+        )
+        contribution = func.json_build_object(
+            "actor_user_id", h.actor_user_id,
+            # display name, else the email's local part, else "Someone" (also for a deleted user)
+            "actor_name", func.coalesce(
+                func.nullif(UserModel.display_name, ""),
+                func.split_part(func.nullif(UserModel.email, ""), "@", 1),
+                "Someone",
+            ),
+            "notes_text", h.notes_text,
+            "memory_entries", h.memory_entries,
+            "feeling", h.outcome_tags.op("->>")("feeling"),
+        )
+        groups = (
+            select(
+                key.label("key"),
+                latest(h.activity_template_id).label("activity_template_id"),
+                latest(func.coalesce(h.completed_at, h.started_at)).label("completed_at"),
+                latest(h.scrapbook_layout).label("scrapbook_layout"),
+                func.json_agg(aggregate_order_by(contribution, newest_first), type_=JSON).label("contributions"),
+            )
+            .outerjoin(UserModel, UserModel.id == h.actor_user_id)
+            .where(h.relationship_id == relationship_id, key.in_(group_keys.scalar_subquery()))
+            .group_by(key)
+            .subquery()
+        )
+        q = (
+            select(
+                groups,
+                func.coalesce(ActivityTemplateModel.title, groups.c.activity_template_id).label("activity_title"),
+                PlannedActivityModel.id.is_not(None).label("has_planned"),
+                PlannedActivityModel.scrapbook_layout.label("planned_scrapbook_layout"),
+            )
+            .outerjoin(ActivityTemplateModel, ActivityTemplateModel.activity_id == groups.c.activity_template_id)
+            .outerjoin(PlannedActivityModel, PlannedActivityModel.id == groups.c.key)
+            .order_by(groups.c.completed_at.desc())
+        )
+        result = await self.session.execute(q)
+        return list(result.all())
@@ -7,6 +7,27 @@ from sqlalchemy import select
 
 from app.infra.db.models.compass import CompassEventModel
 from app.domain.common.types import generate_id
+from app.services.event_batcher import event_batcher
+
+
+def _event_row(
+    type: str,
+    actor_user_id: str,
+    payload: dict,
+    source: str,
+    relationship_id: Optional[str],
+    privacy_scope: str,
+) -> dict:
+    return {
+        "event_id": generate_id(),
+        "type": type,
+        "actor_user_id": actor_user_id,
+        "relationship_id": relationship_id,
+        "payload_json": payload,
+        "created_at": datetime.utcnow(),
+        "privacy_scope": privacy_scope,
+        "source": source,
+    }
 
 
 class EventRepository:
@@ -24,19 +45,32 @@ class EventRepository:
         relationship_id: Optional[str] = None,
         privacy_scope: str = "private",
     ) -> CompassEventModel:
-        """Append an event to the stream."""
-        event_id = generate_id()
-        now = datetime.utcnow()
-        model = CompassEventModel(
-            event_id=event_id,
-            type=type,
-            actor_user_id=actor_user_id,
-            relationship_id=relationship_id,
-            payload_json=payload,
-            created_at=now,
-            privacy_scope=privacy_scope,
-            source=source,
-        )
+        """Append an event to the stream.
+
+        While the event batcher runs, the event is queued and written with others shortly after:
+        the returned model is not persisted yet, and this session is not committed. Use
+        append_sync when the caller reads the event back or needs it stored before responding.
+        """
+        row = _event_row(type, actor_user_id, payload, source, relationship_id, privacy_scope)
+        if event_batcher.running:
+            event_batcher.put(row)
+            return CompassEventModel(**row)
+        return await self._insert(row)
+
+    async def append_sync(
+        self,
+        type: str,
+        actor_user_id: str,
+        payload: dict,
+        source: str,
+        relationship_id: Optional[str] = None,
+        privacy_scope: str = "private",
+    ) -> CompassEventModel:
+        """Append an event to the stream and commit it before returning."""
+        return await self._insert(_event_row(type, actor_user_id, payload, source, relationship_id, privacy_scope))
+
+    async def _insert(self, row: dict) -> CompassEventModel:
+        model = CompassEventModel(**row)
         self.session.add(model)
         await self.session.commit()
         await self.session.refresh(model)
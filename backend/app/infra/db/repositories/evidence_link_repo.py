@@ -0,0 +1,68 @@
+"""Evidence link repository (events cited by memories, portraits, loops and context summaries)."""
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infra.db.models.compass import CompassEventModel, EvidenceLinkModel
+
+MEMORY = "memory"
+PERSON_PORTRAIT = "person_portrait"
+DYAD_PORTRAIT = "dyad_portrait"
+LOOP = "loop"
+CONTEXT_SUMMARY = "context_summary"
+
+
+async def replace_evidence_links(
+    session: AsyncSession,
+    parent_kind: str,
+    parent_id: str,
+    event_ids: Optional[Iterable[str]],
+) -> None:
+    """Make parent's links match event_ids. Does not commit: call before the parent write's commit.
+
+    Ids that are not UUIDs or not in compass_events are skipped, as evidence_event_ids may hold them.
+    """
+    await session.execute(
+        delete(EvidenceLinkModel).where(
+            EvidenceLinkModel.parent_kind == parent_kind,
+            EvidenceLinkModel.parent_id == parent_id,
+        )
+    )
+    valid_ids = []
+    for event_id in event_ids or ():
+        try:
+            valid_ids.append(str(uuid.UUID(str(event_id))))
+        except ValueError:
+            continue
+    if not valid_ids:
+        return
+    await session.execute(
+        insert(EvidenceLinkModel)
+        .from_select(
+            ["parent_kind", "parent_id", "event_id"],
+            select(literal(parent_kind), literal(parent_id), CompassEventModel.event_id).where(
+                CompassEventModel.event_id.in_(valid_ids)
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+class EvidenceLinkRepository:
+    """Evidence link repository."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list_citing(self, event_id: str, parent_kind: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(parent_kind, parent_id) of everything citing event_id as evidence."""
+        q = select(EvidenceLinkModel.parent_kind, EvidenceLinkModel.parent_id).where(
+            EvidenceLinkModel.event_id == event_id
+        )
+        if parent_kind is not None:
+            q = q.where(EvidenceLinkModel.parent_kind == parent_kind)
+        result = await self.session.execute(q)
+        return [(row.parent_kind, row.parent_id) for row in result.all()]
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
 from app.infra.db.models.compass import RelationshipLoopModel
+from app.infra.db.repositories.evidence_link_repo import LOOP, replace_evidence_links
 from app.domain.common.types import generate_id
 
 
@@ -50,6 +51,7 @@ class LoopRepository:
             last_seen_at=now,
         )
         self.session.add(model)
+        await replace_evidence_links(self.session, LOOP, loop_id, evidence_event_ids)
         await self.session.commit()
         await self.session.refresh(model)
         return model
@@ -115,7 +115,6 @@ class LoungeRepository:
     ) -> LoungeMessageModel:
         seq = await _next_sequence(self.session, LoungeMessageModel, room_id)
         msg = LoungeMessageModel(
-            id=generate_id(),
             room_id=room_id,
             sender_user_id=sender_user_id,
             content=content,
@@ -205,7 +204,6 @@ class LoungeRepository:
     async def append_event(self, room_id: str, event_type: str, payload: dict) -> LoungeEventModel:
         seq = await _next_sequence(self.session, LoungeEventModel, room_id)
         event = LoungeEventModel(
-            id=generate_id(),
             room_id=room_id,
             sequence=seq,
             event_type=event_type,
@@ -243,7 +241,6 @@ class LoungeRepository:
         room_id: Optional[str] = None,
     ) -> LoungeKaiUserPreferenceModel:
         pref = LoungeKaiUserPreferenceModel(
-            id=generate_id(),
             user_id=user_id,
             content=content,
             text_=content,
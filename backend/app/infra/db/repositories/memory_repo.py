@@ -3,9 +3,10 @@ from datetime import datetime
 from typing import Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 
 from app.infra.db.models.compass import MemoryModel
+from app.infra.db.repositories.evidence_link_repo import MEMORY, replace_evidence_links
 from app.domain.common.types import generate_id
 
 
@@ -45,6 +46,7 @@ class MemoryRepository:
             updated_at=now,
         )
         self.session.add(model)
+        await replace_evidence_links(self.session, MEMORY, memory_id, evidence_event_ids)
         await self.session.commit()
         await self.session.refresh(model)
         return model
@@ -56,6 +58,28 @@ class MemoryRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_by_canonical_key(
+        self,
+        owner_user_id: str,
+        canonical_key: str,
+        relationship_id: Optional[str] = None,
+    ) -> Optional[MemoryModel]:
+        """Get the owner's memory for a canonical key, ignoring case (for dedup before create)."""
+        q = (
+            select(MemoryModel)
+            # lower() on both sides matches ix_memories_canonical_owner_lower
+            .where(func.lower(MemoryModel.canonical_key) == func.lower(canonical_key))
+            .where(MemoryModel.owner_user_id == owner_user_id)
+            .order_by(MemoryModel.updated_at.desc())
+            .limit(1)
+        )
+        if relationship_id is not None:
+            q = q.where(MemoryModel.relationship_id == relationship_id)
+        else:
+            q = q.where(MemoryModel.relationship_id.is_(None))
+        result = await self.session.execute(q)
+        return result.scalar_one_or_none()
+
     async def list_by_owner(
         self,
         owner_user_id: str,
@@ -1,5 +1,6 @@
 """Notification repository."""
-from typing import Optional, List
+from datetime import datetime
+from typing import Iterable, Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func, delete
 
@@ -15,7 +16,7 @@ class NotificationRepository:
 
     async def create(self, user_id: str, type: str, title: str, message: str) -> NotificationModel:
         """Create a notification."""
-        now = __import__("datetime").datetime.utcnow()
+        now = datetime.utcnow()
         model = NotificationModel(
             id=generate_id(),
             user_id=user_id,
@@ -30,6 +31,30 @@ class NotificationRepository:
         await self.session.refresh(model)
         return model
 
+    async def create_many(
+        self, user_ids: Iterable[str], type: str, title: str, message: str
+    ) -> List[NotificationModel]:
+        """Create the same notification for several users in one INSERT and one commit."""
+        now = datetime.utcnow()
+        models = [
+            NotificationModel(
+                id=generate_id(),
+                user_id=user_id,
+                type=type,
+                title=title,
+                message=message,
+                read=False,
+                created_at=now,
+            )
+            for user_id in user_ids
+        ]
+        if not models:
+            return []
+        # Every column is set client-side, so the flush is a single executemany and no refresh is needed.
+        self.session.add_all(models)
+        await self.session.commit()
+        return models
+
     async def list_by_user(
         self, user_id: str, limit: int = 50, type: Optional[str] = None
     ) -> List[NotificationModel]:
@@ -4,9 +4,11 @@ from typing import Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
+from sqlalchemy.dialects.postgresql import insert
 
 from app.infra.db.models.compass import PlannedActivityModel
 from app.domain.common.types import generate_id
+from app.domain.common.errors import ConflictError
 
 
 class PlannedActivityRepository:
@@ -24,21 +26,46 @@ class PlannedActivityRepository:
         invite_id: Optional[str] = None,
         card_snapshot: Optional[dict] = None,
     ) -> PlannedActivityModel:
-        """Create a planned activity (after invite accepted). Optionally store full ActivityCard JSON for UI."""
-        planned_id = generate_id()
-        now = datetime.utcnow()
-        model = PlannedActivityModel(
-            id=planned_id,
-            relationship_id=relationship_id,
-            activity_template_id=activity_template_id,
-            initiator_user_id=initiator_user_id,
-            invitee_user_id=invitee_user_id,
-            invite_id=invite_id,
-            status="planned",
-            agreed_at=now,
-            card_snapshot=card_snapshot,
+        """Create a planned activity (after invite accepted). Optionally store full ActivityCard JSON for UI.
+
+        If the dyad already has this activity planned (e.g. the invite was accepted twice, or both
+        sides of a mutual match accepted at once), the existing plan is returned instead.
+        """
+        stmt = (
+            insert(PlannedActivityModel)
+            .values(
+                id=generate_id(),
+                relationship_id=relationship_id,
+                activity_template_id=activity_template_id,
+                initiator_user_id=initiator_user_id,
+                invitee_user_id=invitee_user_id,
+                invite_id=invite_id,
+                status="planned",
+                agreed_at=datetime.utcnow(),
+                card_snapshot=card_snapshot,
+            )
+            # uq_planned_activities_one_active
+            .on_conflict_do_nothing(
+                index_elements=["relationship_id", "activity_template_id"],
+                index_where=PlannedActivityModel.status == "planned",
+            )
+            .returning(PlannedActivityModel)
+        )
+        existing = select(PlannedActivityModel).where(
+            PlannedActivityModel.relationship_id == relationship_id,
+            PlannedActivityModel.activity_template_id == activity_template_id,
+            PlannedActivityModel.status == "planned",
         )
-        self.session.add(model)
+        # The conflicting plan can be completed between the insert and the lookup; the insert then
+        # goes through on a second try.
+        for _attempt in range(2):
+            model = (await self.session.scalars(stmt)).first()
+            if model is None:
+                model = (await self.session.scalars(existing)).first()
+            if model is not None:
+                break
+        else:
+            raise ConflictError("Planned activity changed concurrently, please retry")
         await self.session.commit()
         await self.session.refresh(model)
         return model
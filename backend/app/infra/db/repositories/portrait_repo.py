@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.infra.db.models.compass import PersonPortraitModel, DyadPortraitModel
+from app.infra.db.repositories.evidence_link_repo import DYAD_PORTRAIT, PERSON_PORTRAIT, replace_evidence_links
 from app.domain.common.types import generate_id
 
 
@@ -45,6 +46,7 @@ class PersonPortraitRepository:
                 existing.portrait_facets_json = portrait_facets_json
             if evidence_event_ids is not None:
                 existing.evidence_event_ids = evidence_event_ids
+                await replace_evidence_links(self.session, PERSON_PORTRAIT, existing.portrait_id, evidence_event_ids)
             existing.confidence = confidence
             existing.visibility = visibility
             existing.updated_at = now
@@ -65,6 +67,7 @@ class PersonPortraitRepository:
             updated_at=now,
         )
         self.session.add(model)
+        await replace_evidence_links(self.session, PERSON_PORTRAIT, portrait_id, evidence_event_ids)
         await self.session.commit()
         await self.session.refresh(model)
         return model
@@ -117,6 +120,7 @@ class DyadPortraitRepository:
                 existing.facets_json = facets_json
             if evidence_event_ids is not None:
                 existing.evidence_event_ids = evidence_event_ids
+                await replace_evidence_links(self.session, DYAD_PORTRAIT, existing.dyad_portrait_id, evidence_event_ids)
             existing.confidence = confidence
             existing.updated_at = now
             await self.session.commit()
@@ -134,6 +138,7 @@ class DyadPortraitRepository:
             updated_at=now,
         )
         self.session.add(model)
+        await replace_evidence_links(self.session, DYAD_PORTRAIT, dyad_portrait_id, evidence_event_ids)
         await self.session.commit()
         await self.session.refresh(model)
         return model
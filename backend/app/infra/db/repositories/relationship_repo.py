@@ -1,7 +1,8 @@
 """Relationship repository implementation."""
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_
+from sqlalchemy import select, update, delete, and_, exists
 from sqlalchemy.orm import selectinload
 
 from app.domain.admin.models import Relationship, RelationshipMember
@@ -9,6 +10,22 @@ from app.domain.admin.services import RelationshipRepository
 from app.infra.db.models.relationship import RelationshipModel, relationship_members
 from app.infra.db.models.user import UserModel
 
+# Membership is checked on nearly every relationship-scoped request, for the same few
+# (relationship, user) pairs. is_member remembers positive answers for MEMBERSHIP_CACHE_TTL_SECONDS.
+# Non-members are never cached, so a member added by an invite is seen at once.
+#
+# The cache is per process. Members are only removed by delete(), which evicts its relationship
+# from this process's cache alone: other workers keep answering True for that relationship's
+# members for up to MEMBERSHIP_CACHE_TTL_SECONDS after the delete commits. Rows removed any other
+# way (a user delete cascading, manual SQL) are likewise seen only once the entry expires. Callers
+# that must not act on a stale yes (anything destructive) should check relationship_members
+# directly. member_status is not part of the answer, so status changes never stale an entry.
+MEMBERSHIP_CACHE_TTL_SECONDS = 30
+MEMBERSHIP_CACHE_MAX_ENTRIES = 10000
+
+# (relationship_id, user_id) -> expiry on the time.monotonic() clock
+_membership_cache: Dict[Tuple[str, str], float] = {}
+
 
 class RelationshipRepositoryImpl(RelationshipRepository):
     """Relationship repository implementation."""
@@ -85,16 +102,28 @@ class RelationshipRepositoryImpl(RelationshipRepository):
         ]
 
     async def is_member(self, relationship_id: str, user_id: str) -> bool:
-        """Check if user is a member of relationship."""
-        result = await self.session.execute(
-            select(relationship_members).where(
-                and_(
-                    relationship_members.c.relationship_id == relationship_id,
-                    relationship_members.c.user_id == user_id,
+        """Check if user is a member of relationship (an EXISTS probe; members cached, see MEMBERSHIP_CACHE_TTL_SECONDS)."""
+        key = (relationship_id, user_id)
+        expires_at = _membership_cache.get(key)
+        if expires_at is not None and expires_at >= time.monotonic():
+            return True
+        is_member = await self.session.scalar(
+            select(
+                exists().where(
+                    and_(
+                        relationship_members.c.relationship_id == relationship_id,
+                        relationship_members.c.user_id == user_id,
+                    )
                 )
             )
         )
-        return result.first() is not None
+        if is_member:
+            if len(_membership_cache) >= MEMBERSHIP_CACHE_MAX_ENTRIES:
+                _membership_cache.pop(next(iter(_membership_cache)))  # oldest insertion
+            _membership_cache[key] = time.monotonic() + MEMBERSHIP_CACHE_TTL_SECONDS
+        else:
+            _membership_cache.pop(key, None)
+        return bool(is_member)
 
     async def delete(self, relationship_id: str) -> None:
         """Delete a relationship and its members."""
@@ -146,3 +175,5 @@ class RelationshipRepositoryImpl(RelationshipRepository):
             delete(RelationshipModel).where(RelationshipModel.id == relationship_id)
         )
         await self.session.commit()
+        for key in [k for k in _membership_cache if k[0] == relationship_id]:
+            del _membership_cache[key]
@@ -6,7 +6,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.infra.db.models.compass import UnstructuredMemoryModel
-from app.domain.common.types import generate_id
 
 
 class UnstructuredMemoryRepository:
@@ -23,10 +22,8 @@ class UnstructuredMemoryRepository:
         relationship_id: Optional[str] = None,
     ) -> UnstructuredMemoryModel:
         """Create an unstructured memory."""
-        id_ = generate_id()
         now = datetime.utcnow()
         model = UnstructuredMemoryModel(
-            id=id_,
             owner_user_id=owner_user_id,
             relationship_id=relationship_id,
             content_text=content_text,
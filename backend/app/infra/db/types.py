@@ -0,0 +1,26 @@
+"""Custom column types."""
+from datetime import timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """TIMESTAMPTZ column that the app reads and writes as naive UTC datetimes.
+
+    The app works in naive UTC (datetime.utcnow(), isoformat() + "Z"). Storing TIMESTAMPTZ keeps
+    server defaults and comparisons against now() independent of the session time zone. asyncpg
+    reads a naive bind value as host-local time (it calls astimezone(utc) on it), so naive values
+    are tagged as UTC before binding; results come back in UTC and have their tzinfo dropped.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    def process_result_value(self, value, dialect):
+        return value.replace(tzinfo=None) if value is not None else None
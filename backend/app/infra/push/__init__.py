@@ -1,4 +1,4 @@
 """Push notification infrastructure (FCM)."""
-from app.infra.push.sender import send_push_to_user
+from app.infra.push.sender import send_push_to_user, send_push_to_users
 
-__all__ = ["send_push_to_user"]
+__all__ = ["send_push_to_user", "send_push_to_users"]
@@ -1,4 +1,5 @@
 """Push notification sender via FCM (Firebase Cloud Messaging)."""
+import asyncio
 import logging
 from typing import Any
 
@@ -36,6 +37,13 @@ def _get_firebase_app():
         return None
 
 
+async def _release_connection(session: AsyncSession) -> None:
+    """End the read transaction the token lookup opened, so session's pooled connection is not
+    held through the FCM round trips. Callers (deliver_notification[s]) have already committed
+    their writes, so this commits nothing of theirs."""
+    await session.commit()
+
+
 async def send_push_to_user(
     session: AsyncSession,
     user_id: str,
@@ -49,6 +57,7 @@ async def send_push_to_user(
         return
     repo = DeviceRepository(session)
     tokens_rows = await repo.list_tokens_by_user(user_id)
+    await _release_connection(session)
     if not tokens_rows:
         logger.debug("No push tokens for user %s", user_id)
         return
@@ -56,7 +65,8 @@ async def send_push_to_user(
     data_str = {k: str(v) for k, v in data.items()}
     try:
         from firebase_admin import messaging
-        for (push_token, platform) in tokens_rows:
+
+        def send(push_token: str) -> None:
             try:
                 message = messaging.Message(
                     notification=messaging.Notification(title=title, body=body),
@@ -67,5 +77,59 @@ async def send_push_to_user(
                 logger.debug("Push sent to user %s token %s...", user_id, push_token[:20])
             except Exception as e:
                 logger.warning("Push send failed for token %s...: %s", push_token[:20], e)
+
+        # messaging.send is a blocking HTTP call: run each device's send in a worker thread, all
+        # at once, so the event loop stays free and the sends overlap.
+        await asyncio.gather(*(asyncio.to_thread(send, push_token) for (push_token, _platform) in tokens_rows))
     except Exception as e:
         logger.warning("Push send failed for user %s: %s", user_id, e)
+
+
+# FCM accepts at most 500 messages per send_each call.
+_FCM_BATCH_SIZE = 500
+
+
+async def send_push_to_users(
+    session: AsyncSession,
+    user_ids: list[str],
+    title: str,
+    body: str,
+    data_by_user: dict[str, dict[str, Any]],
+) -> None:
+    """Send the same push to every device of several users: one token query, one FCM batch call per
+    500 messages. data_by_user[user_id] is that user's data payload (see send_push_to_user)."""
+    app = _get_firebase_app()
+    if app is None:
+        return
+    tokens_by_user = await DeviceRepository(session).list_tokens_by_users(user_ids)
+    await _release_connection(session)
+    if not tokens_by_user:
+        logger.debug("No push tokens for users %s", user_ids)
+        return
+    try:
+        from firebase_admin import messaging
+
+        messages = [
+            messaging.Message(
+                notification=messaging.Notification(title=title, body=body),
+                data={k: str(v) for k, v in data_by_user[user_id].items()},
+                token=push_token,
+            )
+            for user_id, tokens_rows in tokens_by_user.items()
+            for (push_token, _platform) in tokens_rows
+        ]
+        # send_each is firebase-admin 6.2+; send_all is its predecessor with the same contract.
+        send_batch = getattr(messaging, "send_each", None) or messaging.send_all
+
+        def send(batch: list) -> None:
+            response = send_batch(batch)
+            if response.failure_count:
+                logger.warning("Push send failed for %d of %d messages", response.failure_count, len(batch))
+
+        # Blocking HTTP calls: run them in worker threads so the event loop stays free.
+        await asyncio.gather(*(
+            asyncio.to_thread(send, messages[i:i + _FCM_BATCH_SIZE])
+            for i in range(0, len(messages), _FCM_BATCH_SIZE)
+        ))
+    except Exception as e:
+        logger.warning("Push send failed for users %s: %s", user_ids, e)
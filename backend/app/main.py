@@ -41,6 +41,7 @@ from app.api.compass import router as compass_router
 from app.api.activity import router as activity_router
 from app.api.lounge import router as lounge_router
 from app.infra.db.base import Base, engine
+from app.infra.db.partitions import create_compass_event_partitions
 # Import all models to ensure they're registered with Base
 from app.infra.db.models import (  # noqa: F401
     UserModel,
@@ -70,6 +71,7 @@ from app.infra.db.models import (  # noqa: F401
     LoungeKaiUserPreferenceModel,
 )
 from app.infra.messaging.redis_bus import redis_bus
+from app.services.event_batcher import event_batcher
 
 # Configure logging
 logging.basicConfig(
@@ -91,6 +93,16 @@ async def lifespan(app: FastAPI):
         print(f"Warning: Could not connect to database during startup: {e}")
         print("Make sure PostgreSQL is running and accessible.")
 
+    # Keep MONTHS_AHEAD monthly compass_events partitions ahead of now (rows past them go to the default partition)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(create_compass_event_partitions)
+    except Exception as e:
+        logger.warning("Could not create compass_events partitions: %s", e)
+
+    # Buffer fire-and-forget compass events into multi-row INSERTs (see app.services.event_batcher)
+    event_batcher.start()
+
     # Connect Redis and start lounge room-updates subscriber (so WebSocket updates reach all instances)
     lounge_subscriber_task = None
     try:
@@ -172,6 +184,7 @@ async def lifespan(app: FastAPI):
             except asyncio.CancelledError:
                 pass
         await redis_bus.disconnect()
+        await event_batcher.stop()
         await engine.dispose()
     except asyncio.CancelledError:
         logger.info("Lifespan shutdown cancelled (e.g. Ctrl+C); cleanup attempted.")
@@ -1,4 +1,4 @@
 """Application services (cross-cutting)."""
-from app.services.notification_service import deliver_notification
+from app.services.notification_service import deliver_notification, deliver_notifications
 
-__all__ = ["deliver_notification"]
+__all__ = ["deliver_notification", "deliver_notifications"]
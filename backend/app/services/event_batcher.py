@@ -0,0 +1,107 @@
+"""
+Buffered compass_events writes: events from many requests go to the DB in one multi-row INSERT.
+
+EventRepository.append queues fire-and-forget events (activity interactions, invites,
+completions) here while the batcher runs; one background task writes them in batches of up to
+settings.event_batch_size rows, at most settings.event_batch_ms after the first row of a batch
+was queued. The app starts it at startup and stops it at shutdown, which writes whatever is
+still queued. When it is not running (scripts, tests), EventRepository.append writes directly.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.infra.db.models.compass import CompassEventModel
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class EventBatcher:
+    """Queue rows and hand them to write() in batches from a single background task."""
+
+    def __init__(
+        self,
+        write: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        batch_size: int,
+        batch_ms: int,
+    ):
+        self._write = write
+        self.batch_size = batch_size
+        self.batch_ms = batch_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running or self.batch_size <= 0:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Write everything queued so far, then end the background task."""
+        if not self.running:
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+
+    def put(self, row: Dict[str, Any]) -> None:
+        self._queue.put_nowait(row)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is _STOP:
+                return
+            batch = [row]
+            deadline = loop.time() + self.batch_ms / 1000
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await self._write(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.warning("Event batch write failed, dropping 1 event: %s", e)
+                return
+            # One bad row (e.g. an actor deleted meanwhile) must not lose the others: retry row by row
+            logger.warning("Event batch write of %d rows failed, retrying one by one: %s", len(batch), e)
+            for row in batch:
+                try:
+                    await self._write([row])
+                except Exception as row_error:
+                    logger.warning("Dropping event %s: %s", row.get("event_id"), row_error)
+
+
+async def _insert_events(rows: List[Dict[str, Any]]) -> None:
+    from app.infra.db import base  # AsyncSessionLocal is only set up outside pytest
+
+    async with base.AsyncSessionLocal() as session:
+        await session.execute(insert(CompassEventModel), rows)
+        await session.commit()
+
+
+event_batcher = EventBatcher(_insert_events, settings.event_batch_size, settings.event_batch_ms)
@@ -7,14 +7,15 @@ creating notifications and sending WebSocket/push separately. Handles:
 - WebSocket notification.new (real-time in-app)
 - Push (FCM) when configured
 """
+import asyncio
 import logging
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infra.db.repositories.notification_repo import NotificationRepository
 from app.infra.realtime.ws_manager import ws_manager
-from app.infra.push.sender import send_push_to_user
+from app.infra.push.sender import send_push_to_user, send_push_to_users
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,49 @@ async def deliver_notification(
     """
     repo = NotificationRepository(session)
     notif = await repo.create(user_id=user_id, type=type, title=title, message=message)
+    payload = _ws_payload(notif, extra_payload)
+    # WebSocket and push go to different places and neither waits on the other, so they overlap;
+    # the push token lookup is the only use of session meanwhile.
+    await asyncio.gather(
+        ws_manager.send_to_user(user_id, {"type": "notification.new", "payload": payload}),
+        _send_push(session, user_id, notif),
+    )
+    return notif
+
+
+async def deliver_notifications(
+    session: AsyncSession,
+    user_ids: Iterable[str],
+    type: str,
+    title: str,
+    message: str,
+    *,
+    extra_payload: Optional[dict[str, Any]] = None,
+):
+    """
+    Deliver the same notification to several users, as deliver_notification does for one: all
+    inbox rows in one INSERT, then every WebSocket send and one batched push fan-out together.
+
+    Returns:
+        The created NotificationModels, in user_ids order.
+    """
+    repo = NotificationRepository(session)
+    notifs = await repo.create_many(user_ids, type=type, title=title, message=message)
+    if not notifs:
+        return notifs
+    await asyncio.gather(
+        *(
+            ws_manager.send_to_user(
+                notif.user_id, {"type": "notification.new", "payload": _ws_payload(notif, extra_payload)}
+            )
+            for notif in notifs
+        ),
+        _send_push_many(session, notifs),
+    )
+    return notifs
+
+
+def _ws_payload(notif, extra_payload: Optional[dict[str, Any]]) -> dict[str, Any]:
     ts_ms = int(notif.created_at.timestamp() * 1000) if notif.created_at else 0
     payload = {
         "id": notif.id,
@@ -57,7 +101,23 @@ async def deliver_notification(
     }
     if extra_payload:
         payload.update(extra_payload)
-    await ws_manager.send_to_user(user_id, {"type": "notification.new", "payload": payload})
+    return payload
+
+
+async def _send_push_many(session: AsyncSession, notifs: list) -> None:
+    try:
+        await send_push_to_users(
+            session,
+            [n.user_id for n in notifs],
+            notifs[0].title,
+            notifs[0].message,
+            {n.user_id: {"notificationId": n.id, "type": n.type} for n in notifs},
+        )
+    except Exception as e:
+        logger.warning("Push send failed for users %s: %s", [n.user_id for n in notifs], e)
+
+
+async def _send_push(session: AsyncSession, user_id: str, notif) -> None:
     try:
         await send_push_to_user(
             session,
@@ -68,4 +128,3 @@ async def deliver_notification(
         )
     except Exception as e:
         logger.warning("Push send failed for user %s: %s", user_id, e)
-    return notif
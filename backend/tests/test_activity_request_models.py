@@ -0,0 +1,29 @@
+"""Tests for the memory_urls default on activity completion / memory logging request bodies."""
+import pytest
+
+from app.api.activity.routes_activities import CompleteRequest, LogMemoryRequest
+
+_ENTRIES = [
+    {"url": "https://example.com/a.jpg", "caption": "first"},
+    {"url": "https://example.com/b.jpg"},
+]
+
+
+@pytest.mark.parametrize("model", [CompleteRequest, LogMemoryRequest])
+def test_memory_urls_default_to_entry_urls(model):
+    extra = {"relationship_id": "r1", "activity_title": "Walk"} if model is LogMemoryRequest else {}
+    request = model(memory_entries=_ENTRIES, **extra)
+    assert request.memory_urls == ["https://example.com/a.jpg", "https://example.com/b.jpg"]
+    assert [e.caption for e in request.memory_entries] == ["first", None]
+
+
+def test_explicit_memory_urls_are_kept():
+    request = CompleteRequest(memory_urls=["https://example.com/other.jpg"], memory_entries=_ENTRIES)
+    assert request.memory_urls == ["https://example.com/other.jpg"]
+    assert len(request.memory_entries) == 2
+
+
+def test_neither_given_leaves_both_unset():
+    request = CompleteRequest(notes="fun")
+    assert request.memory_urls is None
+    assert request.memory_entries is None
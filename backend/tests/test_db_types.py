@@ -0,0 +1,60 @@
+"""Tests for UTCDateTime: naive app datetimes are bound and read back as UTC whatever the host TZ."""
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.infra.db.types import UTCDateTime
+
+
+@pytest.fixture
+def new_york_tz(monkeypatch):
+    """Run the test with the host time zone set to America/New_York (UTC-5 in January)."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_naive_bind_value_is_tagged_utc(new_york_tz):
+    naive = datetime(2026, 1, 15, 12, 0)
+    bound = UTCDateTime().process_bind_param(naive, dialect=None)
+    assert bound == datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+    # asyncpg's timestamptz encoder calls astimezone(utc); the wall clock must not move
+    assert bound.astimezone(timezone.utc).replace(tzinfo=None) == naive
+    # an untagged value would have been read as New York time
+    assert naive.astimezone(timezone.utc).hour == 17
+
+
+def test_aware_bind_value_is_unchanged():
+    aware = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+    assert UTCDateTime().process_bind_param(aware, dialect=None) is aware
+    assert UTCDateTime().process_bind_param(None, dialect=None) is None
+
+
+def test_result_value_is_naive_utc():
+    aware = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+    assert UTCDateTime().process_result_value(aware, dialect=None) == datetime(2026, 1, 15, 12, 0)
+
+
+@pytest.mark.integration
+async def test_naive_value_round_trips_through_asyncpg(new_york_tz):
+    from app.settings import settings
+
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    naive = datetime(2026, 1, 15, 12, 0)
+    stmt = text(
+        "SELECT to_char(CAST(:at AS timestamptz) AT TIME ZONE 'UTC', 'HH24:MI') AS utc_clock, "
+        "CAST(:at AS timestamptz) AS at"
+    ).bindparams(bindparam("at", type_=UTCDateTime())).columns(at=UTCDateTime())
+    try:
+        async with engine.connect() as conn:
+            row = (await conn.execute(stmt, {"at": naive})).one()
+    finally:
+        await engine.dispose()
+    assert row.utc_clock == "12:00"
+    assert row.at == naive
@@ -0,0 +1,64 @@
+"""Tests for EventBatcher: batching by size and time, flush on stop, per-row retry of a failed batch."""
+import asyncio
+
+from app.services.event_batcher import EventBatcher
+
+
+def _recorder(fail_on=None):
+    batches = []
+
+    async def write(rows):
+        if fail_on is not None and any(r["event_id"] == fail_on for r in rows):
+            raise RuntimeError("bad row")
+        batches.append([r["event_id"] for r in rows])
+
+    return batches, write
+
+
+async def test_batches_by_size():
+    batches, write = _recorder()
+    batcher = EventBatcher(write, batch_size=2, batch_ms=10_000)
+    batcher.start()
+    for i in range(4):
+        batcher.put({"event_id": str(i)})
+    await asyncio.sleep(0.01)
+    assert batches == [["0", "1"], ["2", "3"]]
+    await batcher.stop()
+
+
+async def test_flushes_partial_batch_after_batch_ms():
+    batches, write = _recorder()
+    batcher = EventBatcher(write, batch_size=100, batch_ms=20)
+    batcher.start()
+    batcher.put({"event_id": "a"})
+    await asyncio.sleep(0.1)
+    assert batches == [["a"]]
+    await batcher.stop()
+
+
+async def test_stop_writes_queued_rows():
+    batches, write = _recorder()
+    batcher = EventBatcher(write, batch_size=100, batch_ms=10_000)
+    batcher.start()
+    batcher.put({"event_id": "a"})
+    batcher.put({"event_id": "b"})
+    await batcher.stop()
+    assert batches == [["a", "b"]]
+    assert not batcher.running
+
+
+async def test_failed_batch_is_retried_row_by_row():
+    batches, write = _recorder(fail_on="bad")
+    batcher = EventBatcher(write, batch_size=3, batch_ms=10_000)
+    batcher.start()
+    for event_id in ("a", "bad", "c"):
+        batcher.put({"event_id": event_id})
+    await batcher.stop()
+    assert batches == [["a"], ["c"]]
+
+
+def test_zero_batch_size_disables_batching():
+    _batches, write = _recorder()
+    batcher = EventBatcher(write, batch_size=0, batch_ms=50)
+    batcher.start()
+    assert not batcher.running
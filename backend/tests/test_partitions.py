@@ -0,0 +1,64 @@
+"""Tests for the compass_events monthly partition helpers: month arithmetic and generated DDL bounds."""
+import re
+from datetime import date
+
+import pytest
+
+from app.infra.db.partitions import hash_partition_ddl, month_start, monthly_partition_ddl
+
+
+@pytest.mark.parametrize(
+    "value, months, expected",
+    [
+        (date(2026, 2, 17), 0, date(2026, 2, 1)),
+        (date(2026, 1, 1), 0, date(2026, 1, 1)),
+        (date(2026, 12, 31), 0, date(2026, 12, 1)),
+        (date(2026, 12, 31), 1, date(2027, 1, 1)),
+        (date(2026, 11, 15), 3, date(2027, 2, 1)),
+        (date(2027, 1, 10), -1, date(2026, 12, 1)),
+        (date(2026, 5, 1), 24, date(2028, 5, 1)),
+    ],
+)
+def test_month_start(value, months, expected):
+    assert month_start(value, months) == expected
+
+
+def test_monthly_partition_ddl_rolls_over_the_year():
+    statements = monthly_partition_ddl(date(2026, 11, 20), date(2027, 1, 1))
+    assert statements == [
+        "CREATE TABLE IF NOT EXISTS compass_events_2026_11 PARTITION OF compass_events "
+        "FOR VALUES FROM ('2026-11-01 00:00:00+00') TO ('2026-12-01 00:00:00+00')",
+        "CREATE TABLE IF NOT EXISTS compass_events_2026_12 PARTITION OF compass_events "
+        "FOR VALUES FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')",
+        "CREATE TABLE IF NOT EXISTS compass_events_2027_01 PARTITION OF compass_events "
+        "FOR VALUES FROM ('2027-01-01 00:00:00+00') TO ('2027-02-01 00:00:00+00')",
+    ]
+
+
+def test_monthly_partition_ddl_includes_last_month_once():
+    # last mid-month still gets its month; first == last gives a single partition
+    assert len(monthly_partition_ddl(date(2026, 3, 1), date(2026, 5, 31))) == 3
+    assert len(monthly_partition_ddl(date(2026, 3, 9), date(2026, 3, 9))) == 1
+
+
+def test_monthly_partition_ddl_bounds_are_contiguous():
+    statements = monthly_partition_ddl(date(2025, 10, 1), date(2027, 3, 1))
+    bounds = [re.search(r"FROM \('([^']+)'\) TO \('([^']+)'\)", s).groups() for s in statements]
+    assert len(bounds) == 18
+    for (_, upper), (lower, _) in zip(bounds, bounds[1:]):
+        assert upper == lower
+    assert bounds[0][0] == "2025-10-01 00:00:00+00"
+    assert bounds[-1][1] == "2027-04-01 00:00:00+00"
+
+
+def test_monthly_partition_ddl_empty_when_last_precedes_first():
+    assert monthly_partition_ddl(date(2026, 6, 1), date(2026, 5, 31)) == []
+
+
+def test_hash_partition_ddl_covers_every_remainder():
+    statements = hash_partition_ddl("lounge_events", modulus=4)
+    assert statements[0] == (
+        "CREATE TABLE IF NOT EXISTS lounge_events_p0 PARTITION OF lounge_events "
+        "FOR VALUES WITH (MODULUS 4, REMAINDER 0)"
+    )
+    assert [s.split("REMAINDER ")[1] for s in statements] == ["0)", "1)", "2)", "3)"]
@@ -0,0 +1,86 @@
+"""Tests for RelationshipRepositoryImpl.is_member's membership cache: hits, TTL expiry, eviction."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.infra.db.repositories import relationship_repo
+from app.infra.db.repositories.relationship_repo import RelationshipRepositoryImpl
+
+
+class _FakeSession:
+    """Answers the EXISTS probe from a set of (relationship_id, user_id) members, counting probes."""
+
+    def __init__(self, members):
+        self.members = set(members)
+        self.probes = 0
+
+    async def scalar(self, stmt):
+        self.probes += 1
+        params = stmt.compile().params
+        return (params["relationship_id_1"], params["user_id_1"]) in self.members
+
+    async def execute(self, stmt):
+        if stmt.table.name == "relationship_members":
+            rel_id = stmt.compile().params["relationship_id_1"]
+            self.members = {m for m in self.members if m[0] != rel_id}
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(relationship_repo, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(relationship_repo, "_membership_cache", {})
+    return now
+
+
+async def test_positive_answer_is_served_from_cache(clock):
+    session = _FakeSession({("r1", "u1")})
+    repo = RelationshipRepositoryImpl(session)
+    assert await repo.is_member("r1", "u1")
+    assert await repo.is_member("r1", "u1")
+    assert session.probes == 1
+
+
+async def test_negative_answer_is_not_cached(clock):
+    session = _FakeSession(set())
+    repo = RelationshipRepositoryImpl(session)
+    assert not await repo.is_member("r1", "u1")
+    session.members.add(("r1", "u1"))
+    assert await repo.is_member("r1", "u1")
+    assert session.probes == 2
+
+
+async def test_entry_expires_after_ttl(clock):
+    session = _FakeSession({("r1", "u1")})
+    repo = RelationshipRepositoryImpl(session)
+    assert await repo.is_member("r1", "u1")
+    session.members.clear()
+    clock[0] += relationship_repo.MEMBERSHIP_CACHE_TTL_SECONDS
+    assert await repo.is_member("r1", "u1")  # still within the TTL
+    assert session.probes == 1
+    clock[0] += 0.001
+    assert not await repo.is_member("r1", "u1")
+    assert session.probes == 2
+    assert ("r1", "u1") not in relationship_repo._membership_cache
+
+
+async def test_delete_evicts_the_relationship(clock):
+    session = _FakeSession({("r1", "u1"), ("r1", "u2"), ("r2", "u1")})
+    repo = RelationshipRepositoryImpl(session)
+    for key in session.members.copy():
+        assert await repo.is_member(*key)
+    await repo.delete("r1")
+    assert set(relationship_repo._membership_cache) == {("r2", "u1")}
+    assert not await repo.is_member("r1", "u1")
+
+
+async def test_full_cache_evicts_oldest_entry(clock, monkeypatch):
+    monkeypatch.setattr(relationship_repo, "MEMBERSHIP_CACHE_MAX_ENTRIES", 2)
+    session = _FakeSession({("r1", "u1"), ("r1", "u2"), ("r1", "u3")})
+    repo = RelationshipRepositoryImpl(session)
+    for user_id in ("u1", "u2", "u3"):
+        assert await repo.is_member("r1", user_id)
+    assert list(relationship_repo._membership_cache) == [("r1", "u2"), ("r1", "u3")]